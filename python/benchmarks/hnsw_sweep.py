@@ -0,0 +1,131 @@
+"""Sweep Chroma HNSW parameters: recall@k vs latency vs build time vs disk size.
+
+Builds one collection per (M, construction_ef, search_ef) over a synthetic
+catalog of clustered unit vectors, runs single queries against it and
+compares them with exact brute-force top-k.
+
+    python benchmarks/hnsw_sweep.py --movies 20000 --dim 256 --m 8 16 32 --search-ef 10 50 100
+"""
+
+import argparse
+import json
+import shutil
+import tempfile
+import time
+from pathlib import Path
+
+import chromadb
+import numpy as np
+
+from entertainment_graph.services.sharded_collection import hnsw_metadata
+from entertainment_graph.services.vector_index import normalize
+
+
+def synthetic_vectors(n: int, dim: int, clusters: int, rng: np.random.Generator) -> np.ndarray:
+    """Unit vectors drawn around `clusters` random centers, like genres in embedding space."""
+    centers = rng.normal(size=(clusters, dim))
+    assignment = rng.integers(clusters, size=n)
+    return normalize(centers[assignment] + 0.6 * rng.normal(size=(n, dim))).astype(np.float32)
+
+
+def exact_top_k(vectors: np.ndarray, queries: np.ndarray, k: int) -> np.ndarray:
+    scores = queries @ vectors.T
+    top = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+    return np.take_along_axis(
+        top, np.argsort(-np.take_along_axis(scores, top, axis=1), axis=1), axis=1
+    )
+
+
+def disk_size(path: Path) -> int:
+    return sum(f.stat().st_size for f in path.rglob("*") if f.is_file())
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--movies", type=int, default=10000)
+    parser.add_argument("--dim", type=int, default=256)
+    parser.add_argument("--clusters", type=int, default=50)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--m", type=int, nargs="*", default=[8, 16, 32])
+    parser.add_argument("--construction-ef", type=int, nargs="*", default=[100, 200])
+    parser.add_argument("--search-ef", type=int, nargs="*", default=[10, 50, 100, 200])
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", type=Path, help="Also write results to this file")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    vectors = synthetic_vectors(args.movies, args.dim, args.clusters, rng)
+    queries = synthetic_vectors(
+        args.queries, args.dim, args.clusters, np.random.default_rng(args.seed + 1)
+    )
+    ids = [f"movie-{i}" for i in range(args.movies)]
+    truth = exact_top_k(vectors, queries, args.k)
+    print(f"{args.movies} vectors x {args.dim} dims, {args.queries} queries, k={args.k}\n")
+
+    results = []
+    print(
+        f"{'M':>4} {'c_ef':>5} {'s_ef':>5} {'build s':>8} {'disk MB':>8} "
+        f"{'recall':>7} {'p50 ms':>7} {'p99 ms':>7}"
+    )
+    for m in args.m:
+        for construction_ef in args.construction_ef:
+            for search_ef in args.search_ef:
+                # search_ef changes only take effect when an index is (re)loaded, so
+                # each combination gets its own freshly built collection
+                directory = Path(tempfile.mkdtemp(prefix="hnsw-sweep-"))
+                try:
+                    client = chromadb.PersistentClient(path=str(directory))
+                    collection = client.create_collection(
+                        name="sweep", metadata=hnsw_metadata(m, construction_ef, search_ef)
+                    )
+                    start = time.perf_counter()
+                    for batch in range(0, args.movies, 5000):
+                        collection.add(
+                            ids=ids[batch : batch + 5000], embeddings=vectors[batch : batch + 5000]
+                        )
+                    build_seconds = time.perf_counter() - start
+
+                    latencies, found = [], []
+                    for query in queries:
+                        start = time.perf_counter()
+                        result = collection.query(
+                            query_embeddings=[query], n_results=args.k, include=[]
+                        )
+                        latencies.append(time.perf_counter() - start)
+                        found.append(
+                            {int(record_id.split("-")[1]) for record_id in result["ids"][0]}
+                        )
+                    size = disk_size(directory)
+                finally:
+                    shutil.rmtree(directory, ignore_errors=True)
+
+                recall = float(np.mean([
+                    len(hits & set(expected.tolist())) / args.k
+                    for hits, expected in zip(found, truth)
+                ]))
+                p50, p99 = np.percentile(latencies, [50, 99]) * 1000
+                row = {
+                    "m": m,
+                    "construction_ef": construction_ef,
+                    "search_ef": search_ef,
+                    "build_seconds": build_seconds,
+                    "disk_bytes": size,
+                    "recall_at_k": recall,
+                    "p50_ms": float(p50),
+                    "p99_ms": float(p99),
+                }
+                results.append(row)
+                print(
+                    f"{m:>4} {construction_ef:>5} {search_ef:>5} {build_seconds:>8.2f} "
+                    f"{size / 1e6:>8.1f} {recall:>7.3f} {p50:>7.2f} {p99:>7.2f}"
+                )
+
+    if args.json:
+        report = {"args": {**vars(args), "json": str(args.json)}, "results": results}
+        args.json.write_text(json.dumps(report, indent=2))
+        print(f"\nWrote {args.json}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,318 @@
+"""Load-test the FastAPI app in process (ASGI) or against a running server.
+
+Requests are drawn from a seeded mix over the API:
+
+- query:   POST /query/{system} with a generated query
+- compare: POST /query/compare
+- movies:  GET /movies (full catalog, i.e. serialization cost)
+- movie:   GET /movies/{id}
+- ingest:  POST /ingest/{system}/bulk with a few catalog movies (re-upserted)
+
+Two workload models:
+
+- closed (default): --concurrency clients, each sending its next request
+  when the previous one returns (plus --think-ms)
+- open: requests arrive as a Poisson process at --rate per second whether
+  or not earlier ones finished; latency is measured from the scheduled
+  arrival, so queueing shows up instead of being hidden
+
+Reports per-endpoint latency histograms and percentiles, error rates, and
+event-loop lag (how late a periodic timer fires). In process, the app
+shares the event loop with the load generator, so lag measures the app's
+blocking; against --url it only reflects the client.
+
+    LLM_PROVIDER=local EMBEDDING_PROVIDER=local \\
+        python benchmarks/load.py --setup-ingest --concurrency 32 --duration 30
+    python benchmarks/load.py --url http://localhost:8000 --model open --rate 50 \\
+        --mix query=8,movie=2
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import time
+from contextlib import AsyncExitStack
+from pathlib import Path
+
+import httpx
+import numpy as np
+from systems import build_query  # benchmarks/systems.py
+
+from entertainment_graph.services.metrics import Histogram
+
+ENDPOINTS = ("query", "compare", "movies", "movie", "ingest")
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+LAG_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0)
+
+
+def parse_mix(value: str) -> dict[str, float]:
+    """Parse "query=8,movie=2" into {"query": 8.0, "movie": 2.0}."""
+    mix = {}
+    for part in value.split(","):
+        endpoint, _, weight = part.partition("=")
+        if endpoint not in ENDPOINTS:
+            raise argparse.ArgumentTypeError(
+                f"Unknown endpoint '{endpoint}'. Available: {', '.join(ENDPOINTS)}"
+            )
+        mix[endpoint] = float(weight or 1)
+    return mix
+
+
+class Workload:
+    """Seeded stream of (endpoint, method, path, json body) requests."""
+
+    def __init__(self, movies: list, mix: dict[str, float], system: str, seed: int):
+        self.movies = movies
+        self.endpoints = list(mix)
+        self.weights = list(mix.values())
+        self.system = system
+        self.rng = random.Random(seed)
+
+    def next(self) -> tuple[str, str, str, dict | None]:
+        endpoint = self.rng.choices(self.endpoints, weights=self.weights)[0]
+        movie = self.rng.choice(self.movies)
+        if endpoint in ("query", "compare"):
+            kind = self.rng.choice(("theme", "title", "director", "filtered"))
+            query, filters = build_query(kind, movie, self.rng)
+            body = {"query": query, "limit": 5}
+            if filters is not None:
+                body["filters"] = filters.model_dump(exclude_defaults=True)
+            path = "/query/compare" if endpoint == "compare" else f"/query/{self.system}"
+            return endpoint, "POST", path, body
+        if endpoint == "movies":
+            return endpoint, "GET", "/movies", None
+        if endpoint == "movie":
+            return endpoint, "GET", f"/movies/{movie.id}", None
+        sample = self.rng.sample(self.movies, min(5, len(self.movies)))
+        batch = [m.model_dump(mode="json") for m in sample]
+        return endpoint, "POST", f"/ingest/{self.system}/bulk", {"movies": batch}
+
+
+class Recorder:
+    """Latency histograms, raw samples and errors per endpoint."""
+
+    def __init__(self):
+        self.histograms: dict[str, Histogram] = {}
+        self.samples: dict[str, list[float]] = {}
+        self.errors: dict[str, dict[str, int]] = {}
+        self.dropped: dict[str, int] = {}
+
+    def record(self, endpoint: str, seconds: float, error: str | None = None) -> None:
+        self._ensure(endpoint)
+        self.histograms[endpoint].observe(seconds)
+        self.samples[endpoint].append(seconds)
+        if error:
+            self.errors[endpoint][error] = self.errors[endpoint].get(error, 0) + 1
+
+    def drop(self, endpoint: str) -> None:
+        """An open-loop arrival that wasn't sent (too many in flight); counts as an error."""
+        self._ensure(endpoint)
+        self.dropped[endpoint] += 1
+
+    def _ensure(self, endpoint: str) -> None:
+        if endpoint not in self.histograms:
+            self.histograms[endpoint] = Histogram(endpoint, f"{endpoint} latency", LATENCY_BUCKETS)
+            self.samples[endpoint] = []
+            self.errors[endpoint] = {}
+            self.dropped[endpoint] = 0
+
+    def summary(self, wall: float) -> dict:
+        report = {}
+        for endpoint, samples in self.samples.items():
+            ms = np.array(samples or [0.0]) * 1000
+            dropped = self.dropped[endpoint]
+            failed = sum(self.errors[endpoint].values()) + dropped
+            p50, p95, p99 = np.percentile(ms, [50, 95, 99])
+            report[endpoint] = {
+                "requests": len(samples) + dropped,
+                "error_rate": failed / (len(samples) + dropped),
+                "errors": self.errors[endpoint] | ({"dropped": dropped} if dropped else {}),
+                "throughput_rps": len(samples) / wall,
+                "p50_ms": float(p50),
+                "p95_ms": float(p95),
+                "p99_ms": float(p99),
+                "max_ms": float(ms.max()),
+                "histogram": self.histograms[endpoint].snapshot()["buckets"],
+            }
+        return report
+
+
+async def send(
+    client: httpx.AsyncClient, recorder: Recorder, request: tuple, started: float
+) -> None:
+    """Send one request; latency counts from `started` (the scheduled arrival in open loop)."""
+    endpoint, method, path, body = request
+    try:
+        response = await client.request(method, path, json=body)
+        error = None if response.is_success else f"HTTP {response.status_code}"
+    except httpx.HTTPError as e:
+        error = type(e).__name__
+    recorder.record(endpoint, time.perf_counter() - started, error)
+
+
+async def closed_loop(
+    client, workload: Workload, recorder: Recorder, args: argparse.Namespace
+) -> None:
+    deadline = time.perf_counter() + args.duration
+
+    async def user() -> None:
+        while time.perf_counter() < deadline:
+            await send(client, recorder, workload.next(), time.perf_counter())
+            if args.think_ms:
+                await asyncio.sleep(args.think_ms / 1000)
+
+    await asyncio.gather(*(user() for _ in range(args.concurrency)))
+
+
+async def open_loop(
+    client, workload: Workload, recorder: Recorder, args: argparse.Namespace
+) -> None:
+    rng = random.Random(args.seed + 1)
+    in_flight: set[asyncio.Task] = set()
+    start = time.perf_counter()
+    scheduled = start
+    while scheduled < start + args.duration:
+        scheduled += rng.expovariate(args.rate)
+        await asyncio.sleep(max(0.0, scheduled - time.perf_counter()))
+        request = workload.next()
+        if len(in_flight) >= args.max_in_flight:
+            recorder.drop(request[0])
+            continue
+        task = asyncio.create_task(send(client, recorder, request, scheduled))
+        in_flight.add(task)
+        task.add_done_callback(in_flight.discard)
+    await asyncio.gather(*in_flight)
+
+
+async def monitor_lag(lag: Histogram, samples: list[float], interval: float = 0.01) -> None:
+    """Record how late a sleep of `interval` wakes up, until cancelled."""
+    while True:
+        start = time.perf_counter()
+        await asyncio.sleep(interval)
+        late = max(0.0, time.perf_counter() - start - interval)
+        lag.observe(late)
+        samples.append(late)
+
+
+async def run(args: argparse.Namespace) -> dict:
+    from entertainment_graph.services.data_loader import load_movies
+
+    movies = load_movies(str(args.data_dir) if args.data_dir else None)
+    if not movies:
+        raise SystemExit("No movies to build requests from (see --data-dir)")
+    workload = Workload(movies, args.mix, args.system, args.seed)
+    recorder = Recorder()
+
+    async with AsyncExitStack() as stack:
+        if args.url:
+            client = httpx.AsyncClient(base_url=args.url, timeout=args.timeout)
+        else:
+            from entertainment_graph.main import app
+
+            # ASGITransport doesn't run the lifespan, which registers the systems
+            await stack.enter_async_context(app.router.lifespan_context(app))
+            client = httpx.AsyncClient(
+                transport=httpx.ASGITransport(app=app), base_url="http://app", timeout=args.timeout
+            )
+        await stack.enter_async_context(client)
+
+        if args.setup_ingest:
+            response = await client.post(f"/ingest/{args.system}", timeout=None)
+            print(f"Setup ingest: {response.status_code} {response.text[:200]}")
+
+        lag = Histogram("event_loop_lag", "Event loop lag", LAG_BUCKETS)
+        lag_samples: list[float] = []
+        monitor = asyncio.create_task(monitor_lag(lag, lag_samples))
+        start = time.perf_counter()
+        if args.model == "open":
+            await open_loop(client, workload, recorder, args)
+        else:
+            await closed_loop(client, workload, recorder, args)
+        wall = time.perf_counter() - start
+        monitor.cancel()
+
+    lag_ms = np.array(lag_samples or [0.0]) * 1000
+    return {
+        "target": args.url or "in-process",
+        "model": args.model,
+        "wall_seconds": wall,
+        "endpoints": recorder.summary(wall),
+        "event_loop_lag_ms": {
+            "p50": float(np.percentile(lag_ms, 50)),
+            "p99": float(np.percentile(lag_ms, 99)),
+            "max": float(lag_ms.max()),
+            "histogram": lag.snapshot()["buckets"],
+        },
+    }
+
+
+def print_report(report: dict) -> None:
+    print(f"\n{report['target']}, {report['model']} loop, {report['wall_seconds']:.1f}s\n")
+    print(
+        f"{'endpoint':<9} {'reqs':>6} {'req/s':>7} {'err %':>6} "
+        f"{'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'max ms':>8}"
+    )
+    for endpoint, stats in report["endpoints"].items():
+        print(
+            f"{endpoint:<9} {stats['requests']:>6} {stats['throughput_rps']:>7.1f} "
+            f"{stats['error_rate'] * 100:>6.1f} {stats['p50_ms']:>8.1f} {stats['p95_ms']:>8.1f} "
+            f"{stats['p99_ms']:>8.1f} {stats['max_ms']:>8.1f}"
+        )
+        if stats["errors"]:
+            print(f"{'':<9} errors: {stats['errors']}")
+
+    print("\nLatency histogram (requests <= bucket, cumulative)")
+    buckets = [str(bound) for bound in LATENCY_BUCKETS] + ["+Inf"]
+    print(f"{'endpoint':<9} " + " ".join(f"{bound:>6}" for bound in buckets))
+    for endpoint, stats in report["endpoints"].items():
+        print(f"{endpoint:<9} " + " ".join(f"{stats['histogram'][bound]:>6}" for bound in buckets))
+
+    lag = report["event_loop_lag_ms"]
+    print(
+        f"\nEvent loop lag: p50 {lag['p50']:.2f} ms, p99 {lag['p99']:.2f} ms, "
+        f"max {lag['max']:.2f} ms"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--url", help="Target a running server instead of the in-process app")
+    parser.add_argument(
+        "--system", default="pure_vector", help="System for /query and /ingest requests"
+    )
+    parser.add_argument("--mix", type=parse_mix, default="query=6,compare=1,movies=1,movie=2")
+    parser.add_argument("--model", choices=["closed", "open"], default="closed")
+    parser.add_argument(
+        "--concurrency", type=int, default=16, help="Closed loop: concurrent clients"
+    )
+    parser.add_argument(
+        "--think-ms", type=float, default=0.0, help="Closed loop: pause between a client's requests"
+    )
+    parser.add_argument(
+        "--rate", type=float, default=20.0, help="Open loop: mean arrivals per second"
+    )
+    parser.add_argument(
+        "--max-in-flight", type=int, default=1000, help="Open loop: drop arrivals beyond this"
+    )
+    parser.add_argument("--duration", type=float, default=30.0, help="Seconds to generate load")
+    parser.add_argument("--timeout", type=float, default=60.0)
+    parser.add_argument(
+        "--data-dir", type=Path, help="Catalog to draw requests from (default DATA_DIR/movies)"
+    )
+    parser.add_argument(
+        "--setup-ingest", action="store_true", help="POST /ingest/{system} before the run"
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", type=Path, help="Also write the report to this file")
+    args = parser.parse_args()
+
+    report = asyncio.run(run(args))
+    print_report(report)
+    if args.json:
+        args.json.write_text(json.dumps(report, indent=2))
+        print(f"\nWrote {args.json}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,276 @@
+"""Generate a deterministic synthetic movie catalog for scale testing.
+
+Movies are drawn from `--clusters` profiles (genres, theme, mood, visual and
+narrative pools), so movies in one cluster read alike, and each gets
+`--degree` similar_to links to other movies, mostly within its cluster.
+Every movie depends only on (seed, index), so output streams to disk in
+constant memory and the same arguments always give the same catalog.
+
+    python benchmarks/synthetic_catalog.py --movies 100000 --ndjson data/synthetic/movies/all.ndjson
+    python benchmarks/synthetic_catalog.py --movies 1000 --out data/synthetic/movies
+
+The loader reads both layouts from DATA_DIR/movies, so DATA_DIR=data/synthetic
+points the API (catalog, /movies, /ingest) at it; benchmarks/systems.py takes
+the directory or NDJSON file as --data-dir.
+"""
+
+import argparse
+import random
+import re
+import sys
+import time
+from collections.abc import Iterator
+from functools import lru_cache
+from pathlib import Path
+
+from entertainment_graph.models import Movie
+
+GENRES = [
+    "Action", "Adventure", "Animation", "Comedy", "Crime", "Documentary", "Drama", "Fantasy",
+    "History", "Horror", "Music", "Mystery", "Romance", "Science Fiction", "Thriller", "War",
+    "Western",
+]
+THEMES = [
+    "identity", "memory", "grief", "ambition", "isolation", "redemption", "betrayal", "family",
+    "power", "corruption", "survival", "coming of age", "love", "revenge", "faith", "freedom",
+    "technology", "class", "obsession", "loyalty", "mortality", "destiny vs free will", "ecology",
+    "colonialism", "surveillance", "friendship", "justice", "exile", "transformation", "legacy",
+]
+SPECIFICITIES = [
+    "told through a single relationship", "as a slow personal unraveling", "across generations",
+    "in a closed community", "against institutional pressure", "as quiet background tension",
+]
+MOODS = [
+    "melancholic", "tense", "whimsical", "ominous", "hopeful", "bleak", "euphoric", "eerie",
+    "tender", "frantic", "contemplative", "playful", "dreamlike", "gritty", "epic", "cozy",
+]
+ARCS = [
+    "calm into dread", "despair into hope", "wonder into burden", "comedy into heartbreak",
+    "tension into release", "innocence into experience",
+]
+PALETTES = [
+    "desert ochre", "neon magenta", "cold steel blue", "warm amber", "washed-out pastels",
+    "deep greens", "monochrome", "candlelit gold", "sodium orange", "icy white",
+]
+COMPOSITIONS = [
+    "symmetrical frames", "handheld close-ups", "vast landscapes", "long takes", "tight interiors",
+    "deep focus", "static wides", "mirror shots",
+]
+INFLUENCES = [
+    "film noir", "Italian neorealism", "German expressionism", "French New Wave", "Japanese anime",
+    "1970s paranoia thrillers", "classic westerns", "Hong Kong action", "brutalist architecture",
+]
+DESCRIPTORS = [
+    "stark", "lush", "grimy", "elegant", "claustrophobic", "majestic", "surreal", "naturalistic",
+    "stylized", "minimalist", "ornate", "kinetic",
+]
+PACINGS = [
+    "slow burn", "brisk", "deliberate, meditative", "episodic", "relentless", "gentle, flowing",
+]
+STRUCTURES = [
+    "linear", "nonlinear", "parallel timelines", "anthology", "hero's journey", "mockumentary",
+    "relationship arc", "mystery box",
+]
+TONES = [
+    "serious, philosophical", "satirical", "bittersweet romantic", "darkly comic", "earnest",
+    "mythic", "deadpan", "warm, comedic",
+]
+PERSPECTIVES = [
+    "ensemble", "intimate first-person", "unreliable narrator", "dual protagonists",
+    "observational",
+]
+FIRST_NAMES = [
+    "Ada", "Bruno", "Chen", "Dara", "Elif", "Femi", "Greta", "Hiro", "Ines", "Jonas", "Kira",
+    "Luca", "Maya", "Nadia", "Omar", "Priya", "Quinn", "Rosa", "Sven", "Tariq", "Uma", "Viktor",
+    "Wen", "Yara",
+]
+LAST_NAMES = [
+    "Abbott", "Bauer", "Castillo", "Dubois", "Eriksen", "Fischer", "Garcia", "Haddad", "Ito",
+    "Jensen", "Kowalski", "Laurent", "Moreau", "Nakamura", "Okafor", "Petrov", "Quinlan", "Rossi",
+    "Silva", "Tanaka", "Usman", "Varga", "Weber", "Yilmaz",
+]
+TITLE_WORDS = [
+    "Silent", "Broken", "Last", "Hidden", "Burning", "Distant", "Hollow", "Golden", "Crimson",
+    "Endless", "Quiet", "Savage", "Paper", "Glass", "Northern", "Midnight", "Electric", "Velvet",
+]
+TITLE_NOUNS = [
+    "Harbor", "Kingdom", "Signal", "Orchard", "Frontier", "Machine", "River", "Empire", "Garden",
+    "Horizon", "Circuit", "Lantern", "Tide", "Citadel", "Meridian", "Archive", "Monsoon", "Echo",
+]
+LINK_TYPES = [
+    "visual_style", "thematic", "mood", "narrative_style", "creator", "spiritual_successor",
+    "audience_overlap", "contrast",
+]
+
+
+def _slug(text: str) -> str:
+    return re.sub(r"[^a-z0-9]+", "-", text.lower()).strip("-")
+
+
+@lru_cache(maxsize=1024)
+def _profile(seed: int, cluster: int) -> dict:
+    """Feature pools shared by every movie in a cluster."""
+    rng = random.Random(f"{seed}:cluster:{cluster}")
+    return {
+        "genres": rng.sample(GENRES, 3),
+        "themes": rng.sample(THEMES, 6),
+        "moods": rng.sample(MOODS, 4),
+        "palette": rng.sample(PALETTES, 4),
+        "composition": rng.sample(COMPOSITIONS, 3),
+        "influences": rng.sample(INFLUENCES, 3),
+        "descriptors": rng.sample(DESCRIPTORS, 5),
+        "pacing": rng.choice(PACINGS),
+        "structure": rng.choice(STRUCTURES),
+        "tone": rng.choice(TONES),
+        "directors": [f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}" for _ in range(3)],
+        "intensity": rng.choice(["subtle", "moderate", "intense"]),
+    }
+
+
+def movie_id(seed: int, index: int) -> str:
+    """Id of movie `index`; computable without generating the movie, so links can point ahead."""
+    rng = random.Random(f"{seed}:title:{index}")
+    return f"{_slug(rng.choice(TITLE_WORDS) + ' ' + rng.choice(TITLE_NOUNS))}-{index}"
+
+
+def generate_movie(
+    index: int,
+    total: int,
+    seed: int = 0,
+    clusters: int = 50,
+    degree: int = 3,
+    cross_cluster: float = 0.1,
+) -> Movie:
+    """Movie `index` of a `total`-movie catalog."""
+    cluster = index % clusters
+    profile = _profile(seed, cluster)
+    title_rng = random.Random(f"{seed}:title:{index}")
+    title = f"{title_rng.choice(TITLE_WORDS)} {title_rng.choice(TITLE_NOUNS)}"
+    rng = random.Random(f"{seed}:movie:{index}")
+
+    themes = rng.sample(profile["themes"], 3) + ([rng.choice(THEMES)] if rng.random() < 0.3 else [])
+    moods = rng.sample(profile["moods"], 2)
+    director = rng.choice(profile["directors"]) if rng.random() < 0.7 else (
+        f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}"
+    )
+    cast = [f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}" for _ in range(rng.randint(3, 6))]
+
+    links = []
+    for _ in range(min(degree, total - 1)):
+        if rng.random() < cross_cluster or total <= clusters:
+            target = rng.randrange(total)
+        else:
+            # Another movie of the same cluster (indices congruent mod clusters)
+            target = cluster + clusters * rng.randrange((total - 1 - cluster) // clusters + 1)
+        if target == index:
+            target = (index + 1) % total
+        link_type = rng.choice(LINK_TYPES)
+        if link_type == "contrast":
+            explanation = f"Treats {themes[0]} with the opposite tone"
+        else:
+            explanation = f"Shares {rng.choice(themes)} and a {moods[0]} mood"
+        links.append({
+            "target_id": movie_id(seed, target),
+            "relationship_type": link_type,
+            "explanation": explanation,
+            "strength": rng.randint(1, 5),
+            "bidirectional": rng.random() < 0.8,
+        })
+
+    return Movie(
+        id=movie_id(seed, index),
+        title=title,
+        year=rng.randint(1950, 2025),
+        runtime_minutes=rng.randint(80, 180),
+        genres=rng.sample(profile["genres"], rng.randint(1, 3)),
+        director=[director],
+        cast=cast,
+        plot_summary=(
+            f"A story of {themes[0]} and {themes[1]} led by {cast[0]}, "
+            f"moving from {rng.choice(ARCS)}."
+        ),
+        themes=[
+            {
+                "name": name,
+                "specificity": rng.choice(SPECIFICITIES),
+                "prominence": (
+                    "central" if i == 0 else rng.choice(["central", "secondary", "subtle"])
+                ),
+            }
+            for i, name in enumerate(themes)
+        ],
+        mood={
+            "primary": moods,
+            "undertones": rng.sample(MOODS, 2),
+            "intensity": (
+                profile["intensity"]
+                if rng.random() < 0.8
+                else rng.choice(["subtle", "moderate", "intense"])
+            ),
+            "emotional_arc": rng.choice(ARCS),
+        },
+        visual_style={
+            "palette": rng.sample(profile["palette"], 2),
+            "composition": rng.sample(profile["composition"], 2),
+            "influences": rng.sample(profile["influences"], 1),
+            "descriptors": rng.sample(profile["descriptors"], 3),
+        },
+        narrative={
+            "pacing": profile["pacing"],
+            "structure": profile["structure"] if rng.random() < 0.8 else rng.choice(STRUCTURES),
+            "tone": profile["tone"],
+            "perspective": rng.choice(PERSPECTIVES),
+        },
+        similar_to=links,
+    )
+
+
+def generate(total: int, seed: int = 0, **options) -> Iterator[Movie]:
+    """Stream the whole catalog, movie by movie."""
+    for index in range(total):
+        yield generate_movie(index, total, seed, **options)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--movies", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--clusters", type=int, default=50, help="Profiles movies are drawn from")
+    parser.add_argument("--degree", type=int, default=3, help="similar_to links per movie")
+    parser.add_argument(
+        "--cross-cluster", type=float, default=0.1, help="Share of links leaving the cluster"
+    )
+    output = parser.add_mutually_exclusive_group(required=True)
+    output.add_argument(
+        "--ndjson", type=Path, help="Write one movie per line to this file ('-' for stdout)"
+    )
+    output.add_argument(
+        "--out", type=Path, help="Write one <id>.json file per movie into this directory"
+    )
+    args = parser.parse_args()
+
+    movies = generate(
+        args.movies,
+        args.seed,
+        clusters=args.clusters,
+        degree=args.degree,
+        cross_cluster=args.cross_cluster,
+    )
+    start = time.perf_counter()
+    if args.out:
+        args.out.mkdir(parents=True, exist_ok=True)
+        for movie in movies:
+            (args.out / f"{movie.id}.json").write_text(movie.model_dump_json(indent=2))
+    elif str(args.ndjson) == "-":
+        for movie in movies:
+            sys.stdout.write(movie.model_dump_json() + "\n")
+    else:
+        args.ndjson.parent.mkdir(parents=True, exist_ok=True)
+        with open(args.ndjson, "w") as f:
+            for movie in movies:
+                f.write(movie.model_dump_json() + "\n")
+    print(f"Wrote {args.movies} movies in {time.perf_counter() - start:.1f}s", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
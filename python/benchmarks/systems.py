@@ -0,0 +1,360 @@
+"""Latency and throughput of each retrieval system, driven in process.
+
+For every system the catalog is ingested in growing prefixes (--sizes); at
+each size a seeded query mix is run closed-loop by `concurrency` workers.
+Each run reports p50/p95/p99 latency, throughput, time per pipeline stage
+(embed, retrieve, llm, parse), tokens and estimated cost per query and the
+process's peak RSS. Results are written as JSON and, given a baseline from
+an earlier run, compared with it; regressions beyond --tolerance are listed
+and the exit status is 1.
+
+Systems are cleared first. Chroma and OpenMemory data live in a scratch
+directory (--work-dir); Graphiti works against the configured Neo4j.
+Set LLM_PROVIDER=local and EMBEDDING_PROVIDER=local to run offline with
+reproducible timings.
+
+    python benchmarks/systems.py --sizes 1000 10000 --concurrency 1 8 32 --json run.json
+    python benchmarks/systems.py --sizes 1000 10000 --concurrency 1 8 32 --baseline run.json
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+import numpy as np
+
+from entertainment_graph.models import Movie, QueryFilters
+
+# Query kinds for --mix; each builds a query about one catalog movie
+QUERY_KINDS = ("theme", "title", "director", "filtered")
+
+# Metrics checked against the baseline, and which direction is worse
+REGRESSION_CHECKS = {
+    "p50_ms": "higher",
+    "p95_ms": "higher",
+    "p99_ms": "higher",
+    "throughput_rps": "lower",
+    "peak_rss_mb": "higher",
+    "tokens_per_query": "higher",
+}
+
+
+def build_query(kind: str, movie: Movie, rng: random.Random) -> tuple[str, QueryFilters | None]:
+    """A query of `kind` about `movie`; a title query when the movie lacks the data."""
+    if kind == "theme" and movie.themes:
+        theme = rng.choice(movie.themes).name
+        mood = rng.choice(movie.mood.primary) if movie.mood and movie.mood.primary else "memorable"
+        return f"{theme} stories with a {mood} feel", None
+    if kind == "director" and movie.director:
+        return f"{rng.choice(movie.director)} films", None
+    if kind == "filtered" and movie.genres:
+        return f"{rng.choice(movie.genres).lower()} from around {movie.year}", QueryFilters(
+            year_min=movie.year - 10, year_max=movie.year + 10, genres=movie.genres[:1]
+        )
+    return f"movies like {movie.title}", None
+
+
+def query_mix(
+    movies: list[Movie],
+    mix: dict[str, float],
+    count: int,
+    seed: int,
+    texts: list[str] | None = None,
+) -> list[tuple[str, str, QueryFilters | None]]:
+    """`count` (kind, query, filters) drawn deterministically from the catalog or from `texts`."""
+    rng = random.Random(seed)
+    if texts:
+        return [("file", rng.choice(texts), None) for _ in range(count)]
+    kinds = rng.choices(list(mix), weights=list(mix.values()), k=count)
+    queries = []
+    for kind in kinds:
+        query, filters = build_query(kind, rng.choice(movies), rng)
+        queries.append((kind, query, filters))
+    return queries
+
+
+def parse_mix(value: str) -> dict[str, float]:
+    """Parse "theme=4,title=3" into {"theme": 4.0, "title": 3.0}."""
+    mix = {}
+    for part in value.split(","):
+        kind, _, weight = part.partition("=")
+        if kind not in QUERY_KINDS:
+            raise argparse.ArgumentTypeError(
+                f"Unknown query kind '{kind}'. Available: {', '.join(QUERY_KINDS)}"
+            )
+        mix[kind] = float(weight or 1)
+    return mix
+
+
+def peak_rss_mb() -> float:
+    """High-water mark of this process's resident memory (never decreases)."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / 1e6 if sys.platform == "darwin" else peak / 1e3  # bytes on macOS, KiB elsewhere
+
+
+def build_systems(names: list[str], work_dir: Path) -> dict:
+    # Imported late so settings pick up the scratch directories set in main()
+    from entertainment_graph.systems import GraphitiSystem, OpenMemorySystem, PureVectorSystem
+
+    factories = {
+        "pure_vector": PureVectorSystem,
+        "graphiti": GraphitiSystem,
+        "openmemory": lambda: OpenMemorySystem(db_path=str(work_dir / "openmemory.sqlite")),
+    }
+    return {name: factories[name]() for name in names}
+
+
+async def ingest(system, movies: list[Movie], batch_size: int) -> float:
+    start = time.perf_counter()
+    for batch in range(0, len(movies), batch_size):
+        await system.ingest(movies[batch : batch + batch_size])
+    await system.finish_ingest()
+    return time.perf_counter() - start
+
+
+async def run_load(system, queries: list, concurrency: int, limit: int) -> dict:
+    """Run `queries` with `concurrency` closed-loop workers; latency and stage stats."""
+    from entertainment_graph.services.timing import STAGES, collect_timings
+    from entertainment_graph.services.usage import TOKEN_TYPES, collect_usage, cost
+
+    pending = iter(queries)
+    latencies: list[float] = []
+    stages: dict[str, list[float]] = {name: [] for name in STAGES}
+    errors: dict[str, int] = {}
+    spent: dict[str, int] = {}
+
+    async def worker() -> None:
+        for _, query, filters in pending:  # Shared iterator: each query runs once
+            with collect_timings() as timings, collect_usage() as used:
+                start = time.perf_counter()
+                try:
+                    await system.query(query, limit, filters)
+                except Exception as e:
+                    errors[type(e).__name__] = errors.get(type(e).__name__, 0) + 1
+                    continue
+                latencies.append(time.perf_counter() - start)
+            for token_type, count in used.items():
+                spent[token_type] = spent.get(token_type, 0) + count
+            for name, seconds in timings.items():
+                stages.setdefault(name, []).append(seconds)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    wall = time.perf_counter() - start
+
+    ms = np.array(latencies) * 1000 if latencies else np.zeros(1)
+    p50, p95, p99 = np.percentile(ms, [50, 95, 99])
+    completed = max(1, len(latencies))
+    return {
+        "requests": len(queries),
+        "errors": errors,
+        "p50_ms": float(p50),
+        "p95_ms": float(p95),
+        "p99_ms": float(p99),
+        "mean_ms": float(ms.mean()),
+        "throughput_rps": len(latencies) / wall if wall else 0.0,
+        "tokens_per_query": sum(spent.get(name, 0) for name in TOKEN_TYPES) / completed,
+        "cost_usd_per_query": cost(spent) / completed,
+        "usage": spent,
+        "usage_partial": not system.usage_complete,  # e.g. OpenMemory's internal embeddings
+        "stages_ms": {
+            name: {
+                "mean": float(np.mean(values) * 1000),
+                "p95": float(np.percentile(values, 95) * 1000),
+            }
+            for name, values in stages.items()
+            if values
+        },
+    }
+
+
+def compare(results: list[dict], baseline: list[dict], tolerance: float) -> list[str]:
+    """Human-readable regressions of `results` against `baseline` beyond `tolerance`."""
+    def key(run: dict) -> tuple:
+        return run["system"], run["catalog_size"], run["concurrency"]
+
+    previous = {key(run): run for run in baseline}
+    regressions = []
+    for run in results:
+        before = previous.get(key(run))
+        if before is None:
+            continue
+        for metric, worse in REGRESSION_CHECKS.items():
+            old, new = before.get(metric), run.get(metric)
+            if not old or new is None:
+                continue
+            change = (new - old) / old
+            if (change > tolerance) if worse == "higher" else (change < -tolerance):
+                system, size, concurrency = key(run)
+                regressions.append(
+                    f"{system} size={size} c={concurrency}: "
+                    f"{metric} {old:.1f} -> {new:.1f} ({change:+.0%})"
+                )
+    return regressions
+
+
+def run_metadata(args: argparse.Namespace) -> dict:
+    from entertainment_graph.config import get_settings
+
+    settings = get_settings()
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "commit": commit,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "args": {
+            key: str(value) if isinstance(value, Path) else value
+            for key, value in vars(args).items()
+        },
+        "settings": settings.model_dump(
+            include={
+                "llm_provider", "embedding_provider", "llm_model", "embedding_model",
+                "embedding_dimensions", "vector_dtype", "vector_shards", "hybrid_search",
+                "graph_expansion", "aspect_vectors", "reranker", "local_chat_latency_ms",
+            }
+        ),
+    }
+
+
+async def benchmark(args: argparse.Namespace) -> list[dict]:
+    from entertainment_graph.services.data_loader import load_movies
+
+    catalog = sorted(load_movies(str(args.data_dir)), key=lambda movie: movie.id)
+    if not catalog:
+        raise SystemExit(f"No movies in {args.data_dir}")
+    sizes = sorted({min(size, len(catalog)) for size in args.sizes})
+    texts = None
+    if args.queries:
+        texts = [line.strip() for line in args.queries.read_text().splitlines() if line.strip()]
+    print(f"{len(catalog)} movies loaded; sizes {sizes}, concurrency {args.concurrency}\n")
+
+    results = []
+    header = (
+        f"{'system':<12} {'size':>7} {'c':>4} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} "
+        f"{'req/s':>8} {'RSS MB':>8}"
+    )
+    for name, system in build_systems(args.systems, args.work_dir).items():
+        await system.clear()
+        ingested = 0
+        for size in sizes:
+            ingest_seconds = await ingest(system, catalog[ingested:size], args.ingest_batch)
+            print(
+                f"{name}: ingested {size - ingested} movies in {ingest_seconds:.1f}s "
+                f"(catalog now {size})"
+            )
+            ingested = size
+            movies = catalog[:size]
+
+            warmup = query_mix(movies, args.mix, args.warmup, args.seed - 1, texts)
+            await run_load(system, warmup, max(args.concurrency), args.limit)
+            print(header)
+            for concurrency in args.concurrency:
+                queries = query_mix(movies, args.mix, args.requests, args.seed, texts)
+                run = {
+                    "system": name,
+                    "catalog_size": size,
+                    "concurrency": concurrency,
+                    "ingest_seconds": ingest_seconds,
+                    **await run_load(system, queries, concurrency, args.limit),
+                    "peak_rss_mb": peak_rss_mb(),
+                }
+                results.append(run)
+                print(
+                    f"{name:<12} {size:>7} {concurrency:>4} "
+                    f"{run['p50_ms']:>8.1f} {run['p95_ms']:>8.1f} {run['p99_ms']:>8.1f} "
+                    f"{run['throughput_rps']:>8.1f} {run['peak_rss_mb']:>8.0f}"
+                )
+                stages = "  ".join(
+                    f"{stage} {values['mean']:.1f}/{values['p95']:.1f}"
+                    for stage, values in run["stages_ms"].items()
+                )
+                errors = f"  errors: {run['errors']}" if run["errors"] else ""
+                print(f"{'':<12} stages mean/p95 ms: {stages}{errors}")
+                print(
+                    f"{'':<12} per query: {run['tokens_per_query']:.0f} tokens, "
+                    f"${run['cost_usd_per_query']:.5f} (run total {run['usage']})"
+                )
+            print()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--systems",
+        nargs="*",
+        default=["pure_vector"],
+        choices=["pure_vector", "graphiti", "openmemory"],
+    )
+    parser.add_argument(
+        "--data-dir", type=Path, default=Path(__file__).parent.parent.parent / "data" / "movies"
+    )
+    parser.add_argument(
+        "--sizes",
+        type=int,
+        nargs="*",
+        default=[1_000_000],
+        help="Catalog prefixes to ingest and query",
+    )
+    parser.add_argument("--concurrency", type=int, nargs="*", default=[1, 8])
+    parser.add_argument("--requests", type=int, default=200, help="Queries per run")
+    parser.add_argument("--warmup", type=int, default=20)
+    parser.add_argument("--limit", type=int, default=5)
+    parser.add_argument("--mix", type=parse_mix, default="theme=4,title=3,director=2,filtered=1")
+    parser.add_argument(
+        "--queries", type=Path, help="Sample queries from this file (one per line) instead"
+    )
+    parser.add_argument("--ingest-batch", type=int, default=100)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--work-dir", type=Path, help="Scratch directory for Chroma/OpenMemory data"
+    )
+    parser.add_argument("--json", type=Path, help="Write results to this file")
+    parser.add_argument(
+        "--baseline", type=Path, help="Compare against results saved by an earlier --json"
+    )
+    parser.add_argument(
+        "--tolerance", type=float, default=0.1, help="Allowed relative change before flagging"
+    )
+    args = parser.parse_args()
+
+    args.work_dir = args.work_dir or Path(tempfile.mkdtemp(prefix="benchmark-"))
+    os.environ["CHROMA_DIR"] = str(args.work_dir / "chroma")
+    random.seed(args.seed)
+    np.random.seed(args.seed)
+
+    results = asyncio.run(benchmark(args))
+    report = {"meta": run_metadata(args), "results": results}
+    if args.json:
+        args.json.write_text(json.dumps(report, indent=2))
+        print(f"Wrote {args.json}")
+
+    if args.baseline:
+        baseline = json.loads(args.baseline.read_text())
+        regressions = compare(results, baseline["results"], args.tolerance)
+        print(f"\nBaseline {args.baseline} ({baseline['meta'].get('commit') or 'unknown commit'}):")
+        for line in regressions:
+            print(f"  REGRESSION {line}")
+        if regressions:
+            raise SystemExit(1)
+        print(f"  no regressions beyond {args.tolerance:.0%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,166 @@
+"""Recall@k vs memory vs latency for shortened and quantized movie vectors.
+
+Embeds the catalog once at full size, then for each (dimensions, dtype)
+combination measures:
+
+- recall@k of exact top-k neighbours against the curated similar_to links
+- overlap@k with the full-size float32 top-k
+- bytes stored and per-query search latency
+
+Shortened vectors are the full vectors truncated and re-normalized, which is
+what text-embedding-3 models return for the `dimensions` parameter.
+
+    python benchmarks/vector_storage.py --k 10 --dims 512 256 --cache data/embeddings.npz
+"""
+
+import argparse
+import json
+import time
+from pathlib import Path
+
+import numpy as np
+
+from entertainment_graph.config import get_settings
+from entertainment_graph.models import Movie
+from entertainment_graph.services.providers import get_embedding_client
+from entertainment_graph.services.vector_index import VECTOR_DTYPES, VectorIndex, normalize
+
+
+def load_catalog(data_dir: Path) -> list[Movie]:
+    movies = []
+    for movie_file in sorted(data_dir.glob("*.json")):
+        with open(movie_file) as f:
+            movies.append(Movie(**json.load(f)))
+    return movies
+
+
+def embed_catalog(movies: list[Movie], cache: Path | None) -> np.ndarray:
+    """Full-size embeddings of every movie's text, cached on disk if asked."""
+    ids = [movie.id for movie in movies]
+    if cache and cache.exists():
+        with np.load(cache) as data:
+            if list(data["ids"]) == ids:
+                return data["vectors"]
+
+    settings = get_settings()
+    client = get_embedding_client()  # EMBEDDING_PROVIDER=local for an offline run
+    texts = [movie.to_text() for movie in movies]
+    vectors = []
+    for start in range(0, len(texts), 256):
+        response = client.embeddings.create(
+            model=settings.embedding_model, input=texts[start : start + 256]
+        )
+        vectors += [item.embedding for item in sorted(response.data, key=lambda d: d.index)]
+    vectors = np.asarray(vectors, dtype=np.float32)
+
+    if cache:
+        cache.parent.mkdir(parents=True, exist_ok=True)
+        np.savez(cache, ids=np.array(ids), vectors=vectors)
+    return vectors
+
+
+def ground_truth(movies: list[Movie]) -> list[set[int]]:
+    """Row positions each movie is curated as similar to (contrast links excluded)."""
+    positions = {movie.id: i for i, movie in enumerate(movies)}
+    truth = [set() for _ in movies]
+    for i, movie in enumerate(movies):
+        for link in movie.similar_to:
+            target = positions.get(link.target_id)
+            if target is None or target == i or link.relationship_type == "contrast":
+                continue
+            truth[i].add(target)
+            if link.bidirectional:
+                truth[target].add(i)
+    return truth
+
+
+def top_k(index: VectorIndex, k: int) -> tuple[np.ndarray, float]:
+    """Exact top-k neighbours of every row, and the mean seconds per query."""
+    n = len(index)
+    take = min(k, n - 1)
+    start = time.perf_counter()
+    matrix = index.matrix
+    neighbors = np.empty((n, take), dtype=np.int64)
+    for block in range(0, n, 1024):
+        scores = matrix[block : block + 1024] @ matrix.T
+        rows = np.arange(block, min(block + 1024, n))
+        scores[rows - block, rows] = -np.inf
+        top = np.argpartition(-scores, take - 1, axis=1)[:, :take]
+        order = np.argsort(-np.take_along_axis(scores, top, axis=1), axis=1)
+        neighbors[block : block + 1024] = np.take_along_axis(top, order, axis=1)
+    return neighbors, (time.perf_counter() - start) / n
+
+
+def recall(neighbors: np.ndarray, truth: list[set[int]]) -> float:
+    scored = [
+        len(truth_i & set(row.tolist())) / len(truth_i)
+        for row, truth_i in zip(neighbors, truth)
+        if truth_i
+    ]
+    return float(np.mean(scored)) if scored else float("nan")
+
+
+def overlap(neighbors: np.ndarray, reference: np.ndarray) -> float:
+    shared = [
+        len(set(a.tolist()) & set(b.tolist())) / len(b) for a, b in zip(neighbors, reference)
+    ]
+    return float(np.mean(shared))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--data-dir", type=Path, default=Path(__file__).parent.parent.parent / "data" / "movies"
+    )
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--dims", type=int, nargs="*", default=[512, 256])
+    parser.add_argument("--dtypes", nargs="*", default=list(VECTOR_DTYPES), choices=VECTOR_DTYPES)
+    parser.add_argument("--cache", type=Path, help="Reuse full-size embeddings saved here")
+    parser.add_argument("--json", type=Path, help="Also write results to this file")
+    args = parser.parse_args()
+
+    movies = load_catalog(args.data_dir)
+    if len(movies) < 2:
+        raise SystemExit(f"Need at least 2 movies in {args.data_dir}")
+    print(f"Loaded {len(movies)} movies\n")
+
+    full = embed_catalog(movies, args.cache)
+    truth = ground_truth(movies)
+    dims = [full.shape[1]] + [d for d in args.dims if d < full.shape[1]]
+
+    reference = None
+    results = []
+    print(
+        f"{'dims':>6} {'dtype':>8} {'bytes':>12} {'recall@k':>9} {'overlap@k':>10} {'us/query':>9}"
+    )
+    for dim in dims:
+        vectors = normalize(full[:, :dim])
+        for dtype in args.dtypes:
+            index = VectorIndex(dtype=dtype)
+            index.add([movie.id for movie in movies], vectors)
+            neighbors, seconds = top_k(index, args.k)
+            if reference is None:
+                reference = neighbors  # Full size, first dtype (float32 by default)
+            row = {
+                "dims": dim,
+                "dtype": dtype,
+                "bytes": index.nbytes,
+                "recall_at_k": recall(neighbors, truth),
+                "overlap_at_k": overlap(neighbors, reference),
+                "us_per_query": seconds * 1e6,
+            }
+            results.append(row)
+            print(
+                f"{dim:>6} {dtype:>8} {row['bytes']:>12,} {row['recall_at_k']:>9.3f} "
+                f"{row['overlap_at_k']:>10.3f} {row['us_per_query']:>9.1f}"
+            )
+
+    if args.json:
+        args.json.write_text(
+            json.dumps({"k": args.k, "movies": len(movies), "results": results}, indent=2)
+        )
+        print(f"\nWrote {args.json}")
+
+
+if __name__ == "__main__":
+    main()
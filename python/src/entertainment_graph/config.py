@@ -16,6 +16,75 @@ class Settings(BaseModel):
     openai_api_key: str = os.getenv("OPENAI_API_KEY", "")
     embedding_model: str = os.getenv("EMBEDDING_MODEL", "text-embedding-3-small")
     llm_model: str = os.getenv("LLM_MODEL", "gpt-4o")
+    # Shortened Pure Vector embeddings (e.g. 256 or 512); unset keeps the model's full size
+    embedding_dimensions: int | None = int(os.getenv("EMBEDDING_DIMENSIONS", "0")) or None
+    # In-process vector storage: float32, float16, or int8 with a per-vector scale
+    vector_dtype: str = os.getenv("VECTOR_DTYPE", "float32")
+
+    # "openai", or "local" for deterministic offline stand-ins (hashed n-gram
+    # embeddings, canned JSON chat replies after a fixed delay)
+    llm_provider: str = os.getenv("LLM_PROVIDER", "openai")
+    embedding_provider: str = os.getenv("EMBEDDING_PROVIDER", "openai")
+    local_chat_latency_ms: float = float(os.getenv("LOCAL_CHAT_LATENCY_MS", "300"))
+    local_embedding_latency_ms: float = float(os.getenv("LOCAL_EMBEDDING_LATENCY_MS", "0"))
+
+    # Outbound OpenAI rate limits (set to your account's quota per model class)
+    openai_chat_rpm: int = int(os.getenv("OPENAI_CHAT_RPM", "500"))
+    openai_chat_tpm: int = int(os.getenv("OPENAI_CHAT_TPM", "30000"))
+    openai_embedding_rpm: int = int(os.getenv("OPENAI_EMBEDDING_RPM", "3000"))
+    openai_embedding_tpm: int = int(os.getenv("OPENAI_EMBEDDING_TPM", "1000000"))
+    openai_max_concurrency: int = int(os.getenv("OPENAI_MAX_CONCURRENCY", "16"))
+    openai_max_retries: int = int(os.getenv("OPENAI_MAX_RETRIES", "6"))
+
+    # Embedding micro-batching (concurrent queries share one embeddings call)
+    embedding_batch_window_ms: float = float(os.getenv("EMBEDDING_BATCH_WINDOW_MS", "5"))
+    embedding_batch_max_size: int = int(os.getenv("EMBEDDING_BATCH_MAX_SIZE", "64"))
+
+    # Pure Vector hybrid retrieval: fuse BM25 keyword hits with vector top-k
+    hybrid_search: bool = os.getenv("HYBRID_SEARCH", "true").lower() == "true"
+    rrf_k: int = int(os.getenv("RRF_K", "60"))
+
+    # Pure Vector one-hop expansion of hits through curated similar_to links;
+    # the weight blends link strength into the cosine score when re-ranking
+    graph_expansion: bool = os.getenv("GRAPH_EXPANSION", "false").lower() == "true"
+    graph_expansion_weight: float = float(os.getenv("GRAPH_EXPANSION_WEIGHT", "0.3"))
+
+    # Pure Vector per-aspect embeddings (themes, mood, visual, narrative, plot);
+    # vector hits are over-fetched by the factor and re-ranked by aspect fusion
+    aspect_vectors: bool = os.getenv("ASPECT_VECTORS", "false").lower() == "true"
+    aspect_candidate_factor: int = int(os.getenv("ASPECT_CANDIDATE_FACTOR", "4"))
+
+    # Post-retrieval reranking for every system: "none" or "mmr" (maximal marginal
+    # relevance over Pure Vector's stored embeddings), trading relevance for diversity
+    reranker: str = os.getenv("RERANKER", "none")
+    mmr_lambda: float = float(os.getenv("MMR_LAMBDA", "0.7"))
+    rerank_over_fetch: int = int(os.getenv("RERANK_OVER_FETCH", "3"))
+
+    # Max tokens of retrieved context packed into each LLM prompt
+    llm_context_token_budget: int = int(os.getenv("LLM_CONTEXT_TOKEN_BUDGET", "1500"))
+
+    # Precomputed "more like this" table: neighbours per movie, weight of curated
+    # similar_to links in the blended score, and rows per matrix-multiply block
+    similar_movies_k: int = int(os.getenv("SIMILAR_MOVIES_K", "20"))
+    similar_curated_weight: float = float(os.getenv("SIMILAR_CURATED_WEIGHT", "0.3"))
+    similarity_block_size: int = int(os.getenv("SIMILARITY_BLOCK_SIZE", "1024"))
+
+    # Batch queries: max LLM explanation calls in flight per batch
+    batch_query_concurrency: int = int(os.getenv("BATCH_QUERY_CONCURRENCY", "4"))
+
+    # USD per million tokens, for usage cost estimates (defaults: gpt-4o, text-embedding-3-small)
+    llm_prompt_cost_per_1m: float = float(os.getenv("LLM_PROMPT_COST_PER_1M", "2.50"))
+    llm_completion_cost_per_1m: float = float(os.getenv("LLM_COMPLETION_COST_PER_1M", "10.00"))
+    embedding_cost_per_1m: float = float(os.getenv("EMBEDDING_COST_PER_1M", "0.02"))
+
+    # Time each query/ingest stage into the stage_seconds histograms (/metrics);
+    # when off, stages are only timed for requests that ask for `timings`
+    stage_timings: bool = os.getenv("STAGE_TIMINGS", "true").lower() == "true"
+
+    # Deep health checks (OpenAI, Neo4j, memory store) run in the background this
+    # often; /health serves the cached results. Each check is cut off at the timeout
+    health_check_interval_s: float = float(os.getenv("HEALTH_CHECK_INTERVAL_S", "30"))
+    health_check_timeout_s: float = float(os.getenv("HEALTH_CHECK_TIMEOUT_S", "5"))
 
     # Neo4j
     neo4j_uri: str = os.getenv("NEO4J_URI", "")
@@ -24,8 +93,29 @@ class Settings(BaseModel):
 
     # Paths
     data_dir: str = os.getenv("DATA_DIR", "data")
+    # /ingest streams the data directory into systems this many movies at a time
+    ingest_batch_size: int = int(os.getenv("INGEST_BATCH_SIZE", "1000"))
     chroma_dir: str = os.getenv("CHROMA_DIR", "data/chroma")
 
+    # ChromaDB calls run on a dedicated pool so they don't block the event loop
+    chroma_threads: int = int(os.getenv("CHROMA_THREADS", "4"))
+    chroma_max_queue: int = int(os.getenv("CHROMA_MAX_QUEUE", "64"))
+    # Pure Vector collections are hashed by id across this many shards (re-ingest after changing)
+    vector_shards: int = int(os.getenv("VECTOR_SHARDS", "1"))
+
+    # HNSW index parameters per collection. search_ef applies on startup; M and
+    # construction_ef apply to new collections and shard rebuilds
+    hnsw_m: int = int(os.getenv("HNSW_M", "16"))
+    hnsw_construction_ef: int = int(os.getenv("HNSW_CONSTRUCTION_EF", "100"))
+    hnsw_search_ef: int = int(os.getenv("HNSW_SEARCH_EF", "100"))
+    aspect_hnsw_m: int = int(os.getenv("ASPECT_HNSW_M", os.getenv("HNSW_M", "16")))
+    aspect_hnsw_construction_ef: int = int(
+        os.getenv("ASPECT_HNSW_CONSTRUCTION_EF", os.getenv("HNSW_CONSTRUCTION_EF", "100"))
+    )
+    aspect_hnsw_search_ef: int = int(
+        os.getenv("ASPECT_HNSW_SEARCH_EF", os.getenv("HNSW_SEARCH_EF", "100"))
+    )
+
 
 @lru_cache
 def get_settings() -> Settings:
@@ -7,8 +7,10 @@ from fastapi.middleware.cors import CORSMiddleware
 
 from entertainment_graph.config import get_settings
 from entertainment_graph.systems import PureVectorSystem, GraphitiSystem, OpenMemorySystem
-from entertainment_graph.routers import query, movies, ingest, health
-from entertainment_graph.routers.query import register_system
+from entertainment_graph.routers import query, movies, ingest, health, metrics
+from entertainment_graph.routers.query import get_systems, register_system
+from entertainment_graph.services.executor import get_chroma_executor
+from entertainment_graph.services.health import get_health_monitor
 
 
 @asynccontextmanager
@@ -40,9 +42,14 @@ async def lifespan(app: FastAPI):
         logger.error(f"✗ OpenMemory failed: {e}")
         logger.info("Skipping OpenMemory system (local storage not available)")
 
+    # Deep health checks run in the background; /health serves their results
+    get_health_monitor().start(get_systems())
+
     yield
 
-    # Cleanup (if needed)
+    # Cleanup
+    await get_health_monitor().stop()
+    get_chroma_executor().shutdown()
 
 
 app = FastAPI(
@@ -70,6 +77,7 @@ app.include_router(health.router)
 app.include_router(query.router)
 app.include_router(movies.router)
 app.include_router(ingest.router)
+app.include_router(metrics.router)
 
 
 @app.get("/")
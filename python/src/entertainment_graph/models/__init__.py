@@ -1,7 +1,7 @@
 """Data models."""
 
 from .movie import Movie, SimilarityLink, Theme, Mood, VisualStyle, NarrativeStyle
-from .query import QueryResult, AgentResponse
+from .query import FacetQuery, QueryFilters, QueryResult, AgentResponse
 
 __all__ = [
     "Movie",
@@ -10,6 +10,8 @@ __all__ = [
     "Mood",
     "VisualStyle",
     "NarrativeStyle",
+    "FacetQuery",
+    "QueryFilters",
     "QueryResult",
     "AgentResponse",
 ]
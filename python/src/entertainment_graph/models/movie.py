@@ -77,6 +77,50 @@ class Movie(BaseModel):
     # Ground truth relationships
     similar_to: list[SimilarityLink] = []
 
+    def facet_terms(self) -> set[str]:
+        """Discrete attributes as lowercase "facet:value" terms, for facet filtering."""
+        values: list[tuple[str, str]] = [("genre", g) for g in self.genres]
+        values += [("theme", t.name) for t in self.themes]
+        if self.mood:
+            values += [("mood", m) for m in self.mood.primary]
+            values += [("undertone", u) for u in self.mood.undertones]
+            values.append(("intensity", self.mood.intensity))
+        if self.visual_style:
+            values += [("visual", d) for d in self.visual_style.descriptors]
+            values += [("palette", p) for p in self.visual_style.palette]
+        if self.narrative:
+            values.append(("pacing", self.narrative.pacing))
+            values.append(("tone", self.narrative.tone))
+        return {f"{facet}:{value.strip().lower()}" for facet, value in values}
+
+    def aspect_texts(self) -> dict[str, str]:
+        """One text per described aspect (themes, mood, visual, narrative, plot) to embed."""
+        aspects = {}
+        if self.themes:
+            aspects["themes"] = "Themes: " + "; ".join(
+                f"{t.name} - {t.specificity}" if t.specificity else t.name for t in self.themes
+            )
+        if self.mood:
+            parts = [f"Mood: {', '.join(self.mood.primary)}", f"{self.mood.intensity} intensity"]
+            if self.mood.undertones:
+                parts.append(f"undertones of {', '.join(self.mood.undertones)}")
+            if self.mood.emotional_arc:
+                parts.append(self.mood.emotional_arc)
+            aspects["mood"] = ". ".join(parts)
+        if self.visual_style:
+            style = self.visual_style
+            details = style.descriptors + style.palette + style.composition + style.influences
+            if details:
+                aspects["visual"] = "Visual style: " + ", ".join(details)
+        if self.narrative:
+            parts = [self.narrative.pacing, self.narrative.structure, self.narrative.tone]
+            if self.narrative.perspective:
+                parts.append(self.narrative.perspective)
+            aspects["narrative"] = "Narrative: " + "; ".join(parts)
+        if self.plot_summary:
+            aspects["plot"] = self.plot_summary
+        return aspects
+
     def to_text(self) -> str:
         """Flatten movie to text for embedding."""
         parts = [f"{self.title} ({self.year})"]
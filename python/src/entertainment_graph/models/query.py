@@ -1,7 +1,89 @@
 """Query and response models for agentic systems."""
 
+from typing import Literal
+
 from pydantic import BaseModel
 
+from .movie import Movie
+
+
+class FacetQuery(BaseModel):
+    """
+    Boolean expression over "facet:value" terms (see Movie.facet_terms).
+
+    e.g. "unsettling but not horror":
+    {"any_of": ["mood:unsettling", "undertone:unsettling"], "none_of": ["genre:horror"]}
+    """
+
+    all_of: list[str] = []  # AND
+    any_of: list[str] = []  # OR
+    none_of: list[str] = []  # NOT
+
+    def is_empty(self) -> bool:
+        return not (self.all_of or self.any_of or self.none_of)
+
+    def matches(self, terms: set[str]) -> bool:
+        if any(t.lower() not in terms for t in self.all_of):
+            return False
+        if self.any_of and not any(t.lower() in terms for t in self.any_of):
+            return False
+        return not any(t.lower() in terms for t in self.none_of)
+
+
+class QueryFilters(BaseModel):
+    """Structured constraints applied during retrieval, not after it."""
+
+    year_min: int | None = None
+    year_max: int | None = None
+    genres: list[str] = []  # Match any (case-insensitive)
+    directors: list[str] = []  # Match any (case-insensitive)
+    runtime_min: int | None = None
+    runtime_max: int | None = None
+    mood_intensity: list[Literal["subtle", "moderate", "intense"]] = []  # Match any
+    facets: FacetQuery | None = None
+
+    def is_empty(self) -> bool:
+        return not any(
+            [
+                self.year_min is not None,
+                self.year_max is not None,
+                self.genres,
+                self.directors,
+                self.runtime_min is not None,
+                self.runtime_max is not None,
+                self.mood_intensity,
+                self.facets is not None and not self.facets.is_empty(),
+            ]
+        )
+
+    def matches(self, movie: Movie) -> bool:
+        """Whether a movie satisfies every filter."""
+        if self.year_min is not None and movie.year < self.year_min:
+            return False
+        if self.year_max is not None and movie.year > self.year_max:
+            return False
+        if self.runtime_min is not None or self.runtime_max is not None:
+            if movie.runtime_minutes is None:
+                return False
+            if self.runtime_min is not None and movie.runtime_minutes < self.runtime_min:
+                return False
+            if self.runtime_max is not None and movie.runtime_minutes > self.runtime_max:
+                return False
+        if self.genres:
+            wanted = {g.lower() for g in self.genres}
+            if not wanted & {g.lower() for g in movie.genres}:
+                return False
+        if self.directors:
+            wanted = {d.lower() for d in self.directors}
+            if not wanted & {d.lower() for d in movie.director}:
+                return False
+        if self.mood_intensity:
+            if movie.mood is None or movie.mood.intensity not in self.mood_intensity:
+                return False
+        if self.facets is not None and not self.facets.matches(movie.facet_terms()):
+            return False
+        return True
+
 
 class QueryResult(BaseModel):
     """A single result from an agentic query."""
@@ -20,3 +102,5 @@ class AgentResponse(BaseModel):
     results: list[QueryResult]
     reasoning: str  # How the agent interpreted the query
     system_name: str  # Which system generated this
+    metadata: dict = {}  # Request accounting, e.g. prompt_tokens sent and the API "usage" spent
+    timings: dict[str, float] | None = None  # Milliseconds per stage, when requested
@@ -1,5 +1,5 @@
 """API routers."""
 
-from . import query, movies, ingest, health
+from . import query, movies, ingest, health, metrics
 
-__all__ = ["query", "movies", "ingest", "health"]
+__all__ = ["query", "movies", "ingest", "health", "metrics"]
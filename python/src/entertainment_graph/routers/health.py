@@ -1,9 +1,10 @@
 """Health check endpoints."""
 
-from fastapi import APIRouter
+from fastapi import APIRouter, Response
 from pydantic import BaseModel
 
 from entertainment_graph.routers.query import get_systems
+from entertainment_graph.services.health import get_health_monitor
 
 router = APIRouter(tags=["health"])
 
@@ -11,6 +12,9 @@ router = APIRouter(tags=["health"])
 class SystemHealth(BaseModel):
     name: str
     healthy: bool
+    checked_at: float | None = None  # Unix time of the cached deep check
+    latency_ms: float | None = None
+    error: str | None = None
 
 
 class HealthResponse(BaseModel):
@@ -19,20 +23,46 @@ class HealthResponse(BaseModel):
     version: str = "0.1.0"
 
 
+class ReadinessResponse(BaseModel):
+    status: str
+    systems: dict[str, bool]
+
+
 @router.get("/health", response_model=HealthResponse)
 async def health_check() -> HealthResponse:
-    """Check health of all systems."""
+    """Health of all systems from the latest background deep checks."""
     systems = get_systems()
-    system_health = []
-
-    for name, system in systems.items():
-        try:
-            healthy = await system.health_check()
-        except Exception:
-            healthy = False
-        system_health.append(SystemHealth(name=name, healthy=healthy))
+    monitor = get_health_monitor()
+    results = monitor.results
+    if any(name not in results for name in systems):
+        # Nothing cached yet (e.g. right after startup): check once inline
+        results = await monitor.refresh(systems)
 
+    system_health = [
+        SystemHealth(name=name, **results[name].model_dump()) for name in systems if name in results
+    ]
     all_healthy = all(s.healthy for s in system_health) if system_health else True
     status = "healthy" if all_healthy else "degraded"
 
     return HealthResponse(status=status, systems=system_health)
+
+
+@router.get("/health/live")
+async def liveness() -> dict[str, str]:
+    """The process is up and serving; no dependencies are checked."""
+    return {"status": "alive"}
+
+
+@router.get("/health/ready", response_model=ReadinessResponse)
+async def readiness(response: Response) -> ReadinessResponse:
+    """
+    Whether every registered system can take requests, from local state only.
+
+    Answers 503 when no system is registered or one reports not ready (e.g.
+    its ChromaDB executor is saturated), so load balancers route elsewhere.
+    """
+    systems = {name: system.ready() for name, system in get_systems().items()}
+    ready = bool(systems) and all(systems.values())
+    if not ready:
+        response.status_code = 503
+    return ReadinessResponse(status="ready" if ready else "not_ready", systems=systems)
@@ -1,11 +1,18 @@
 """Ingestion endpoints."""
 
+from collections.abc import Iterable
+from functools import partial
+
 from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel
 
+from entertainment_graph.config import get_settings
 from entertainment_graph.models.movie import Movie
-from entertainment_graph.services.data_loader import load_movies
+from entertainment_graph.services.data_loader import iter_batches
+from entertainment_graph.services.timing import timed
+from entertainment_graph.services.usage import collect_usage, get_usage_ledger
 from entertainment_graph.routers.query import get_systems
+from entertainment_graph.systems import AgenticSystem
 
 router = APIRouter(prefix="/ingest", tags=["ingest"])
 
@@ -13,6 +20,8 @@ router = APIRouter(prefix="/ingest", tags=["ingest"])
 class IngestResponse(BaseModel):
     system: str
     movies_ingested: int
+    timings: dict[str, float] | None = None  # Milliseconds per stage, when STAGE_TIMINGS is on
+    usage: dict | None = None  # Tokens and estimated cost of the ingest
 
 
 class IngestAllResponse(BaseModel):
@@ -24,6 +33,29 @@ class IngestRequest(BaseModel):
     movies: list[Movie]
 
 
+async def _ingest(
+    name: str, system: AgenticSystem, batches: Iterable[list[Movie]]
+) -> IngestResponse:
+    """
+    Ingest batches into one system, accounting its usage and timing its stages
+    when enabled (summed over the batches).
+    """
+    count, timings = 0, None
+    with collect_usage() as used:
+        for movies in batches:
+            if get_settings().stage_timings:
+                ingested, batch = await timed(name, "ingest", partial(system.ingest, movies))
+                timings = timings or {}
+                for key, ms in batch.items():
+                    timings[key] = round(timings.get(key, 0.0) + ms, 2)
+            else:
+                ingested = await system.ingest(movies)
+            count += ingested
+        await system.finish_ingest()
+    spent = get_usage_ledger().add(name, "ingest", used, partial=not system.usage_complete)
+    return IngestResponse(system=name, movies_ingested=count, timings=timings, usage=spent)
+
+
 @router.post("/{system_name}", response_model=IngestResponse)
 async def ingest_to_system(system_name: str) -> IngestResponse:
     """Ingest all movies from data directory into a specific system."""
@@ -31,11 +63,8 @@ async def ingest_to_system(system_name: str) -> IngestResponse:
     if system_name not in systems:
         return IngestResponse(system=system_name, movies_ingested=-1)
 
-    movies = load_movies()
-    system = systems[system_name]
-    count = await system.ingest(movies)
-
-    return IngestResponse(system=system_name, movies_ingested=count)
+    batches = iter_batches(get_settings().ingest_batch_size)
+    return await _ingest(system_name, systems[system_name], batches)
 
 
 @router.post("/{system_name}/bulk", response_model=IngestResponse)
@@ -48,22 +77,43 @@ async def ingest_bulk_to_system(system_name: str, request: IngestRequest) -> Ing
             detail=f"System '{system_name}' not found. Available: {list(systems.keys())}",
         )
 
-    system = systems[system_name]
-    count = await system.ingest(request.movies)
+    return await _ingest(system_name, systems[system_name], [request.movies])
+
+
+class ShardRebuildResponse(BaseModel):
+    system: str
+    shard: int
+    records: int
 
-    return IngestResponse(system=system_name, movies_ingested=count)
+
+@router.post("/{system_name}/shards/{shard}/rebuild", response_model=ShardRebuildResponse)
+async def rebuild_shard(system_name: str, shard: int) -> ShardRebuildResponse:
+    """Rebuild one vector shard's index while queries keep being served."""
+    systems = get_systems()
+    if system_name not in systems:
+        raise HTTPException(
+            status_code=404,
+            detail=f"System '{system_name}' not found. Available: {list(systems.keys())}",
+        )
+    system = systems[system_name]
+    if not hasattr(system, "rebuild_shard"):
+        raise HTTPException(status_code=400, detail=f"System '{system_name}' has no vector shards")
+    try:
+        records = await system.rebuild_shard(shard)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return ShardRebuildResponse(system=system_name, shard=shard, records=records)
 
 
 @router.post("", response_model=IngestAllResponse)
 async def ingest_to_all() -> IngestAllResponse:
     """Ingest all movies from data directory into all systems."""
-    movies = load_movies()
+    batch_size = get_settings().ingest_batch_size
     results = []
 
     for name, system in get_systems().items():
         try:
-            count = await system.ingest(movies)
-            results.append(IngestResponse(system=name, movies_ingested=count))
+            results.append(await _ingest(name, system, iter_batches(batch_size)))
         except Exception as e:
             results.append(IngestResponse(system=f"{name} (error: {e})", movies_ingested=-1))
 
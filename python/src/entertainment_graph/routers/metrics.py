@@ -0,0 +1,27 @@
+"""Runtime metrics endpoints."""
+
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+
+from entertainment_graph.services import metrics
+from entertainment_graph.services.usage import get_usage_ledger
+
+router = APIRouter(tags=["metrics"])
+
+
+@router.get("/stats")
+async def get_stats() -> dict[str, dict]:
+    """Snapshot of in-process metrics (e.g. embedding batch-size histograms)."""
+    return metrics.snapshot()
+
+
+@router.get("/metrics", response_class=PlainTextResponse)
+async def get_metrics() -> PlainTextResponse:
+    """All metrics in the Prometheus text format, for scraping."""
+    return PlainTextResponse(metrics.render_prometheus(), media_type="text/plain; version=0.0.4")
+
+
+@router.get("/usage")
+async def get_usage() -> list[dict]:
+    """Requests, tokens and estimated cost per system and endpoint over rolling windows."""
+    return get_usage_ledger().summary()
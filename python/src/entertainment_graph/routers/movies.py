@@ -1,23 +1,133 @@
 """Movie data endpoints."""
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Query
+from pydantic import BaseModel
 
-from entertainment_graph.models import Movie
-from entertainment_graph.services.data_loader import load_movies, load_movie
+from entertainment_graph.models import FacetQuery, Movie
+from entertainment_graph.services.catalog import get_catalog
+from entertainment_graph.services.similarity_graph import get_similarity_graph
+from entertainment_graph.services.similarity_table import get_similarity_table
 
 router = APIRouter(prefix="/movies", tags=["movies"])
 
 
+class SimilarMovie(BaseModel):
+    """A neighbour from the precomputed similar-movies table."""
+
+    id: str
+    title: str
+    year: int
+    score: float
+    curated: bool  # Linked by the movie's curated similar_to list
+
+
+class Recommendation(BaseModel):
+    """A movie reached by a random walk over curated similar_to links."""
+
+    id: str
+    title: str
+    year: int
+    score: float
+
+
 @router.get("", response_model=list[Movie])
 async def list_movies() -> list[Movie]:
     """List all movies in the dataset."""
-    return load_movies()
+    return list(get_catalog().movies.values())
+
+
+@router.get("/facets")
+async def facet_counts(
+    facet: list[str] = Query(default=[]),
+    all_of: list[str] = Query(default=[]),
+    any_of: list[str] = Query(default=[]),
+    none_of: list[str] = Query(default=[]),
+) -> dict[str, dict[str, int]]:
+    """
+    Value counts per facet (theme, mood, undertone, intensity, visual, palette,
+    pacing, tone, genre), optionally within movies matching a facet expression.
+    """
+    index = get_catalog().facets
+    query = FacetQuery(all_of=all_of, any_of=any_of, none_of=none_of)
+    bits = None if query.is_empty() else index.evaluate(query)
+    return index.counts(bits, facets=facet or None)
+
+
+@router.get("/recommendations", response_model=list[Recommendation])
+async def recommendations(
+    seed: list[str] = Query(default=[]),
+    limit: int = Query(default=10, ge=1, le=100),
+    restart: float = Query(default=0.15, gt=0, lt=1),
+) -> list[Recommendation]:
+    """
+    Recommendations from one or more seed movies ("like Severance and Her").
+
+    Personalized PageRank over the curated similar_to graph, run in process -
+    no embedding, graph database or LLM call.
+    """
+    if not seed:
+        raise HTTPException(status_code=400, detail="At least one seed movie is required")
+    graph = get_similarity_graph()
+    unknown = [movie_id for movie_id in seed if movie_id not in graph]
+    if len(unknown) == len(seed):
+        raise HTTPException(status_code=404, detail=f"Unknown movies: {', '.join(unknown)}")
+
+    movies = get_catalog().movies
+    return [
+        Recommendation(
+            id=movie_id,
+            title=movies[movie_id].title,
+            year=movies[movie_id].year,
+            score=round(score, 4),
+        )
+        for movie_id, score in graph.recommend(seed, limit=limit, restart=restart)
+    ]
 
 
 @router.get("/{movie_id}", response_model=Movie)
 async def get_movie(movie_id: str) -> Movie:
     """Get a specific movie by ID."""
-    movie = load_movie(movie_id)
+    movie = get_catalog().movies.get(movie_id)
     if not movie:
         raise HTTPException(status_code=404, detail=f"Movie '{movie_id}' not found")
     return movie
+
+
+@router.get("/{movie_id}/similar", response_model=list[SimilarMovie])
+async def similar_movies(
+    movie_id: str, limit: int = Query(default=10, ge=1, le=100)
+) -> list[SimilarMovie]:
+    """
+    Movies most like `movie_id`, read from the precomputed table.
+
+    Scores blend embedding similarity with curated similar_to links. The table
+    is refreshed when movies are ingested into Pure Vector.
+    """
+    catalog = get_catalog()
+    neighbors = get_similarity_table().similar(movie_id, limit)
+    if not neighbors:
+        if movie_id not in catalog.movies:
+            raise HTTPException(status_code=404, detail=f"Movie '{movie_id}' not found")
+        raise HTTPException(
+            status_code=404, detail=f"No similar movies for '{movie_id}'; ingest it first"
+        )
+
+    def is_curated(neighbor: Movie) -> bool:
+        movie = catalog.movies.get(movie_id)
+        if movie and any(link.target_id == neighbor.id for link in movie.similar_to):
+            return True
+        return any(
+            link.target_id == movie_id and link.bidirectional for link in neighbor.similar_to
+        )
+
+    return [
+        SimilarMovie(
+            id=neighbor_id,
+            title=catalog.movies[neighbor_id].title,
+            year=catalog.movies[neighbor_id].year,
+            score=round(score, 3),
+            curated=is_curated(catalog.movies[neighbor_id]),
+        )
+        for neighbor_id, score in neighbors
+        if neighbor_id in catalog.movies
+    ]
@@ -1,16 +1,26 @@
 """Query endpoints for comparing retrieval systems."""
 
+from functools import partial
+
 from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel
 
+from entertainment_graph.config import get_settings
 from entertainment_graph.systems import AgenticSystem
-from entertainment_graph.models import AgentResponse
+from entertainment_graph.models import AgentResponse, QueryFilters
+from entertainment_graph.services import metrics
+from entertainment_graph.services.singleflight import SingleFlight
+from entertainment_graph.services.timing import timed
+from entertainment_graph.services.usage import collect_usage, get_usage_ledger
 
 router = APIRouter(prefix="/query", tags=["query"])
 
 # Systems registry - populated at startup
 _systems: dict[str, AgenticSystem] = {}
 
+# Identical concurrent queries share one underlying system.query() call
+_inflight = SingleFlight()
+
 
 def register_system(name: str, system: AgenticSystem) -> None:
     """Register a system for querying."""
@@ -25,6 +35,19 @@ def get_systems() -> dict[str, AgenticSystem]:
 class QueryRequest(BaseModel):
     query: str
     limit: int = 5
+    filters: QueryFilters | None = None
+    timings: bool = False  # Include per-stage milliseconds in the response
+
+
+class BatchQueryRequest(BaseModel):
+    queries: list[str]
+    limit: int = 5
+    filters: QueryFilters | None = None  # Applied to every query
+
+
+class BatchQueryResponse(BaseModel):
+    responses: list[AgentResponse]  # Same order as the request's queries
+    usage: dict = {}  # Tokens and estimated cost of the whole batch
 
 
 class ComparisonResponse(BaseModel):
@@ -32,26 +55,50 @@ class ComparisonResponse(BaseModel):
     responses: dict[str, AgentResponse]
 
 
-@router.post("/{system_name}", response_model=AgentResponse)
-async def query_system(system_name: str, request: QueryRequest) -> AgentResponse:
-    """Query a specific system."""
-    if system_name not in _systems:
-        raise HTTPException(
-            status_code=404,
-            detail=f"System '{system_name}' not found. Available: {list(_systems.keys())}",
-        )
+async def _run_query(
+    system_name: str, request: QueryRequest, endpoint: str = "query"
+) -> AgentResponse:
+    """
+    Query a system, coalescing with any identical request already in flight.
 
+    The response's metadata["usage"] holds the tokens and estimated cost of
+    the underlying call, which coalesced callers share rather than repeat.
+    """
     system = _systems[system_name]
-    return await system.query(request.query, request.limit)
+    filters_key = request.filters.model_dump_json() if request.filters else None
+    collect = get_settings().stage_timings or request.timings
+    key = (system_name, request.query, request.limit, filters_key, collect)
+    metrics.cache_lookup("query_singleflight", key in _inflight)
+
+    async def run() -> AgentResponse:
+        call = partial(system.query, request.query, request.limit, request.filters)
+        timings = None
+        with collect_usage() as used:
+            if collect:
+                response, timings = await timed(system_name, "query", call)
+            else:
+                response = await call()
+        spent = get_usage_ledger().add(
+            system_name, endpoint, used, partial=not system.usage_complete
+        )
+        return response.model_copy(
+            update={"metadata": response.metadata | {"usage": spent}, "timings": timings}
+        )
 
+    response = await _inflight.do(key, run)
+    if response.timings is not None and not request.timings:
+        response = response.model_copy(update={"timings": None})
+    return response
 
+
+# Declared before /{system_name}, which would otherwise match "compare"
 @router.post("/compare", response_model=ComparisonResponse)
 async def compare_all(request: QueryRequest) -> ComparisonResponse:
     """Query all systems and compare results."""
     responses = {}
-    for name, system in _systems.items():
+    for name in _systems:
         try:
-            responses[name] = await system.query(request.query, request.limit)
+            responses[name] = await _run_query(name, request, endpoint="compare")
         except Exception as e:
             responses[name] = AgentResponse(
                 results=[],
@@ -62,6 +109,51 @@ async def compare_all(request: QueryRequest) -> ComparisonResponse:
     return ComparisonResponse(query=request.query, responses=responses)
 
 
+@router.post("/{system_name}", response_model=AgentResponse)
+async def query_system(system_name: str, request: QueryRequest) -> AgentResponse:
+    """Query a specific system."""
+    if system_name not in _systems:
+        raise HTTPException(
+            status_code=404,
+            detail=f"System '{system_name}' not found. Available: {list(_systems.keys())}",
+        )
+
+    return await _run_query(system_name, request)
+
+
+@router.post("/{system_name}/batch", response_model=BatchQueryResponse)
+async def query_system_batch(system_name: str, request: BatchQueryRequest) -> BatchQueryResponse:
+    """Run many queries against a specific system in one call."""
+    if system_name not in _systems:
+        raise HTTPException(
+            status_code=404,
+            detail=f"System '{system_name}' not found. Available: {list(_systems.keys())}",
+        )
+
+    system = _systems[system_name]
+    settings = get_settings()
+    call = partial(
+        system.query_batch,
+        request.queries,
+        request.limit,
+        concurrency=settings.batch_query_concurrency,
+        filters=request.filters,
+    )
+    with collect_usage() as used:
+        if settings.stage_timings:
+            responses, _ = await timed(system_name, "query_batch", call)
+        else:
+            responses = await call()
+    spent = get_usage_ledger().add(
+        system_name,
+        "batch",
+        used,
+        requests=len(request.queries),
+        partial=not system.usage_complete,
+    )
+    return BatchQueryResponse(responses=responses, usage=spent)
+
+
 @router.get("/systems")
 async def list_systems() -> list[str]:
     """List available systems."""
@@ -0,0 +1,92 @@
+"""Per-aspect movie vectors and query-dependent aspect fusion."""
+
+import re
+
+import numpy as np
+
+from entertainment_graph.services.vector_index import VectorIndex
+
+ASPECTS = ("themes", "mood", "visual", "narrative", "plot")
+
+# Query words that say which aspect the user cares about
+ASPECT_CUES: dict[str, frozenset[str]] = {
+    "themes": frozenset(
+        "theme themes thematic about explores exploring meaning existential identity grief "
+        "loss memory humanity isolation philosophical ideas".split()
+    ),
+    "mood": frozenset(
+        "mood moody feel feels feeling vibe vibes atmosphere atmospheric dark darker light "
+        "lighter uplifting melancholy melancholic cozy tense sad funny unsettling emotional".split()
+    ),
+    "visual": frozenset(
+        "visual visuals visually look looks looking cinematography shot shots color colors "
+        "colour colours palette aesthetic aesthetics beautiful stunning neon imagery".split()
+    ),
+    "narrative": frozenset(
+        "pacing paced pace slow fast slowburn structure narrative storytelling twist twists "
+        "nonlinear dialogue tone perspective told".split()
+    ),
+    "plot": frozenset(
+        "plot premise happens story setting set character characters protagonist where who".split()
+    ),
+}
+
+_WORD_RE = re.compile(r"[a-z]+")
+
+
+def aspect_weights(query: str, base: float = 0.5, cue: float = 1.0) -> np.ndarray:
+    """Weight per aspect (in ASPECTS order): `base`, plus `cue` per cue word in the query."""
+    words = set(_WORD_RE.findall(query.lower()))
+    return np.array(
+        [base + cue * len(words & ASPECT_CUES[aspect]) for aspect in ASPECTS], dtype=np.float32
+    )
+
+
+class AspectIndex:
+    """One VectorIndex per aspect; movies only have rows for the aspects they describe."""
+
+    def __init__(self, dtype: str = "float32"):
+        self.vectors = {aspect: VectorIndex(dtype=dtype) for aspect in ASPECTS}
+
+    def __len__(self) -> int:
+        return max(len(index) for index in self.vectors.values())
+
+    def add(self, aspect: str, ids: list[str], vectors) -> None:
+        self.vectors[aspect].add(ids, vectors)
+
+    def clear(self) -> None:
+        for index in self.vectors.values():
+            index.clear()
+
+    def fuse(
+        self,
+        ids: list[str],
+        query_vector: np.ndarray,
+        base_similarity: np.ndarray,
+        weights: np.ndarray,
+        base_weight: float = 1.0,
+    ) -> np.ndarray:
+        """
+        Weighted mean of the whole-document similarity and per-aspect similarities.
+
+        Gathers the candidates' aspect vectors into one (ids, aspects, dim)
+        array and scores it against the unit `query_vector` in a single matmul.
+        Aspects a movie doesn't describe drop out of its mean.
+        """
+        dim = len(query_vector)
+        stacked = np.zeros((len(ids), len(ASPECTS), dim), dtype=np.float32)
+        present = np.zeros((len(ids), len(ASPECTS)), dtype=bool)
+        for a, aspect in enumerate(ASPECTS):
+            index = self.vectors[aspect]
+            if index.dim != dim:
+                continue
+            rows = [index.position(movie_id) for movie_id in ids]
+            have = np.array([row is not None for row in rows], dtype=bool)
+            if have.any():
+                stacked[have, a] = index.rows([row for row in rows if row is not None])
+                present[:, a] = have
+
+        similarity = stacked @ query_vector
+        aspect_weight = present * weights
+        total = (similarity * aspect_weight).sum(axis=1) + base_weight * base_similarity
+        return total / (aspect_weight.sum(axis=1) + base_weight)
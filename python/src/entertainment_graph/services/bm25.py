@@ -0,0 +1,104 @@
+"""In-process BM25 keyword index and rank fusion."""
+
+import heapq
+import math
+import re
+from collections import Counter, defaultdict
+from collections.abc import Callable
+from itertools import islice
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+# Words that carry no signal in catalog queries ("Denis Villeneuve movies")
+STOPWORDS = frozenset(
+    "a an and are as at be but by for from in into is it its like me movie movies film films "
+    "of on or show shows similar something that the their this to with".split()
+)
+
+
+def tokenize(text: str) -> list[str]:
+    """Lowercase alphanumeric terms, minus stopwords."""
+    return [t for t in _TOKEN_RE.findall(text.lower()) if t not in STOPWORDS]
+
+
+class BM25Index:
+    """
+    Inverted index with Okapi BM25 scoring, updated incrementally.
+
+    Postings map term -> {doc_id: term frequency}, so a query only touches
+    the documents containing its terms.
+    """
+
+    def __init__(self, k1: float = 1.5, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        self._postings: dict[str, dict[str, int]] = defaultdict(dict)
+        self._doc_terms: dict[str, Counter] = {}
+        self._doc_lengths: dict[str, int] = {}
+        self._total_length = 0
+
+    def __len__(self) -> int:
+        return len(self._doc_terms)
+
+    def add(self, doc_id: str, text: str) -> None:
+        """Index a document, replacing any previous version with the same id."""
+        self.remove(doc_id)
+        terms = Counter(tokenize(text))
+        self._doc_terms[doc_id] = terms
+        self._doc_lengths[doc_id] = sum(terms.values())
+        self._total_length += self._doc_lengths[doc_id]
+        for term, tf in terms.items():
+            self._postings[term][doc_id] = tf
+
+    def remove(self, doc_id: str) -> None:
+        terms = self._doc_terms.pop(doc_id, None)
+        if terms is None:
+            return
+        self._total_length -= self._doc_lengths.pop(doc_id)
+        for term in terms:
+            postings = self._postings[term]
+            postings.pop(doc_id, None)
+            if not postings:
+                del self._postings[term]
+
+    def clear(self) -> None:
+        self._postings.clear()
+        self._doc_terms.clear()
+        self._doc_lengths.clear()
+        self._total_length = 0
+
+    def search(
+        self, query: str, k: int, allowed: Callable[[str], bool] | None = None
+    ) -> list[tuple[str, float]]:
+        """Top-k (doc_id, score) pairs, optionally restricted to ids `allowed` accepts."""
+        n_docs = len(self._doc_terms)
+        if n_docs == 0:
+            return []
+        avg_length = self._total_length / n_docs
+
+        scores: dict[str, float] = defaultdict(float)
+        for term in set(tokenize(query)):
+            postings = self._postings.get(term)
+            if not postings:
+                continue
+            df = len(postings)
+            idf = math.log(1 + (n_docs - df + 0.5) / (df + 0.5))
+            for doc_id, tf in postings.items():
+                length = self._doc_lengths[doc_id]
+                norm = self.k1 * (1 - self.b + self.b * length / avg_length)
+                scores[doc_id] += idf * tf * (self.k1 + 1) / (tf + norm)
+
+        if allowed is None:
+            return heapq.nlargest(k, scores.items(), key=lambda item: item[1])
+        # Best first, so the filter only runs until k matches are found
+        ranked = sorted(scores.items(), key=lambda item: item[1], reverse=True)
+        return list(islice((item for item in ranked if allowed(item[0])), k))
+
+
+def reciprocal_rank_fusion(rankings: list[list[str]], k: int = 60) -> list[tuple[str, float]]:
+    """Fuse ranked id lists: score(d) = sum over lists of 1 / (k + rank)."""
+    scores: dict[str, float] = defaultdict(float)
+    for ranking in rankings:
+        for rank, doc_id in enumerate(ranking, 1):
+            scores[doc_id] += 1 / (k + rank)
+    return sorted(scores.items(), key=lambda item: item[1], reverse=True)
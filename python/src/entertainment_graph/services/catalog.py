@@ -0,0 +1,67 @@
+"""Process-wide catalog of known movies and the indexes derived from it."""
+
+from collections.abc import Callable
+from functools import lru_cache
+
+from entertainment_graph.config import get_settings
+from entertainment_graph.models import Movie, QueryFilters
+from entertainment_graph.services.data_loader import iter_batches
+from entertainment_graph.services.facets import FacetIndex
+
+
+class Catalog:
+    """
+    Every movie the process knows about, shared by all systems.
+
+    Seeded from the data directory and extended on each ingest. `version`
+    increases whenever movies are added, so derived structures can tell when
+    they need rebuilding.
+    """
+
+    def __init__(self):
+        self.movies: dict[str, Movie] = {}
+        self.facets = FacetIndex()
+        self.version = 0
+
+    def add(self, movies: list[Movie]) -> None:
+        for movie in movies:
+            self.movies[movie.id] = movie
+            self.facets.add(movie)
+        if movies:
+            self.version += 1
+
+    def matcher(self, filters: QueryFilters | None) -> Callable[[str], bool] | None:
+        """
+        Predicate telling whether a movie id satisfies `filters`, or None when
+        nothing is filtered.
+
+        The facet expression is evaluated to a bitset once per call; each
+        candidate is then one bit test plus its scalar fields, so
+        post-filtering search results never walks the catalog per movie.
+        """
+        if filters is None or filters.is_empty():
+            return None
+        facets = (
+            filters.facets if filters.facets is not None and not filters.facets.is_empty() else None
+        )
+        allowed = self.facets.evaluate(facets) if facets is not None else None
+        scalar = filters.model_copy(update={"facets": None})
+        check_scalar = not scalar.is_empty()
+
+        def matches(movie_id: str) -> bool:
+            movie = self.movies.get(movie_id)
+            if movie is None:
+                return False
+            if allowed is not None and not self.facets.contains(allowed, movie_id):
+                return False
+            return not check_scalar or scalar.matches(movie)
+
+        return matches
+
+
+@lru_cache
+def get_catalog() -> Catalog:
+    catalog = Catalog()
+    for movies in iter_batches(get_settings().ingest_batch_size):
+        catalog.add(movies)
+    return catalog
@@ -0,0 +1,110 @@
+"""Token-budgeted, compact LLM context shared by all systems."""
+
+from functools import lru_cache
+
+from entertainment_graph.config import get_settings
+from entertainment_graph.models import Movie
+
+# Per-message overhead in OpenAI's chat format, plus priming for the reply
+MESSAGE_OVERHEAD_TOKENS = 4
+REPLY_PRIMING_TOKENS = 3
+
+
+@lru_cache
+def _encoder():
+    """tiktoken encoder for the configured LLM, or None to fall back to estimates."""
+    try:
+        import tiktoken
+    except ImportError:
+        return None
+
+    # Unknown models (e.g. with local providers) use the current OpenAI encoding.
+    # Encoding files may be unavailable (e.g. offline); either failure is cached as None
+    try:
+        return tiktoken.encoding_for_model(get_settings().llm_model)
+    except KeyError:
+        pass
+    except Exception:
+        return None
+    try:
+        return tiktoken.get_encoding("o200k_base")
+    except Exception:
+        return None
+
+
+def count_tokens(text: str) -> int:
+    """Count tokens locally; approximate (~4 chars/token) without tiktoken."""
+    encoder = _encoder()
+    if encoder is None:
+        return len(text) // 4 + 1
+    return len(encoder.encode(text, disallowed_special=()))
+
+
+def count_prompt_tokens(messages: list[dict]) -> int:
+    """Tokens a chat completion request will be billed for as input."""
+    return (
+        sum(count_tokens(m["content"]) + MESSAGE_OVERHEAD_TOKENS for m in messages)
+        + REPLY_PRIMING_TOKENS
+    )
+
+
+def movie_fields(movie: Movie) -> list[str]:
+    """Movie attributes as compact fields, most useful for matching first."""
+    fields = []
+    if movie.themes:
+        # Central themes first, then secondary, then subtle
+        order = {"central": 0, "secondary": 1, "subtle": 2}
+        themes = sorted(movie.themes, key=lambda t: order[t.prominence])
+        fields.append("themes: " + ", ".join(t.name for t in themes))
+    if movie.mood:
+        fields.append("mood: " + ", ".join(movie.mood.primary + movie.mood.undertones))
+    if movie.genres:
+        fields.append("genres: " + ", ".join(movie.genres))
+    if movie.director:
+        fields.append("dir: " + ", ".join(movie.director))
+    if movie.visual_style and movie.visual_style.descriptors:
+        fields.append("visual: " + ", ".join(movie.visual_style.descriptors))
+    if movie.narrative:
+        fields.append(f"narrative: {movie.narrative.pacing}; {movie.narrative.tone}")
+    if movie.plot_summary:
+        fields.append("plot: " + movie.plot_summary)
+    return fields
+
+
+def pack_context(
+    entries: list[tuple[str, list[str]]], budget: int | None = None
+) -> tuple[str, int]:
+    """
+    Pack entries into at most `budget` tokens, one compact line per entry.
+
+    `entries` are (header, fields) pairs in relevance order, with each entry's
+    fields in priority order. Every header that fits is kept, then fields are
+    added breadth-first - every entry's first field, then every second field -
+    so the budget is spread across entries rather than spent on the top one.
+
+    Returns the packed text and its token count.
+    """
+    if budget is None:
+        budget = get_settings().llm_context_token_budget
+
+    lines: list[list[str]] = []
+    used = 0
+    for header, _ in entries:
+        cost = count_tokens(header) + 1  # +1 for the newline
+        if used + cost > budget:
+            break
+        lines.append([header])
+        used += cost
+
+    depth = max((len(fields) for _, fields in entries[: len(lines)]), default=0)
+    for field_index in range(depth):
+        for line, (_, fields) in zip(lines, entries):
+            if field_index >= len(fields):
+                continue
+            cost = count_tokens(fields[field_index]) + 1  # +1 for the separator
+            if used + cost <= budget:
+                line.append(fields[field_index])
+                used += cost
+
+    text = "\n".join(" | ".join(parts) for parts in lines)
+    return text, count_tokens(text)
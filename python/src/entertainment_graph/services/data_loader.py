@@ -1,30 +1,63 @@
-"""Load movie data from JSON files."""
+"""Load movie data from JSON and NDJSON files."""
 
 import json
+from collections.abc import Iterator
+from itertools import islice
 from pathlib import Path
 
+from entertainment_graph.config import get_settings
 from entertainment_graph.models import Movie
 
 
-def load_movies(data_dir: str = "data/movies") -> list[Movie]:
-    """Load all movies from JSON files in the data directory."""
-    movies = []
-    data_path = Path(data_dir)
+def _default_dir() -> str:
+    return str(Path(get_settings().data_dir) / "movies")
 
+
+def iter_movies(data_dir: str | None = None) -> Iterator[Movie]:
+    """
+    Stream movies from a data directory, one at a time.
+
+    The directory may hold one `<id>.json` file per movie and/or `.ndjson`
+    files with one movie per line; `data_dir` may also be a single NDJSON file.
+    Files are read in name order.
+    """
+    data_path = Path(data_dir or _default_dir())
     if not data_path.exists():
-        return movies
+        return
+    files = [data_path] if data_path.is_file() else sorted(
+        path for path in data_path.iterdir() if path.suffix in (".json", ".ndjson")
+    )
 
-    for file_path in data_path.glob("*.json"):
+    for file_path in files:
         with open(file_path) as f:
-            data = json.load(f)
-            movies.append(Movie(**data))
+            if file_path.suffix == ".ndjson":
+                for line in f:
+                    if line.strip():
+                        yield Movie.model_validate_json(line)
+            else:
+                yield Movie(**json.load(f))
+
+
+def iter_batches(size: int, data_dir: str | None = None) -> Iterator[list[Movie]]:
+    """Stream movies in lists of up to `size`, so only one batch is in memory."""
+    movies = iter_movies(data_dir)
+    while batch := list(islice(movies, max(1, size))):
+        yield batch
+
+
+def load_movies(data_dir: str | None = None) -> list[Movie]:
+    """Load all movies from the data directory (DATA_DIR/movies by default)."""
+    return list(iter_movies(data_dir))
 
-    return movies
 
+def load_movie(movie_id: str, data_dir: str | None = None) -> Movie | None:
+    """
+    Load a single movie from its `<id>.json` file.
 
-def load_movie(movie_id: str, data_dir: str = "data/movies") -> Movie | None:
-    """Load a single movie by ID."""
-    file_path = Path(data_dir) / f"{movie_id}.json"
+    Movies in NDJSON files aren't found here; look them up in the catalog
+    (`get_catalog().movies`), which holds every movie in the data directory.
+    """
+    file_path = Path(data_dir or _default_dir()) / f"{movie_id}.json"
 
     if not file_path.exists():
         return None
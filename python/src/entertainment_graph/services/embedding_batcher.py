@@ -0,0 +1,104 @@
+"""Micro-batch concurrent embedding requests into single API calls."""
+
+import asyncio
+from collections.abc import Awaitable, Callable
+
+from entertainment_graph.services import metrics, usage
+
+EmbedBatchFn = Callable[[list[str]], Awaitable[list[list[float]]]]
+
+BATCH_SIZE_BUCKETS = (1, 2, 4, 8, 16, 32, 64, 128, 256, 512, 1024, 2048)
+
+
+class EmbeddingBatcher:
+    """
+    Collect embedding requests for a short window and send them as one batch.
+
+    Callers await `embed(text)` as if it were a single call. Requests arriving
+    within `window_ms` of the first pending one (or until `max_batch_size` is
+    reached) are sent together through `embed_batch`, and each caller gets its
+    own vector back. Identical texts within a batch are embedded once, and
+    the batch's tokens are split among callers' usage by text length,
+    adding up to exactly what the API reported.
+    """
+
+    def __init__(
+        self,
+        embed_batch: EmbedBatchFn,
+        window_ms: float = 5.0,
+        max_batch_size: int = 64,
+        name: str = "embeddings",
+    ):
+        self._embed_batch = embed_batch
+        self.window = window_ms / 1000
+        self.max_batch_size = max(1, max_batch_size)
+        self._pending: list[tuple[str, asyncio.Future, dict[str, int] | None]] = []
+        self._timer: asyncio.TimerHandle | None = None
+        self._tasks: set[asyncio.Task] = set()
+        self.batch_sizes = metrics.histogram(
+            f"{name}_batch_size",
+            "Texts per batched embeddings request",
+            BATCH_SIZE_BUCKETS,
+        )
+        self.deduplicated = metrics.counter(
+            f"{name}_deduplicated_total",
+            "Texts answered by an identical text earlier in the same batch",
+        )
+
+    async def embed(self, text: str) -> list[float]:
+        """Embed one text, sharing the API call with concurrent callers."""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((text, future, usage.current()))
+
+        if len(self._pending) >= self.max_batch_size:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.window, self._flush)
+
+        return await future
+
+    async def embed_many(self, texts: list[str]) -> list[list[float]]:
+        """Embed a known list of texts directly, in chunks of `max_batch_size`."""
+        chunks = [
+            texts[i : i + self.max_batch_size]
+            for i in range(0, len(texts), self.max_batch_size)
+        ]
+        results = await asyncio.gather(*(self._embed_batch(chunk) for chunk in chunks))
+        for chunk in chunks:
+            self.batch_sizes.observe(len(chunk))
+        return [vector for chunk_vectors in results for vector in chunk_vectors]
+
+    def _flush(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._pending = self._pending, []
+        if batch:
+            task = asyncio.ensure_future(self._send(batch))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _send(self, batch: list[tuple[str, asyncio.Future, dict[str, int] | None]]) -> None:
+        texts = list(dict.fromkeys(text for text, _, _ in batch))
+        self.batch_sizes.observe(len(texts))
+        self.deduplicated.inc(len(batch) - len(texts))
+        try:
+            # Collected here rather than by whichever caller's context started the task
+            with usage.collect_usage() as spent:
+                vectors = await self._embed_batch(texts)
+        except Exception as e:
+            for _, future, _ in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        tokens = spent.get("embedding_tokens", 0)
+        total_chars = sum(len(text) for text, _, _ in batch) or 1
+        shares = [tokens * len(text) // total_chars for text, _, _ in batch]
+        shares[-1] += tokens - sum(shares)  # Rounding remainder, so shares sum to the batch
+        by_text = dict(zip(texts, vectors))
+        for (text, future, collector), share in zip(batch, shares):
+            usage.add(collector, "embedding_tokens", share)
+            if not future.done():  # Caller may have been cancelled
+                future.set_result(by_text[text])
@@ -0,0 +1,101 @@
+"""Dedicated, size-bounded thread pools for blocking work."""
+
+import asyncio
+import threading
+import time
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache, partial
+from typing import Any, TypeVar
+
+from entertainment_graph.config import get_settings
+from entertainment_graph.services import metrics
+
+T = TypeVar("T")
+
+WAIT_SECONDS_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+
+class BoundedExecutor:
+    """
+    Thread pool that keeps blocking calls off the event loop.
+
+    At most `max_workers` calls run at once and at most `max_queue` more wait
+    for a thread; further callers wait asynchronously, so a burst of slow work
+    applies backpressure instead of growing an unbounded queue. After
+    `shutdown` the next call starts a fresh pool, so the shared instance
+    survives an app lifespan ending and another starting in the same process.
+    """
+
+    def __init__(self, name: str, max_workers: int, max_queue: int):
+        self.name = name
+        self._max_workers = max(1, max_workers)
+        self._pool: ThreadPoolExecutor | None = None
+        self._capacity = self._max_workers + max(0, max_queue)
+        self._slots: asyncio.Semaphore | None = None  # Per event loop, like any asyncio primitive
+        self._slots_loop: asyncio.AbstractEventLoop | None = None
+        self._lock = threading.Lock()
+        self._queued = 0
+        self._running = 0
+
+        metrics.gauge(
+            f"{name}_queue_depth", f"Calls waiting for a {name} thread", lambda: self._queued
+        )
+        metrics.gauge(
+            f"{name}_in_flight", f"Calls running on {name} threads", lambda: self._running
+        )
+        self.wait_seconds = metrics.histogram(
+            f"{name}_queue_wait_seconds",
+            f"Time calls spend queued for a {name} thread",
+            WAIT_SECONDS_BUCKETS,
+        )
+
+    @property
+    def queue_depth(self) -> int:
+        return self._queued
+
+    @property
+    def saturated(self) -> bool:
+        """Whether every running and queue slot is taken, so new calls must wait."""
+        return self._slots is not None and self._slots.locked()
+
+    async def run(self, fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        """Run `fn(*args, **kwargs)` on the pool and await its result."""
+        if self._pool is None:
+            self._pool = ThreadPoolExecutor(
+                max_workers=self._max_workers, thread_name_prefix=self.name
+            )
+        loop = asyncio.get_running_loop()
+        if self._slots is None or self._slots_loop is not loop:
+            self._slots = asyncio.Semaphore(self._capacity)
+            self._slots_loop = loop
+
+        async with self._slots:
+            with self._lock:
+                self._queued += 1
+            loop = asyncio.get_running_loop()
+            call = partial(self._tracked, time.perf_counter(), fn, args, kwargs)
+            return await loop.run_in_executor(self._pool, call)
+
+    def _tracked(self, submitted: float, fn: Callable[..., T], args: tuple, kwargs: dict) -> T:
+        with self._lock:
+            self._queued -= 1
+            self._running += 1
+        self.wait_seconds.observe(time.perf_counter() - submitted)
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            with self._lock:
+                self._running -= 1
+
+    def shutdown(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+        self._pool = None
+
+
+@lru_cache
+def get_chroma_executor() -> BoundedExecutor:
+    """Shared pool for ChromaDB calls (HNSW search, SQLite I/O)."""
+    settings = get_settings()
+    return BoundedExecutor("chroma", settings.chroma_threads, settings.chroma_max_queue)
@@ -0,0 +1,107 @@
+"""Bitmap index over discrete movie attributes."""
+
+from collections import defaultdict
+
+from entertainment_graph.models import FacetQuery, Movie
+
+
+class FacetIndex:
+    """
+    One bitset per "facet:value" term, over the movies in the index.
+
+    Each movie gets a bit position; a term's bitset has that bit set when the
+    movie has the term. Bitsets are Python ints, so AND/OR/NOT and popcounts
+    run in C over whole machine words.
+    """
+
+    def __init__(self):
+        self._ids: list[str | None] = []  # Bit position -> movie id (None once removed)
+        self._positions: dict[str, int] = {}
+        self._terms: dict[str, set[str]] = {}  # Movie id -> its terms, for removal
+        self._bitmaps: dict[str, int] = defaultdict(int)
+        self._live = 0  # Bits of movies currently in the index
+
+    def __len__(self) -> int:
+        return len(self._positions)
+
+    def add(self, movie: Movie) -> None:
+        """Index a movie, replacing its previous terms if already present."""
+        if movie.id in self._positions:
+            self._clear_terms(movie.id)
+            position = self._positions[movie.id]
+        else:
+            position = len(self._ids)
+            self._ids.append(movie.id)
+            self._positions[movie.id] = position
+            self._live |= 1 << position
+
+        terms = movie.facet_terms()
+        self._terms[movie.id] = terms
+        for term in terms:
+            self._bitmaps[term] |= 1 << position
+
+    def remove(self, movie_id: str) -> None:
+        if movie_id not in self._positions:
+            return
+        self._clear_terms(movie_id)
+        position = self._positions.pop(movie_id)
+        self._ids[position] = None
+        self._live &= ~(1 << position)
+
+    def _clear_terms(self, movie_id: str) -> None:
+        mask = ~(1 << self._positions[movie_id])
+        for term in self._terms.pop(movie_id, ()):
+            self._bitmaps[term] &= mask
+            if not self._bitmaps[term]:
+                del self._bitmaps[term]
+
+    def contains(self, bits: int, movie_id: str) -> bool:
+        """Whether `movie_id`'s bit is set in `bits`."""
+        position = self._positions.get(movie_id)
+        return position is not None and bool(bits >> position & 1)
+
+    def bitmap(self, term: str) -> int:
+        return self._bitmaps.get(term.lower(), 0)
+
+    def evaluate(self, query: FacetQuery) -> int:
+        """Bitset of movies matching (all_of) AND (any_of) AND NOT (none_of)."""
+        bits = self._live
+        for term in query.all_of:
+            bits &= self.bitmap(term)
+        if query.any_of:
+            any_bits = 0
+            for term in query.any_of:
+                any_bits |= self.bitmap(term)
+            bits &= any_bits
+        for term in query.none_of:
+            bits &= ~self.bitmap(term)
+        return bits
+
+    def ids(self, bits: int) -> list[str]:
+        """Movie ids for the set bits."""
+        ids = []
+        while bits:
+            low = bits & -bits
+            movie_id = self._ids[low.bit_length() - 1]
+            if movie_id is not None:
+                ids.append(movie_id)
+            bits ^= low
+        return ids
+
+    def counts(
+        self, bits: int | None = None, facets: list[str] | None = None
+    ) -> dict[str, dict[str, int]]:
+        """Per-facet value counts, within `bits` (default: every movie)."""
+        within = self._live if bits is None else bits
+        counts: dict[str, dict[str, int]] = defaultdict(dict)
+        for term, bitmap in self._bitmaps.items():
+            facet, value = term.split(":", 1)
+            if facets and facet not in facets:
+                continue
+            count = (bitmap & within).bit_count()
+            if count:
+                counts[facet][value] = count
+        return {
+            facet: dict(sorted(values.items(), key=lambda item: item[1], reverse=True))
+            for facet, values in counts.items()
+        }
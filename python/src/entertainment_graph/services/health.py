@@ -0,0 +1,91 @@
+"""Periodic deep health checks, cached for the health endpoints."""
+
+import asyncio
+import logging
+import time
+from functools import lru_cache
+
+from pydantic import BaseModel
+
+from entertainment_graph.config import get_settings
+from entertainment_graph.systems import AgenticSystem
+
+logger = logging.getLogger(__name__)
+
+
+class CheckResult(BaseModel):
+    healthy: bool
+    checked_at: float  # Unix time the check finished
+    latency_ms: float
+    error: str | None = None
+
+
+class HealthMonitor:
+    """
+    Run every system's `health_check` in the background and keep the results.
+
+    Deep checks call OpenAI, Neo4j and the memory store, so they run every
+    `interval` seconds (all systems concurrently, each bounded by `timeout`)
+    rather than once per probe; the endpoints only read `results`.
+    """
+
+    def __init__(self, interval: float, timeout: float):
+        self.interval = interval
+        self.timeout = timeout
+        self.results: dict[str, CheckResult] = {}
+        self._task: asyncio.Task | None = None
+        self._refreshing: asyncio.Task | None = None
+
+    async def _check(self, name: str, system: AgenticSystem) -> None:
+        start = time.perf_counter()
+        error = None
+        try:
+            healthy = await asyncio.wait_for(system.health_check(), self.timeout)
+        except asyncio.TimeoutError:
+            healthy, error = False, f"timed out after {self.timeout:g}s"
+        except Exception as e:
+            healthy, error = False, f"{type(e).__name__}: {e}"
+        self.results[name] = CheckResult(
+            healthy=bool(healthy),
+            checked_at=time.time(),
+            latency_ms=round((time.perf_counter() - start) * 1000, 2),
+            error=error,
+        )
+
+    async def refresh(self, systems: dict[str, AgenticSystem]) -> dict[str, CheckResult]:
+        """Check all systems now; concurrent callers share one round of checks."""
+        if self._refreshing is None or self._refreshing.done():
+            self._refreshing = asyncio.ensure_future(
+                asyncio.gather(*(self._check(name, system) for name, system in systems.items()))
+            )
+        await asyncio.shield(self._refreshing)
+        return self.results
+
+    def start(self, systems: dict[str, AgenticSystem]) -> None:
+        """Start checking in the background every `interval` seconds."""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run(systems))
+
+    async def stop(self) -> None:
+        for task in (self._task, self._refreshing):
+            if task is not None and not task.done():
+                task.cancel()
+                try:
+                    await task
+                except asyncio.CancelledError:
+                    pass
+        self._task = self._refreshing = None
+
+    async def _run(self, systems: dict[str, AgenticSystem]) -> None:
+        while True:
+            try:
+                await self.refresh(systems)
+            except Exception:
+                logger.exception("Health checks failed")
+            await asyncio.sleep(self.interval)
+
+
+@lru_cache
+def get_health_monitor() -> HealthMonitor:
+    settings = get_settings()
+    return HealthMonitor(settings.health_check_interval_s, settings.health_check_timeout_s)
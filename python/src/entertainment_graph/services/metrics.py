@@ -0,0 +1,168 @@
+"""In-process metrics registry."""
+
+from bisect import bisect_left
+from collections.abc import Callable
+
+Labels = dict[str, str]
+
+
+class Histogram:
+    """Fixed-bucket histogram with cumulative counts, Prometheus style."""
+
+    kind = "histogram"
+
+    def __init__(
+        self, name: str, description: str, buckets: tuple[float, ...], labels: Labels | None = None
+    ):
+        self.name = name
+        self.description = description
+        self.labels = labels or {}
+        self.buckets = tuple(sorted(buckets))
+        self._counts = [0] * (len(self.buckets) + 1)  # Last slot is +Inf
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        self._counts[bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def snapshot(self) -> dict:
+        cumulative = {}
+        running = 0
+        for bound, count in zip(self.buckets, self._counts):
+            running += count
+            cumulative[str(bound)] = running
+        cumulative["+Inf"] = self.count
+        return {
+            "description": self.description,
+            "buckets": cumulative,
+            "count": self.count,
+            "sum": self.sum,
+        }
+
+    def samples(self) -> list[tuple[str, Labels, float]]:
+        buckets = self.snapshot()["buckets"]
+        return [
+            *(
+                (f"{self.name}_bucket", self.labels | {"le": bound}, count)
+                for bound, count in buckets.items()
+            ),
+            (f"{self.name}_sum", self.labels, self.sum),
+            (f"{self.name}_count", self.labels, self.count),
+        ]
+
+
+class Counter:
+    """Monotonically increasing count."""
+
+    kind = "counter"
+
+    def __init__(self, name: str, description: str, labels: Labels | None = None):
+        self.name = name
+        self.description = description
+        self.labels = labels or {}
+        self.value = 0.0
+
+    def inc(self, amount: float = 1.0) -> None:
+        self.value += amount
+
+    def snapshot(self) -> dict:
+        return {"description": self.description, "value": self.value}
+
+    def samples(self) -> list[tuple[str, Labels, float]]:
+        return [(self.name, self.labels, self.value)]
+
+
+class Gauge:
+    """Point-in-time value read from its owner when metrics are collected."""
+
+    kind = "gauge"
+
+    def __init__(
+        self, name: str, description: str, read: Callable[[], float], labels: Labels | None = None
+    ):
+        self.name = name
+        self.description = description
+        self.labels = labels or {}
+        self.read = read
+
+    def snapshot(self) -> dict:
+        return {"description": self.description, "value": self.read()}
+
+    def samples(self) -> list[tuple[str, Labels, float]]:
+        return [(self.name, self.labels, self.read())]
+
+
+Metric = Histogram | Counter | Gauge
+
+# Keyed by name plus rendered labels, e.g. 'stage_seconds{stage="llm",system="pure_vector"}'
+_registry: dict[str, Metric] = {}
+
+
+def _key(name: str, labels: Labels | None) -> str:
+    return name + _render_labels(labels) if labels else name
+
+
+def _render_labels(labels: Labels) -> str:
+    if not labels:
+        return ""
+    escaped = (
+        (key, str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n"))
+        for key, value in sorted(labels.items())
+    )
+    return "{" + ",".join(f'{key}="{value}"' for key, value in escaped) + "}"
+
+
+def histogram(
+    name: str, description: str, buckets: tuple[float, ...], labels: Labels | None = None
+) -> Histogram:
+    """Get or create a registered histogram (one per distinct label set)."""
+    key = _key(name, labels)
+    if key not in _registry:
+        _registry[key] = Histogram(name, description, buckets, labels)
+    return _registry[key]
+
+
+def counter(name: str, description: str, labels: Labels | None = None) -> Counter:
+    """Get or create a registered counter (one per distinct label set)."""
+    key = _key(name, labels)
+    if key not in _registry:
+        _registry[key] = Counter(name, description, labels)
+    return _registry[key]
+
+
+def gauge(
+    name: str, description: str, read: Callable[[], float], labels: Labels | None = None
+) -> Gauge:
+    """Register a gauge, replacing any previous reader under the same name and labels."""
+    key = _key(name, labels)
+    _registry[key] = Gauge(name, description, read, labels)
+    return _registry[key]
+
+
+def cache_lookup(cache: str, hit: bool) -> None:
+    """Count a lookup in `cache`; hit rate is cache_hits_total / cache_lookups_total."""
+    counter("cache_lookups_total", "Lookups per cache", {"cache": cache}).inc()
+    counter("cache_hits_total", "Hits per cache", {"cache": cache}).inc(1.0 if hit else 0.0)
+
+
+def snapshot() -> dict[str, dict]:
+    """Current state of every registered metric."""
+    return {key: metric.snapshot() for key, metric in _registry.items()}
+
+
+def render_prometheus() -> str:
+    """Every registered metric in the Prometheus text exposition format."""
+    families: dict[str, list[Metric]] = {}
+    for metric in _registry.values():
+        families.setdefault(metric.name, []).append(metric)
+
+    lines = []
+    for name, metrics in sorted(families.items()):
+        lines.append(f"# HELP {name} {metrics[0].description}")
+        lines.append(f"# TYPE {name} {metrics[0].kind}")
+        for metric in metrics:
+            for sample, labels, value in metric.samples():
+                lines.append(f"{sample}{_render_labels(labels)} {float(value)!r}")
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,214 @@
+"""Embedding and chat clients, chosen per call type via settings.
+
+"openai" is the real API. "local" swaps in deterministic, offline stand-ins
+with the same call shape, so systems, load tests and benchmarks run without
+network access or spend and give the same results on every run.
+"""
+
+import hashlib
+import json
+import re
+import time
+from functools import lru_cache
+from typing import Literal
+
+import numpy as np
+from openai import AsyncOpenAI, OpenAI
+from openai.types import CompletionUsage, CreateEmbeddingResponse, Embedding
+from openai.types.chat import ChatCompletion, ChatCompletionMessage
+from openai.types.chat.chat_completion import Choice
+from openai.types.create_embedding_response import Usage
+
+from entertainment_graph.config import get_settings
+from entertainment_graph.services.rate_limiter import (
+    RateLimitedClient,
+    estimate_tokens,
+    get_rate_limiter,
+)
+from entertainment_graph.services.vector_index import normalize
+
+PROVIDERS = ("openai", "local")
+
+# Local embedding size when EMBEDDING_DIMENSIONS is unset (text-embedding-3-small's)
+LOCAL_EMBEDDING_DIMENSIONS = 1536
+
+_WORD = re.compile(r"\w+")
+# Retrieved movies appear in every system's prompt as "id: <movie id> | ..."
+_CONTEXT_ID = re.compile(r"\bid: ([^\s|]+)")
+
+
+def local_dimensions() -> int:
+    return get_settings().embedding_dimensions or LOCAL_EMBEDDING_DIMENSIONS
+
+
+def hashed_embedding(text: str, dim: int) -> np.ndarray:
+    """
+    Unit vector of hashed n-gram features (words, word bigrams, character trigrams).
+
+    Each feature is hashed to a bucket and a sign, a sparse random projection
+    of the n-gram counts, so texts sharing words and word fragments land close
+    together. blake2b keeps it stable across processes.
+    """
+    words = _WORD.findall(text.lower())
+    features = [(word, 1.0) for word in words]
+    features += [(f"{a} {b}", 1.0) for a, b in zip(words, words[1:])]
+    for word in words:
+        padded = f"#{word}#"
+        features += [(padded[i : i + 3], 0.5) for i in range(len(padded) - 2)]
+    if not features:
+        return np.zeros(dim, dtype=np.float32)
+
+    digests = b"".join(
+        hashlib.blake2b(feature.encode(), digest_size=8).digest() for feature, _ in features
+    )
+    hashes = np.frombuffer(digests, dtype=np.uint64)
+    signs = np.where(hashes >> np.uint64(63), -1.0, 1.0)
+    weights = np.array([weight for _, weight in features]) * signs
+    vector = np.bincount((hashes % np.uint64(dim)).astype(np.int64), weights=weights, minlength=dim)
+    return normalize(vector.astype(np.float32))
+
+
+class _LocalResource:
+    """`create` plus a `with_raw_response` view, like the SDK's resources.
+
+    Responses carry no rate-limit headers, so the raw view returns them parsed.
+    Calls are synchronous and run on the limiter's worker threads, as the real
+    client's do.
+    """
+
+    @property
+    def with_raw_response(self):
+        return self
+
+
+class LocalEmbeddings(_LocalResource):
+    """Hashed n-gram embeddings (see `hashed_embedding`)."""
+
+    def __init__(self, latency_ms: float = 0.0):
+        self.latency_ms = latency_ms
+
+    def create(
+        self, *, model: str, input: str | list[str], dimensions: int | None = None, **_
+    ) -> CreateEmbeddingResponse:
+        texts = [input] if isinstance(input, str) else list(input)
+        dim = dimensions or local_dimensions()
+        if self.latency_ms:
+            time.sleep(self.latency_ms / 1000)
+        tokens = estimate_tokens(*texts)
+        return CreateEmbeddingResponse(
+            data=[
+                Embedding(
+                    embedding=hashed_embedding(text, dim).tolist(), index=i, object="embedding"
+                )
+                for i, text in enumerate(texts)
+            ],
+            model=model,
+            object="list",
+            usage=Usage(prompt_tokens=tokens, total_tokens=tokens),
+        )
+
+
+class LocalChatCompletions(_LocalResource):
+    """
+    Canned chat completions after a fixed delay.
+
+    The reply is the JSON object every system's prompt asks for: a reasoning
+    string and one result per "id: ..." entry in the last user message.
+    """
+
+    def __init__(self, latency_ms: float = 0.0):
+        self.latency_ms = latency_ms
+
+    def create(self, *, model: str, messages: list[dict], **_) -> ChatCompletion:
+        prompt = next((m["content"] for m in reversed(messages) if m["role"] == "user"), "")
+        ids = list(dict.fromkeys(_CONTEXT_ID.findall(prompt)))
+        results = [{"id": movie_id, "explanation": "Retrieved for this query."} for movie_id in ids]
+        content = json.dumps({
+            "reasoning": f"Local stand-in reply for {len(ids)} retrieved movies.",
+            "results": results,
+        })
+        if self.latency_ms:
+            time.sleep(self.latency_ms / 1000)
+
+        prompt_tokens = estimate_tokens(*(m["content"] for m in messages))
+        completion_tokens = estimate_tokens(content)
+        return ChatCompletion(
+            id="local-" + hashlib.blake2b(prompt.encode(), digest_size=8).hexdigest(),
+            choices=[
+                Choice(
+                    finish_reason="stop",
+                    index=0,
+                    message=ChatCompletionMessage(role="assistant", content=content),
+                )
+            ],
+            created=int(time.time()),
+            model=model,
+            object="chat.completion",
+            usage=CompletionUsage(
+                prompt_tokens=prompt_tokens,
+                completion_tokens=completion_tokens,
+                total_tokens=prompt_tokens + completion_tokens,
+            ),
+        )
+
+
+class _LocalChat:
+    def __init__(self, completions: LocalChatCompletions):
+        self.completions = completions
+
+
+class LocalClient:
+    """Offline stand-in for the parts of `OpenAI` the systems use."""
+
+    def __init__(self, chat_latency_ms: float = 0.0, embedding_latency_ms: float = 0.0):
+        self.embeddings = LocalEmbeddings(embedding_latency_ms)
+        self.chat = _LocalChat(LocalChatCompletions(chat_latency_ms))
+
+
+def _check(provider: str) -> None:
+    if provider not in PROVIDERS:
+        raise ValueError(f"Unknown provider '{provider}'. Available: {', '.join(PROVIDERS)}")
+
+
+@lru_cache
+def _openai_client() -> OpenAI:
+    # Retries are handled by the shared rate limiters, not the client
+    return OpenAI(api_key=get_settings().openai_api_key, max_retries=0)
+
+
+@lru_cache
+def _async_openai_client() -> AsyncOpenAI:
+    return AsyncOpenAI(api_key=get_settings().openai_api_key, max_retries=0)
+
+
+@lru_cache
+def _local_client() -> LocalClient:
+    settings = get_settings()
+    return LocalClient(
+        chat_latency_ms=settings.local_chat_latency_ms,
+        embedding_latency_ms=settings.local_embedding_latency_ms,
+    )
+
+
+def get_chat_client() -> OpenAI | LocalClient:
+    """Client for chat completions (LLM_PROVIDER)."""
+    provider = get_settings().llm_provider
+    _check(provider)
+    return _local_client() if provider == "local" else _openai_client()
+
+
+def get_embedding_client() -> OpenAI | LocalClient:
+    """Client for embeddings (EMBEDDING_PROVIDER)."""
+    provider = get_settings().embedding_provider
+    _check(provider)
+    return _local_client() if provider == "local" else _openai_client()
+
+
+def get_library_client(kind: Literal["chat", "embeddings"]) -> RateLimitedClient:
+    """
+    Async OpenAI client for libraries that make their own API calls (Graphiti).
+
+    Each request goes through the shared `kind` rate limiter, which retries it
+    individually and records its usage like the systems' own calls.
+    """
+    return RateLimitedClient(_async_openai_client(), get_rate_limiter(kind))
@@ -0,0 +1,330 @@
+"""Client-side rate limiting and retry for outbound OpenAI calls."""
+
+import asyncio
+import inspect
+import logging
+import random
+import re
+import time
+from collections.abc import Callable
+from functools import lru_cache
+from typing import Any, Literal
+
+import openai
+
+from entertainment_graph.config import get_settings
+from entertainment_graph.services import metrics
+from entertainment_graph.services import usage as usage_accounting
+
+logger = logging.getLogger(__name__)
+
+# Allowance for completion tokens when estimating a chat call's cost up front
+COMPLETION_TOKEN_ALLOWANCE = 512
+
+# Per-minute budget used for local providers, high enough to never wait
+LOCAL_QUOTA = 1_000_000_000
+
+CALL_BUCKETS = (0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+def estimate_tokens(*texts: str) -> int:
+    """Rough token estimate (~4 characters per token) for budgeting."""
+    return sum(len(text) for text in texts) // 4 + 1
+
+
+def _parse_duration(value: str | None) -> float | None:
+    """Parse OpenAI reset headers like '1s', '6m0s', '20ms' into seconds."""
+    if not value:
+        return None
+    units = {"ms": 0.001, "s": 1.0, "m": 60.0, "h": 3600.0}
+    parts = re.findall(r"([\d.]+)(ms|s|m|h)", value)
+    if not parts:
+        try:
+            return float(value)
+        except ValueError:
+            return None
+    return sum(float(amount) * units[unit] for amount, unit in parts)
+
+
+class TokenBucket:
+    """Continuously refilling budget of `per_minute` units."""
+
+    def __init__(self, per_minute: float):
+        self.capacity = max(1.0, per_minute)
+        self.rate = self.capacity / 60.0
+        self.tokens = self.capacity
+        self._last = time.monotonic()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self._last) * self.rate)
+        self._last = now
+
+    def wait_time(self, amount: float) -> float:
+        """Seconds until `amount` units are available (0 if available now)."""
+        self._refill()
+        amount = min(amount, self.capacity)  # Oversized requests wait for a full bucket
+        if self.tokens >= amount:
+            return 0.0
+        return (amount - self.tokens) / self.rate
+
+    def consume(self, amount: float) -> None:
+        self._refill()
+        self.tokens -= amount
+
+    def sync(self, remaining: float) -> None:
+        """Clamp the local budget to what the server reports as remaining."""
+        self._refill()
+        self.tokens = min(self.tokens, remaining)
+
+
+class RateLimiter:
+    """
+    Shared limiter for one class of OpenAI calls (chat or embeddings).
+
+    - Token buckets keep requests/minute and tokens/minute under the quota.
+    - Concurrency adapts: it halves on 429s or when response headers report
+      little headroom left, and grows by one per healthy response.
+    - 429, 5xx and connection errors are retried with jittered exponential
+      backoff, honouring Retry-After when the server sends one.
+    """
+
+    def __init__(
+        self,
+        requests_per_minute: float,
+        tokens_per_minute: float,
+        max_concurrency: int = 16,
+        max_retries: int = 6,
+        base_delay: float = 0.5,
+        max_delay: float = 30.0,
+        name: str = "openai",
+    ):
+        self.name = name
+        self.requests = TokenBucket(requests_per_minute)
+        self.tokens = TokenBucket(tokens_per_minute)
+        self.max_concurrency = max(1, max_concurrency)
+        self.concurrency = self.max_concurrency
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self._in_flight = 0
+        self._slot_freed = asyncio.Condition()
+        self._loop: asyncio.AbstractEventLoop | None = None
+
+    async def call(
+        self,
+        fn: Callable[..., Any],
+        *args,
+        estimated_tokens: int = 0,
+        **kwargs,
+    ) -> Any:
+        """
+        Call `fn(*args, **kwargs)` within the rate budget, retrying transient failures.
+
+        Sync callables run in a worker thread so they don't block the event loop.
+        Raw responses (from `.with_raw_response`) feed their rate-limit headers
+        back into the limiter and are returned parsed. `fn` must be safe to
+        repeat: a write made of several API requests should be retried per
+        request (see `RateLimitedClient`) or be idempotent.
+        """
+        for attempt in range(self.max_retries + 1):
+            await self._acquire_budget(estimated_tokens)
+            await self._acquire_slot()
+            start = time.perf_counter()
+            try:
+                if inspect.iscoroutinefunction(fn):
+                    result = await fn(*args, **kwargs)
+                else:
+                    result = await asyncio.to_thread(fn, *args, **kwargs)
+                error = None
+            except Exception as e:
+                error = e
+            finally:
+                await self._release_slot()
+            metrics.histogram(
+                "outbound_call_seconds",
+                "Duration of outbound API attempts",
+                CALL_BUCKETS,
+                {"kind": self.name},
+            ).observe(time.perf_counter() - start)
+
+            if error is None:
+                self._count_call("ok")
+                return self._on_success(result, estimated_tokens)
+
+            delay = self._retry_delay(error, attempt)
+            if delay is None:
+                self._count_call("failed")
+                raise error
+            self._count_call("retried")
+            logger.warning(
+                "OpenAI call failed (%s), retry %d/%d in %.2fs",
+                type(error).__name__, attempt + 1, self.max_retries, delay,
+            )
+            await asyncio.sleep(delay)
+
+        raise AssertionError("unreachable")  # Loop always returns or raises
+
+    async def _acquire_budget(self, estimated_tokens: int) -> None:
+        while True:
+            delay = max(self.requests.wait_time(1), self.tokens.wait_time(estimated_tokens))
+            if delay <= 0:
+                self.requests.consume(1)
+                self.tokens.consume(estimated_tokens)
+                return
+            await asyncio.sleep(delay)
+
+    def _bind_loop(self) -> None:
+        # The limiter is process-wide but asyncio primitives belong to one loop;
+        # a new loop (e.g. a second asyncio.run) starts with fresh slot state
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._loop = loop
+            self._slot_freed = asyncio.Condition()
+            self._in_flight = 0
+
+    async def _acquire_slot(self) -> None:
+        self._bind_loop()
+        async with self._slot_freed:
+            await self._slot_freed.wait_for(lambda: self._in_flight < self.concurrency)
+            self._in_flight += 1
+
+    async def _release_slot(self) -> None:
+        async with self._slot_freed:
+            self._in_flight -= 1
+            self._slot_freed.notify_all()
+
+    def _on_success(self, result: Any, estimated_tokens: int) -> Any:
+        headers = getattr(result, "headers", None)
+        if headers is not None and hasattr(result, "parse"):
+            self._apply_headers(headers)
+            result = result.parse()
+        elif self.concurrency < self.max_concurrency:
+            self.concurrency += 1
+
+        # Reconcile the token estimate with actual usage when reported
+        usage = getattr(result, "usage", None)
+        total_tokens = getattr(usage, "total_tokens", None)
+        if isinstance(total_tokens, int):
+            self.tokens.consume(total_tokens - estimated_tokens)
+        # The Responses API reports input/output rather than prompt/completion tokens
+        aliases = (("prompt_tokens", "input_tokens"), ("completion_tokens", "output_tokens"))
+        for kind, alias in aliases:
+            count = getattr(usage, kind, None) or getattr(usage, alias, None)
+            if isinstance(count, int):
+                metrics.counter(
+                    "openai_tokens_total",
+                    "Tokens reported by API usage",
+                    {"kind": self.name, "type": kind},
+                ).inc(count)
+        usage_accounting.record(self.name, usage)
+        return result
+
+    def _count_call(self, outcome: str) -> None:
+        metrics.counter(
+            "outbound_calls_total",
+            "Outbound API attempts by outcome",
+            {"kind": self.name, "outcome": outcome},
+        ).inc()
+
+    def _apply_headers(self, headers) -> None:
+        headroom = 1.0
+        remaining_requests = headers.get("x-ratelimit-remaining-requests")
+        if remaining_requests is not None:
+            self.requests.sync(float(remaining_requests))
+            headroom = min(headroom, float(remaining_requests) / self.requests.capacity)
+        remaining_tokens = headers.get("x-ratelimit-remaining-tokens")
+        if remaining_tokens is not None:
+            self.tokens.sync(float(remaining_tokens))
+            headroom = min(headroom, float(remaining_tokens) / self.tokens.capacity)
+
+        if headroom < 0.1:
+            self.concurrency = max(1, self.concurrency // 2)
+        elif self.concurrency < self.max_concurrency:
+            self.concurrency += 1
+
+    def _retry_delay(self, exc: Exception, attempt: int) -> float | None:
+        """Backoff before the next attempt, or None if `exc` shouldn't be retried."""
+        if attempt >= self.max_retries:
+            return None
+
+        if isinstance(exc, openai.APIStatusError):
+            if exc.status_code != 429 and exc.status_code < 500:
+                return None
+        elif not isinstance(exc, openai.APIConnectionError):
+            # Libraries like graphiti_core wrap OpenAI's 429 in their own type
+            if type(exc).__name__ != "RateLimitError":
+                return None
+
+        is_rate_limit = (
+            isinstance(exc, openai.RateLimitError) or type(exc).__name__ == "RateLimitError"
+        )
+        if is_rate_limit:
+            self.concurrency = max(1, self.concurrency // 2)
+
+        delay = random.uniform(0, min(self.max_delay, self.base_delay * 2**attempt))
+        response = getattr(exc, "response", None)
+        if response is not None:
+            retry_after = _parse_duration(response.headers.get("retry-after"))
+            reset = _parse_duration(response.headers.get("x-ratelimit-reset-requests"))
+            delay = max(delay, retry_after or 0.0, reset if is_rate_limit and reset else 0.0)
+        return min(delay, self.max_delay)
+
+
+class RateLimitedClient:
+    """
+    Proxy for an async OpenAI client whose API calls go through a `RateLimiter`.
+
+    Every `create`/`parse` reached through it (e.g. `client.chat.completions.create`)
+    is budgeted and retried per request, so libraries holding the client, like
+    Graphiti, never retry a whole multi-call operation. Give it a client built
+    with `max_retries=0`.
+    """
+
+    _CALLS = ("create", "parse")
+
+    def __init__(self, target: Any, limiter: "RateLimiter"):
+        self._target = target
+        self._limiter = limiter
+
+    def __getattr__(self, name: str) -> Any:
+        attr = getattr(self._target, name)
+        if name in self._CALLS and callable(attr):
+            return self._limited(attr)
+        if callable(attr) or isinstance(attr, (str, int, float, bool, type(None))):
+            return attr
+        return RateLimitedClient(attr, self._limiter)
+
+    def _limited(self, fn: Callable[..., Any]) -> Callable[..., Any]:
+        async def call(*args, **kwargs):
+            return await fn(*args, **kwargs)
+
+        async def limited(*args, **kwargs):
+            payload = kwargs.get("messages", kwargs.get("input", ""))
+            estimated = estimate_tokens(payload if isinstance(payload, str) else repr(payload))
+            if self._limiter.name == "chat":
+                estimated += COMPLETION_TOKEN_ALLOWANCE
+            return await self._limiter.call(call, *args, estimated_tokens=estimated, **kwargs)
+
+        return limited
+
+
+@lru_cache
+def get_rate_limiter(kind: Literal["chat", "embeddings"]) -> RateLimiter:
+    """Process-wide limiter shared by every system for this kind of call."""
+    settings = get_settings()
+    if kind == "chat":
+        rpm, tpm = settings.openai_chat_rpm, settings.openai_chat_tpm
+    else:
+        rpm, tpm = settings.openai_embedding_rpm, settings.openai_embedding_tpm
+    provider = settings.llm_provider if kind == "chat" else settings.embedding_provider
+    if provider == "local":
+        # Local stand-ins have no quota; concurrency limits still apply
+        rpm = tpm = LOCAL_QUOTA
+    return RateLimiter(
+        requests_per_minute=rpm,
+        tokens_per_minute=tpm,
+        max_concurrency=settings.openai_max_concurrency,
+        max_retries=settings.openai_max_retries,
+        name=kind,
+    )
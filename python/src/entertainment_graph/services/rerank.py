@@ -0,0 +1,154 @@
+"""Post-retrieval reranking shared by every system."""
+
+import logging
+from abc import ABC, abstractmethod
+from collections.abc import Awaitable, Callable
+from functools import lru_cache
+
+import numpy as np
+
+from entertainment_graph.config import get_settings
+from entertainment_graph.services.catalog import get_catalog
+from entertainment_graph.services.providers import get_embedding_client
+from entertainment_graph.services.rate_limiter import estimate_tokens, get_rate_limiter
+from entertainment_graph.services.vector_index import VectorIndex, get_movie_vectors
+
+logger = logging.getLogger(__name__)
+
+
+class Reranker(ABC):
+    """Reorders a system's candidates before the top `limit` are explained."""
+
+    # Systems retrieve `limit * over_fetch` candidates so the reranker has room to choose
+    over_fetch: int = 1
+
+    @abstractmethod
+    async def rerank(self, ids: list[str], relevance: np.ndarray, limit: int) -> list[int]:
+        """Indices into `ids` of the chosen candidates, best first."""
+
+
+class MMRReranker(Reranker):
+    """
+    Maximal marginal relevance over stored movie embeddings.
+
+    Picks, one at a time, the candidate maximizing
+
+        lambda * relevance - (1 - lambda) * max cosine to anything already picked
+
+    so near-duplicates (sequels, same director) give way to the next most
+    relevant distinct movie. Pairwise similarities are one matmul; each pick is
+    an argmax plus an elementwise max over the candidates.
+
+    `vectors` holds what Pure Vector has stored; candidates missing from it
+    (e.g. when only Graphiti or OpenMemory ingested them) have their catalog
+    text embedded with `embed` on first sight and are cached here. Any still
+    without a vector count as unlike everything, and are logged.
+    """
+
+    def __init__(
+        self,
+        vectors: VectorIndex,
+        lambda_: float = 0.7,
+        over_fetch: int = 3,
+        embed: Callable[[list[str]], Awaitable[list[list[float]]]] | None = None,
+    ):
+        self.vectors = vectors
+        self.lambda_ = lambda_
+        self.over_fetch = max(1, over_fetch)
+        self.embed = embed
+        self._fetched = VectorIndex(dtype=vectors.dtype)
+
+    async def rerank(self, ids: list[str], relevance: np.ndarray, limit: int) -> list[int]:
+        n = len(ids)
+        if n == 0:
+            return []
+
+        embeddings = await self._embeddings(ids)
+        similarity = embeddings @ embeddings.T
+
+        relevance = _scale(np.asarray(relevance, dtype=np.float32))
+        closest = np.zeros(n, dtype=np.float32)  # Max similarity to the picks so far
+        available = np.ones(n, dtype=bool)
+        picks = []
+        for _ in range(min(limit, n)):
+            score = self.lambda_ * relevance - (1 - self.lambda_) * closest
+            score[~available] = -np.inf
+            pick = int(np.argmax(score))
+            picks.append(pick)
+            available[pick] = False
+            np.maximum(closest, similarity[pick], out=closest)
+        return picks
+
+    async def _embeddings(self, ids: list[str]) -> np.ndarray:
+        """(len(ids), dim) vectors, zero rows for candidates with no embedding."""
+        if self.embed is not None:
+            movies = get_catalog().movies
+            stored = (self.vectors, self._fetched)
+            texts = {
+                movie_id: movies[movie_id].to_text()
+                for movie_id in dict.fromkeys(ids)
+                if movie_id in movies and not any(movie_id in index for index in stored)
+            }
+            if texts:
+                self._fetched.add(list(texts), await self.embed(list(texts.values())))
+
+        dim = self.vectors.dim or self._fetched.dim or 1
+        embeddings = np.zeros((len(ids), dim), dtype=np.float32)
+        found = np.zeros(len(ids), dtype=bool)
+        for source in (self._fetched, self.vectors):
+            rows = [i for i, movie_id in enumerate(ids) if movie_id in source]
+            if rows and source.dim == embeddings.shape[1]:
+                embeddings[rows] = source.get([ids[i] for i in rows])
+                found[rows] = True
+        unknown = int((~found).sum())
+        if unknown:
+            logger.warning(
+                f"MMR reranking without embeddings for {unknown} of {len(ids)} candidates; "
+                "they count as unlike everything"
+            )
+        return embeddings
+
+
+async def _embed_texts(texts: list[str]) -> list[list[float]]:
+    """Embed `texts` with the configured model, as Pure Vector stores movies."""
+    settings = get_settings()
+    dimensions = settings.embedding_dimensions
+    response = await get_rate_limiter("embeddings").call(
+        get_embedding_client().embeddings.with_raw_response.create,
+        model=settings.embedding_model,
+        input=texts,
+        estimated_tokens=estimate_tokens(*texts),
+        **({"dimensions": dimensions} if dimensions else {}),
+    )
+    return [item.embedding for item in sorted(response.data, key=lambda d: d.index)]
+
+
+def _scale(relevance: np.ndarray) -> np.ndarray:
+    """Min-max scale to [0, 1]; ties (e.g. systems without scores) fall back to rank order."""
+    spread = relevance.max() - relevance.min()
+    if spread > 1e-9:
+        return (relevance - relevance.min()) / spread
+    if len(relevance) > 1:
+        return np.linspace(1, 0, len(relevance), dtype=np.float32)
+    return np.ones(1, np.float32)
+
+
+RERANKERS = {"mmr": MMRReranker}
+
+
+@lru_cache
+def get_reranker() -> Reranker | None:
+    """The configured reranker, or None when reranking is off."""
+    settings = get_settings()
+    if settings.reranker == "none":
+        return None
+    if settings.reranker not in RERANKERS:
+        raise ValueError(
+            f"Unknown reranker '{settings.reranker}'. Available: none, {', '.join(RERANKERS)}"
+        )
+    return RERANKERS[settings.reranker](
+        get_movie_vectors(),
+        lambda_=settings.mmr_lambda,
+        over_fetch=settings.rerank_over_fetch,
+        embed=_embed_texts,
+    )
@@ -0,0 +1,251 @@
+"""Chroma collection partitioned across N shards, searched scatter-gather."""
+
+import asyncio
+import heapq
+import logging
+import zlib
+
+from entertainment_graph.services.executor import BoundedExecutor
+
+logger = logging.getLogger(__name__)
+
+# Records copied per upsert when a shard is rebuilt
+_REBUILD_BATCH = 1000
+
+
+def hnsw_metadata(m: int, construction_ef: int, search_ef: int) -> dict:
+    """Chroma collection metadata for a cosine HNSW index."""
+    return {
+        "hnsw:space": "cosine",
+        "hnsw:M": m,
+        "hnsw:construction_ef": construction_ef,
+        "hnsw:search_ef": search_ef,
+    }
+
+
+class ShardedCollection:
+    """
+    Records hashed by id across `shards` Chroma collections.
+
+    With one shard the collection keeps its plain `name`, so existing data
+    stays readable; with more, shard i is "{name}_{i}". Searches fan out to
+    every shard on the Chroma pool and merge the per-shard top-k with a heap.
+    Changing the shard count needs a re-ingest.
+
+    Reads never wait on writes. Writes to a shard wait while that shard is
+    being rebuilt, so a rebuild can't miss them.
+    """
+
+    def __init__(
+        self, client, name: str, shards: int, pool: BoundedExecutor, metadata: dict | None = None
+    ):
+        self.client = client
+        self.name = name
+        self.pool = pool
+        self.metadata = metadata or {"hnsw:space": "cosine"}
+        shards = max(1, shards)
+        self.names = [name] if shards == 1 else [f"{name}_{i}" for i in range(shards)]
+        existing = {getattr(c, "name", c) for c in client.list_collections()}
+        for shard_name in self.names:
+            self._recover(shard_name, existing)
+        self._collections = [
+            client.get_or_create_collection(name=shard_name, metadata=self.metadata)
+            for shard_name in self.names
+        ]
+        self._locks = [asyncio.Lock() for _ in self.names]
+        for collection in self._collections:
+            self._apply_index_params(collection)
+
+    def _apply_index_params(self, collection) -> None:
+        """
+        Bring an existing collection in line with `metadata` where Chroma allows.
+
+        search_ef can change in place; M and construction_ef are fixed when the
+        index is built, so a mismatch is only reported (rebuild the shard to apply).
+        """
+        current = collection.metadata or {}
+        configured = (getattr(collection, "configuration", None) or {}).get("hnsw") or {}
+        search_ef = self.metadata.get("hnsw:search_ef")
+        applied = configured.get("ef_search", current.get("hnsw:search_ef"))
+        if search_ef is not None and applied != search_ef:
+            try:
+                collection.modify(configuration={"hnsw": {"ef_search": search_ef}})
+            except Exception as e:
+                logger.warning(f"Could not set search_ef on '{collection.name}': {e}")
+        for key in ("hnsw:M", "hnsw:construction_ef"):
+            if key in self.metadata and key in current and current[key] != self.metadata[key]:
+                logger.warning(
+                    f"Collection '{collection.name}' was built with {key}={current[key]}, "
+                    f"settings say {self.metadata[key]}; rebuild the shard to apply"
+                )
+
+    def _recover(self, shard_name: str, existing: set[str]) -> None:
+        """
+        Finish or undo a rebuild of `shard_name` that a crash interrupted.
+
+        A rebuild renames the live shard to "-retired" only once "-rebuild" holds
+        every record, so a shard missing its name is completed from "-rebuild"
+        (or restored from "-retired"). Leftover staging or retired copies next
+        to a live shard are dropped.
+        """
+        staging_name, retired_name = f"{shard_name}-rebuild", f"{shard_name}-retired"
+        if shard_name not in existing:
+            for source in (staging_name, retired_name):
+                if source in existing:
+                    logger.warning(f"Recovering shard '{shard_name}' from an interrupted rebuild")
+                    self.client.get_collection(source).modify(name=shard_name)
+                    existing = existing - {source} | {shard_name}
+                    break
+        if shard_name in existing:
+            for leftover in (staging_name, retired_name):
+                if leftover in existing:
+                    self.client.delete_collection(leftover)
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def shard_of(self, record_id: str) -> int:
+        """Stable shard for an id (crc32, so it agrees across processes)."""
+        return zlib.crc32(record_id.encode()) % len(self.names)
+
+    def _partition(self, ids: list[str]) -> dict[int, list[int]]:
+        """Shard -> positions in `ids` that belong to it."""
+        groups: dict[int, list[int]] = {}
+        for i, record_id in enumerate(ids):
+            groups.setdefault(self.shard_of(record_id), []).append(i)
+        return groups
+
+    async def _read(self, shard: int, method: str, **kwargs):
+        collection = self._collections[shard]
+        try:
+            return await self.pool.run(getattr(collection, method), **kwargs)
+        except Exception:
+            if self._collections[shard] is collection:
+                raise
+            # A rebuild swapped the shard (and dropped the old one) mid-read; retry on the new one
+            return await self.pool.run(getattr(self._collections[shard], method), **kwargs)
+
+    async def upsert(self, ids: list[str], **columns) -> None:
+        """Upsert records, each column (documents, embeddings, metadatas) aligned with `ids`."""
+
+        async def write(shard: int, rows: list[int]) -> None:
+            async with self._locks[shard]:
+                await self.pool.run(
+                    self._collections[shard].upsert,
+                    ids=[ids[i] for i in rows],
+                    **{key: [values[i] for i in rows] for key, values in columns.items()},
+                )
+
+        await asyncio.gather(*(write(shard, rows) for shard, rows in self._partition(ids).items()))
+
+    async def get(self, ids: list[str] | None = None, include: list[str] | None = None) -> dict:
+        """Records by id (or all of them), concatenated across shards."""
+        include = include or ["metadatas", "documents"]
+        if ids is None:
+            targets = [(shard, None) for shard in range(len(self.names))]
+        else:
+            targets = [
+                (shard, [ids[i] for i in rows]) for shard, rows in self._partition(ids).items()
+            ]
+
+        results = await asyncio.gather(*(
+            self._read(shard, "get", ids=shard_ids, include=include)
+            for shard, shard_ids in targets
+        ))
+        merged = {"ids": []} | {key: [] for key in include}
+        for result in results:
+            merged["ids"] += result["ids"]
+            for key in include:
+                merged[key] += list(result[key]) if result[key] is not None else []
+        return merged
+
+    async def query(
+        self,
+        query_embeddings: list[list[float]],
+        n_results: int,
+        where: dict | None = None,
+    ) -> dict:
+        """Top `n_results` (ids, distances) per query embedding, merged across shards."""
+        results = await asyncio.gather(*(
+            self._read(
+                shard,
+                "query",
+                query_embeddings=query_embeddings,
+                n_results=n_results,
+                where=where,
+                include=["distances"],
+            )
+            for shard in range(len(self.names))
+        ))
+        if len(results) == 1:
+            return results[0]
+
+        merged = {"ids": [], "distances": []}
+        for row in range(len(query_embeddings)):
+            # Each shard's hits are already sorted by distance
+            per_shard = [
+                zip(result["distances"][row], result["ids"][row])
+                for result in results
+                if result["ids"] and row < len(result["ids"])
+            ]
+            top = list(heapq.merge(*per_shard))[:n_results]
+            merged["ids"].append([record_id for _, record_id in top])
+            merged["distances"].append([distance for distance, _ in top])
+        return merged
+
+    async def count(self) -> int:
+        counts = await asyncio.gather(
+            *(self._read(shard, "count") for shard in range(len(self.names)))
+        )
+        return sum(counts)
+
+    async def clear(self) -> None:
+        """Drop and re-create every shard."""
+        for shard, shard_name in enumerate(self.names):
+            async with self._locks[shard]:
+                await self.pool.run(self.client.delete_collection, shard_name)
+                self._collections[shard] = await self.pool.run(
+                    self.client.get_or_create_collection, name=shard_name, metadata=self.metadata
+                )
+
+    async def rebuild(self, shard: int, metadata: dict | None = None) -> int:
+        """
+        Rebuild one shard's index from its stored records, returning the count.
+
+        Records are copied into a staging collection (optionally with new index
+        `metadata`), then reads switch to it and it takes the shard's name.
+        Searches keep hitting the old shard until the switch. The old shard is
+        renamed aside before staging takes its name and dropped only after, so
+        some collection always holds every record; `_recover` finishes the
+        swap if the process dies partway.
+        """
+        if metadata is not None:
+            self.metadata = metadata
+        shard_name = self.names[shard]
+        async with self._locks[shard]:
+            old = self._collections[shard]
+            staging_name = f"{shard_name}-rebuild"
+            existing = await self.pool.run(self.client.list_collections)
+            if any(getattr(c, "name", c) == staging_name for c in existing):
+                await self.pool.run(self.client.delete_collection, staging_name)
+            staging = await self.pool.run(
+                self.client.create_collection, name=staging_name, metadata=self.metadata
+            )
+
+            records = await self.pool.run(old.get, include=["embeddings", "documents", "metadatas"])
+            for start in range(0, len(records["ids"]), _REBUILD_BATCH):
+                end = start + _REBUILD_BATCH
+                await self.pool.run(
+                    staging.upsert,
+                    ids=records["ids"][start:end],
+                    embeddings=records["embeddings"][start:end],
+                    documents=records["documents"][start:end],
+                    metadatas=records["metadatas"][start:end],
+                )
+
+            self._collections[shard] = staging
+            retired_name = f"{shard_name}-retired"
+            await self.pool.run(old.modify, name=retired_name)
+            await self.pool.run(staging.modify, name=shard_name)
+            await self.pool.run(self.client.delete_collection, retired_name)
+            return len(records["ids"])
@@ -0,0 +1,162 @@
+"""In-memory graph of curated similar_to links, with personalized PageRank."""
+
+import numpy as np
+
+from entertainment_graph.models import Movie
+from entertainment_graph.services.catalog import get_catalog
+
+# How much each kind of curated link says "if you liked A, try B".
+# Contrast links pair opposites, so they carry no recommendation weight.
+RELATIONSHIP_WEIGHTS: dict[str, float] = {
+    "thematic": 1.0,
+    "spiritual_successor": 1.0,
+    "mood": 0.9,
+    "narrative_style": 0.8,
+    "visual_style": 0.8,
+    "creator": 0.7,
+    "audience_overlap": 0.6,
+    "contrast": 0.0,
+}
+
+
+class SimilarityGraph:
+    """
+    Weighted directed graph in compressed sparse row (CSR) form.
+
+    Out-edges of node i are `indices[indptr[i]:indptr[i + 1]]` with weights in
+    `data`, where a weight is `strength / 5 * RELATIONSHIP_WEIGHTS[type]`.
+    Bidirectional links add the reverse edge; when a pair is linked more than
+    once the strongest edge wins.
+    """
+
+    def __init__(
+        self, movies: list[Movie], weights: dict[str, float] | None = None, version: int = 0
+    ):
+        weights = RELATIONSHIP_WEIGHTS if weights is None else weights
+        self.version = version
+        self.ids = [movie.id for movie in movies]
+        self._positions = {movie_id: i for i, movie_id in enumerate(self.ids)}
+
+        sources: list[int] = []
+        targets: list[int] = []
+        edge_weights: list[float] = []
+        for movie in movies:
+            source = self._positions[movie.id]
+            for link in movie.similar_to:
+                target = self._positions.get(link.target_id)
+                weight = link.strength / 5 * weights.get(link.relationship_type, 0.0)
+                if target is None or target == source or weight <= 0:
+                    continue
+                sources.append(source)
+                targets.append(target)
+                edge_weights.append(weight)
+                if link.bidirectional:
+                    sources.append(target)
+                    targets.append(source)
+                    edge_weights.append(weight)
+
+        # Sort by (source, target, -weight) and keep the first, strongest, of each pair
+        n = len(self.ids)
+        src = np.array(sources, dtype=np.int32)
+        dst = np.array(targets, dtype=np.int32)
+        weight = np.array(edge_weights, dtype=np.float32)
+        order = np.lexsort((-weight, dst, src))
+        src, dst, weight = src[order], dst[order], weight[order]
+        first = np.ones(len(src), dtype=bool)
+        first[1:] = (src[1:] != src[:-1]) | (dst[1:] != dst[:-1])
+        src, self.indices, self.data = src[first], dst[first], weight[first]
+        self.indptr = np.zeros(n + 1, dtype=np.int32)
+        np.cumsum(np.bincount(src, minlength=n), out=self.indptr[1:])
+
+        # Per-edge source row and row-normalized transition probabilities
+        self._sources = src
+        out_weight = np.bincount(self._sources, weights=self.data, minlength=n)
+        transition = self.data / np.maximum(out_weight[self._sources], 1e-12)
+        self._transition = transition.astype(np.float32)
+        self._dangling = out_weight == 0
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def __contains__(self, movie_id: str) -> bool:
+        return movie_id in self._positions
+
+    @property
+    def edge_count(self) -> int:
+        return len(self.indices)
+
+    def neighbors(self, movie_id: str) -> list[tuple[str, float]]:
+        """Direct (id, weight) out-neighbours of a movie, strongest first."""
+        row = self._positions.get(movie_id)
+        if row is None:
+            return []
+        start, end = self.indptr[row], self.indptr[row + 1]
+        order = np.argsort(-self.data[start:end], kind="stable")
+        return [
+            (self.ids[self.indices[start + i]], float(self.data[start + i])) for i in order
+        ]
+
+    def personalized_pagerank(
+        self,
+        seeds: list[str],
+        restart: float = 0.15,
+        max_iterations: int = 100,
+        tolerance: float = 1e-6,
+    ) -> np.ndarray:
+        """
+        Random walk with restart from `seeds`, as one probability per node.
+
+        Each step follows an out-edge in proportion to its weight, or jumps back
+        to a seed with probability `restart` (and always from dead ends). Power
+        iteration over the edge arrays; no per-node Python loop.
+        """
+        n = len(self.ids)
+        personalization = np.zeros(n, dtype=np.float64)
+        for movie_id in seeds:
+            row = self._positions.get(movie_id)
+            if row is not None:
+                personalization[row] = 1.0
+        if not personalization.any():
+            return personalization
+        personalization /= personalization.sum()
+
+        rank = personalization.copy()
+        for _ in range(max_iterations):
+            spread = np.bincount(
+                self.indices, weights=self._transition * rank[self._sources], minlength=n
+            )
+            stuck = rank[self._dangling].sum()
+            updated = (1 - restart) * (spread + stuck * personalization) + restart * personalization
+            converged = np.abs(updated - rank).sum() < tolerance
+            rank = updated
+            if converged:
+                break
+        return rank
+
+    def recommend(
+        self, seeds: list[str], limit: int = 10, restart: float = 0.15
+    ) -> list[tuple[str, float]]:
+        """Top (id, score) movies reachable from `seeds`, excluding the seeds themselves."""
+        rank = self.personalized_pagerank(seeds, restart=restart)
+        for movie_id in seeds:
+            row = self._positions.get(movie_id)
+            if row is not None:
+                rank[row] = 0.0
+
+        candidates = np.flatnonzero(rank > 0)
+        if len(candidates) > limit:
+            candidates = candidates[np.argpartition(-rank[candidates], limit - 1)[:limit]]
+        candidates = candidates[np.argsort(-rank[candidates], kind="stable")]
+        return [(self.ids[i], float(rank[i])) for i in candidates]
+
+
+_graph: SimilarityGraph | None = None
+
+
+def get_similarity_graph() -> SimilarityGraph:
+    """Graph over the shared catalog, rebuilt when the catalog version changes."""
+    global _graph
+    catalog = get_catalog()
+    if _graph is None or _graph.version != catalog.version:
+        _graph = SimilarityGraph(list(catalog.movies.values()), version=catalog.version)
+    return _graph
@@ -0,0 +1,257 @@
+"""Precomputed top-k similar movies for every movie in the catalog."""
+
+import logging
+from collections.abc import Iterable
+from functools import lru_cache
+from pathlib import Path
+
+import numpy as np
+
+from entertainment_graph.config import get_settings
+from entertainment_graph.models import Movie
+
+logger = logging.getLogger(__name__)
+
+
+def curated_bonus(
+    movies: dict[str, Movie], positions: dict[str, int]
+) -> dict[int, dict[int, float]]:
+    """
+    Curated `similar_to` links as {row: {column: strength / 5}}.
+
+    Bidirectional links count in both directions; the strongest link wins when
+    a pair is linked more than once.
+    """
+    bonus: dict[int, dict[int, float]] = {}
+    for movie in movies.values():
+        source = positions.get(movie.id)
+        if source is None:
+            continue
+        for link in movie.similar_to:
+            target = positions.get(link.target_id)
+            if target is None or target == source:
+                continue
+            pairs = [(source, target)] + ([(target, source)] if link.bidirectional else [])
+            for row, column in pairs:
+                row_bonus = bonus.setdefault(row, {})
+                row_bonus[column] = max(row_bonus.get(column, 0.0), link.strength / 5)
+    return bonus
+
+
+class SimilarityTable:
+    """
+    Top-k neighbours per movie as compact arrays.
+
+    `neighbors[i]` holds int32 row positions (-1 padding) and `scores[i]` the
+    float16 blended scores, best first:
+
+        score = (1 - curated_weight) * cosine + curated_weight * strength / 5
+
+    where the curated term only applies to pairs linked by `similar_to`.
+    """
+
+    def __init__(self, k: int = 20, curated_weight: float = 0.3):
+        self.k = k
+        self.curated_weight = curated_weight
+        self.clear()
+
+    def _swap(self, ids: list[str], neighbors: np.ndarray, scores: np.ndarray) -> None:
+        # One attribute assignment, so readers never see a half-updated table
+        positions = {movie_id: i for i, movie_id in enumerate(ids)}
+        self._state = (ids, positions, neighbors, scores)
+
+    @property
+    def ids(self) -> list[str]:
+        return self._state[0]
+
+    @property
+    def neighbors(self) -> np.ndarray:
+        return self._state[2]
+
+    @property
+    def scores(self) -> np.ndarray:
+        return self._state[3]
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def __contains__(self, movie_id: str) -> bool:
+        return movie_id in self._state[1]
+
+    def similar(self, movie_id: str, limit: int | None = None) -> list[tuple[str, float]]:
+        """(id, score) neighbours of `movie_id`, best first - O(k)."""
+        ids, positions, neighbors, scores = self._state
+        row = positions.get(movie_id)
+        if row is None:
+            return []
+        limit = self.k if limit is None else min(limit, self.k)
+        return [
+            (ids[column], float(score))
+            for column, score in zip(neighbors[row, :limit], scores[row, :limit])
+            if column >= 0
+        ]
+
+    def clear(self) -> None:
+        self._swap(
+            [], np.full((0, self.k), -1, dtype=np.int32), np.zeros((0, self.k), dtype=np.float16)
+        )
+
+    def build(
+        self,
+        ids: list[str],
+        vectors: np.ndarray,
+        movies: dict[str, Movie],
+        block_size: int = 1024,
+    ) -> None:
+        """Recompute every row from unit-normalized `vectors` (row i is ids[i])."""
+        ids = list(ids)
+        bonus = curated_bonus(movies, {movie_id: i for i, movie_id in enumerate(ids)})
+        neighbors, scores = self._top_k(np.arange(len(ids)), vectors, bonus, block_size)
+        self._swap(ids, neighbors, scores)
+
+    def extend(
+        self,
+        ids: list[str],
+        vectors: np.ndarray,
+        movies: dict[str, Movie],
+        changed: Iterable[str] = (),
+        block_size: int = 1024,
+    ) -> None:
+        """
+        Refresh after movies were appended to `ids`/`vectors` or, for the ids
+        in `changed`, had their vectors replaced in place.
+
+        `ids` must extend the table's current ids in order. Only the dirty
+        columns (new and changed movies) are scored against the rest: dirty
+        rows, and rows whose top-k held a changed movie, are recomputed in
+        full; every other row merges the dirty columns into its current top-k.
+        Falls back to a full rebuild when the prefix doesn't match.
+        """
+        old_ids, positions, old_neighbors, old_scores = self._state
+        old_count = len(old_ids)
+        if list(ids[:old_count]) != old_ids or not old_count:
+            self.build(ids, vectors, movies, block_size)
+            return
+
+        ids = list(ids)
+        changed_rows = np.array(
+            sorted({positions[movie_id] for movie_id in changed if movie_id in positions}),
+            dtype=np.int64,
+        )
+        dirty = np.concatenate([changed_rows, np.arange(old_count, len(ids))])
+        if not len(dirty):
+            self._swap(ids, old_neighbors, old_scores)
+            return
+        bonus = curated_bonus(movies, {movie_id: i for i, movie_id in enumerate(ids)})
+
+        # A row that ranked a changed movie may have lost a neighbour its stored
+        # top-k can't replace, so it's recomputed like the dirty rows
+        stale = np.zeros(len(ids), dtype=bool)
+        stale[dirty] = True
+        stale[:old_count] |= np.isin(old_neighbors, changed_rows).any(axis=1)
+        full_rows = np.flatnonzero(stale)
+        merge_rows = np.flatnonzero(~stale)
+
+        neighbors = np.full((len(ids), self.k), -1, dtype=np.int32)
+        scores = np.zeros((len(ids), self.k), dtype=np.float16)
+        neighbors[full_rows], scores[full_rows] = self._top_k(
+            full_rows, vectors, bonus, block_size
+        )
+
+        column_neighbors, column_scores = self._top_k(
+            merge_rows, vectors, bonus, block_size, columns=dirty
+        )
+        merged_neighbors = np.concatenate([old_neighbors[merge_rows], column_neighbors], axis=1)
+        merged_scores = np.concatenate(
+            [old_scores[merge_rows].astype(np.float32), column_scores.astype(np.float32)], axis=1
+        )
+        merged_scores[merged_neighbors < 0] = -np.inf
+        order = np.argsort(-merged_scores, axis=1, kind="stable")[:, : self.k]
+        top_neighbors = np.take_along_axis(merged_neighbors, order, axis=1)
+        top_scores = np.take_along_axis(merged_scores, order, axis=1)
+        top_neighbors[~np.isfinite(top_scores)] = -1
+        top_scores[~np.isfinite(top_scores)] = 0
+        neighbors[merge_rows], scores[merge_rows] = top_neighbors, top_scores
+
+        self._swap(ids, neighbors, scores)
+
+    def _top_k(
+        self,
+        rows: np.ndarray,
+        vectors: np.ndarray,
+        bonus: dict[int, dict[int, float]],
+        block_size: int,
+        columns: np.ndarray | None = None,
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """Top-k blended scores of `rows` against `columns` (default: all), in blocks of rows."""
+        k = self.k
+        neighbors = np.full((len(rows), k), -1, dtype=np.int32)
+        scores = np.zeros((len(rows), k), dtype=np.float16)
+        if columns is None:
+            columns = np.arange(len(vectors))
+            column_vectors = vectors
+        else:
+            column_vectors = vectors[columns]
+        n_columns = len(columns)
+        if n_columns == 0 or len(rows) == 0:
+            return neighbors, scores
+        # Row position -> index among the columns, -1 when not one of them
+        column_of = np.full(len(vectors), -1, dtype=np.int64)
+        column_of[columns] = np.arange(n_columns)
+
+        for start in range(0, len(rows), block_size):
+            block_rows = rows[start : start + block_size]
+            block = (vectors[block_rows] @ column_vectors.T) * (1 - self.curated_weight)
+
+            for i, row in enumerate(block_rows):
+                for column, strength in bonus.get(int(row), {}).items():
+                    if column_of[column] >= 0:
+                        block[i, column_of[column]] += self.curated_weight * strength
+
+            # A movie is never its own neighbour
+            own = column_of[block_rows]
+            block[np.flatnonzero(own >= 0), own[own >= 0]] = -np.inf
+
+            take = min(k, n_columns)
+            top = np.argpartition(-block, take - 1, axis=1)[:, :take]
+            top_scores = np.take_along_axis(block, top, axis=1)
+            order = np.argsort(-top_scores, axis=1, kind="stable")
+            top = np.take_along_axis(top, order, axis=1)
+            top_scores = np.take_along_axis(top_scores, order, axis=1)
+
+            valid = np.isfinite(top_scores)
+            neighbors[start : start + len(block_rows), :take] = np.where(valid, columns[top], -1)
+            scores[start : start + len(block_rows), :take] = np.where(valid, top_scores, 0)
+
+        return neighbors, scores
+
+    def save(self, path: Path) -> None:
+        ids, _, neighbors, scores = self._state  # One snapshot, even if a refresh swaps it
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "wb") as f:
+            np.savez(f, ids=np.array(ids), neighbors=neighbors, scores=scores)
+
+    def load(self, path: Path) -> None:
+        with np.load(path) as data:
+            ids = [str(movie_id) for movie_id in data["ids"]]
+            neighbors, scores = data["neighbors"], data["scores"]
+        self.k = neighbors.shape[1]
+        self._swap(ids, neighbors, scores)
+
+
+def table_path() -> Path:
+    return Path(get_settings().chroma_dir) / "similar_movies.npz"
+
+
+@lru_cache
+def get_similarity_table() -> SimilarityTable:
+    """Shared table, loaded from disk if a previous run saved one."""
+    settings = get_settings()
+    table = SimilarityTable(settings.similar_movies_k, settings.similar_curated_weight)
+    path = table_path()
+    if path.exists():
+        try:
+            table.load(path)
+        except Exception as e:
+            logger.warning(f"Could not load similar-movies table from {path}: {e}")
+    return table
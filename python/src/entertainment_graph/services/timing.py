@@ -0,0 +1,73 @@
+"""Per-request stage timings, collected through a context variable."""
+
+import time
+from collections.abc import Awaitable, Callable, Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import TypeVar
+
+from entertainment_graph.services import metrics
+
+T = TypeVar("T")
+
+# Stages the systems report, in pipeline order
+STAGES = ("embed", "retrieve", "llm", "parse")
+INGEST_STAGES = ("embed", "extract", "store", "index")
+
+STAGE_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+_current: ContextVar[dict[str, float] | None] = ContextVar("stage_timings", default=None)
+
+
+@contextmanager
+def collect_timings() -> Iterator[dict[str, float]]:
+    """
+    Collect seconds per stage for everything run inside the block.
+
+    Tasks started inside it (gather, create_task) share the collector, so
+    stages that run concurrently add up to more than the wall time.
+    """
+    timings: dict[str, float] = {}
+    token = _current.set(timings)
+    try:
+        yield timings
+    finally:
+        _current.reset(token)
+
+
+@contextmanager
+def stage(name: str) -> Iterator[None]:
+    """Time the block as `name` if a collector is active; free otherwise."""
+    timings = _current.get()
+    if timings is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings[name] = timings.get(name, 0.0) + time.perf_counter() - start
+
+
+async def timed(
+    system: str, operation: str, call: Callable[[], Awaitable[T]]
+) -> tuple[T, dict[str, float]]:
+    """
+    Await `call()` collecting its stages plus "total".
+
+    Each stage is observed in the stage_seconds histogram for (system,
+    operation, stage); the timings are returned in milliseconds.
+    """
+    start = time.perf_counter()
+    with collect_timings() as timings:
+        result = await call()
+    timings["total"] = time.perf_counter() - start
+
+    for name, seconds in timings.items():
+        metrics.histogram(
+            "stage_seconds",
+            "Seconds spent per stage of a system operation",
+            STAGE_BUCKETS,
+            {"system": system, "operation": operation, "stage": name},
+        ).observe(seconds)
+    return result, {name: round(seconds * 1000, 2) for name, seconds in timings.items()}
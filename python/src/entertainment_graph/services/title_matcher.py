@@ -0,0 +1,161 @@
+"""Detect catalog titles mentioned in free-text queries."""
+
+import re
+from collections import deque
+
+from entertainment_graph.models import Movie
+from entertainment_graph.services.catalog import get_catalog
+
+_WORD_RE = re.compile(r"[A-Za-z0-9]+")
+_ARTICLES = ("the", "a", "an")
+
+# Some titles read as ordinary words: one word ("Her", "Heat", "Severance"), an
+# article and one word ("The Office", "The Game"), or only common words ("Get Out").
+# They only count when capitalised or right after a cue like "like"
+_CUES = (("like",), ("similar", "to"), ("than",))
+_COMMON_WORDS = frozenset(
+    "a about after all an and as at away back be before by down for from get go he her "
+    "here him his home i in into is it me my no not now of off on one out over she so "
+    "that the them then there they this to too two up us we what when where who with you "
+    "your".split()
+)
+
+
+def _words(text: str) -> list[str]:
+    return [word.lower() for word in _WORD_RE.findall(text)]
+
+
+def _reads_as_words(alias: tuple[str, ...]) -> bool:
+    """Whether `alias` could just as well be ordinary prose."""
+    words = alias[1:] if len(alias) > 1 and alias[0] in _ARTICLES else alias
+    return len(words) == 1 or all(word in _COMMON_WORDS for word in alias)
+
+
+def title_aliases(movie: Movie) -> list[tuple[str, ...]]:
+    """
+    Word sequences that refer to `movie`, most specific first.
+
+    The full title, then the title without a leading article, the part before
+    a subtitle colon, and the title without a trailing sequel number or year.
+    """
+    words = tuple(_words(movie.title))
+    aliases = [words]
+    if len(words) > 1 and words[0] in _ARTICLES:
+        aliases.append(words[1:])
+    if ":" in movie.title:
+        aliases.append(tuple(_words(movie.title.split(":", 1)[0])))
+    if len(words) > 1 and words[-1].isdigit():
+        aliases.append(words[:-1])
+    return [alias for alias in dict.fromkeys(aliases) if alias]
+
+
+class TitleMatcher:
+    """
+    Aho-Corasick automaton over title word sequences.
+
+    Matching walks the query's words once, whatever the catalog size, and only
+    matches on word boundaries ("Her" doesn't fire inside "other"). Overlapping
+    matches resolve to the longest, leftmost title.
+    """
+
+    def __init__(self, movies: list[Movie], version: int = 0):
+        self.version = version
+        self._goto: list[dict[str, int]] = [{}]
+        self._fail: list[int] = [0]
+        self._output: list[list[tuple[int, tuple[str, ...]]]] = [[]]  # (length, alias)
+        self._targets: dict[tuple[str, ...], list[str]] = {}
+
+        # Exact titles take precedence over derived aliases of other movies
+        exact = {tuple(_words(movie.title)) for movie in movies}
+        for movie in movies:
+            for i, alias in enumerate(title_aliases(movie)):
+                if i > 0 and alias in exact:
+                    continue
+                ids = self._targets.setdefault(alias, [])
+                if movie.id not in ids:
+                    ids.append(movie.id)
+
+        for alias in self._targets:
+            self._insert(alias)
+        self._link()
+
+    def __len__(self) -> int:
+        return len(self._targets)
+
+    def _insert(self, alias: tuple[str, ...]) -> None:
+        state = 0
+        for word in alias:
+            if word not in self._goto[state]:
+                self._goto.append({})
+                self._fail.append(0)
+                self._output.append([])
+                self._goto[state][word] = len(self._goto) - 1
+            state = self._goto[state][word]
+        self._output[state].append((len(alias), alias))
+
+    def _link(self) -> None:
+        """Breadth-first failure links, merging outputs along them."""
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for word, child in self._goto[state].items():
+                queue.append(child)
+                fallback = self._fail[state]
+                while fallback and word not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[child] = self._goto[fallback].get(word, 0)
+                if self._fail[child] == child:
+                    self._fail[child] = 0
+                self._output[child] += self._output[self._fail[child]]
+
+    @staticmethod
+    def _reads_as_title(spans: list[re.Match], start: int, alias: tuple[str, ...]) -> bool:
+        """
+        Whether the match of `alias` at `start` is capitalised (past a leading
+        article) or follows a cue.
+        """
+        first = start + 1 if len(alias) > 1 and alias[0] in _ARTICLES else start
+        if spans[first].group()[0].isupper():
+            return True
+        before = tuple(span.group().lower() for span in spans[max(0, start - 2) : start])
+        return any(before[-len(cue) :] == cue for cue in _CUES)
+
+    def find(self, text: str) -> list[str]:
+        """Ids of movies whose titles appear in `text`, in order of appearance."""
+        spans = list(_WORD_RE.finditer(text))
+        matches: list[tuple[int, int, tuple[str, ...]]] = []  # (start, end, alias)
+        state = 0
+        for end, span in enumerate(spans, 1):
+            word = span.group().lower()
+            while state and word not in self._goto[state]:
+                state = self._fail[state]
+            state = self._goto[state].get(word, 0)
+            for length, alias in self._output[state]:
+                start = end - length
+                if _reads_as_words(alias) and not self._reads_as_title(spans, start, alias):
+                    continue
+                matches.append((start, end, alias))
+
+        # Longest first, then leftmost; drop matches overlapping an accepted one
+        matches.sort(key=lambda m: (m[0] - m[1], m[0]))
+        taken: list[tuple[int, int, tuple[str, ...]]] = []
+        for start, end, alias in matches:
+            if all(end <= s or start >= e for s, e, _ in taken):
+                taken.append((start, end, alias))
+
+        ids: list[str] = []
+        for _, _, alias in sorted(taken):
+            ids += [movie_id for movie_id in self._targets[alias] if movie_id not in ids]
+        return ids
+
+
+_matcher: TitleMatcher | None = None
+
+
+def get_title_matcher() -> TitleMatcher:
+    """Matcher over the shared catalog, rebuilt when the catalog version changes."""
+    global _matcher
+    catalog = get_catalog()
+    if _matcher is None or _matcher.version != catalog.version:
+        _matcher = TitleMatcher(list(catalog.movies.values()), version=catalog.version)
+    return _matcher
@@ -0,0 +1,169 @@
+"""Token usage and cost per request, with rolling per-system aggregates."""
+
+import time
+from collections import deque
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import lru_cache
+from typing import Any
+
+from entertainment_graph.config import get_settings
+from entertainment_graph.services import metrics
+
+TOKEN_TYPES = ("prompt_tokens", "completion_tokens", "embedding_tokens")
+
+# Rolling windows reported by the ledger, in seconds
+WINDOWS = {"1m": 60, "15m": 900, "1h": 3600}
+
+_current: ContextVar[dict[str, int] | None] = ContextVar("usage", default=None)
+
+
+@contextmanager
+def collect_usage() -> Iterator[dict[str, int]]:
+    """
+    Sum the tokens of every API call made inside the block.
+
+    Like stage timings, tasks started inside the block report into the same
+    collector; a nested block collects separately from its parent.
+    """
+    usage: dict[str, int] = {}
+    token = _current.set(usage)
+    try:
+        yield usage
+    finally:
+        _current.reset(token)
+
+
+def current() -> dict[str, int] | None:
+    """The active collector, or None outside `collect_usage`."""
+    return _current.get()
+
+
+def add(collector: dict[str, int] | None, token_type: str, count: int) -> None:
+    if collector is not None and count:
+        collector[token_type] = collector.get(token_type, 0) + count
+
+
+def record(kind: str, usage: Any) -> None:
+    """Add an OpenAI response's `usage` (chat or embeddings) to the active collector."""
+    collector = _current.get()
+    if collector is None or usage is None:
+        return
+    # Chat Completions and embeddings say prompt/completion, the Responses API input/output
+    prompt_tokens = getattr(usage, "prompt_tokens", None) or getattr(usage, "input_tokens", None)
+    if kind == "chat":
+        completion_tokens = getattr(usage, "completion_tokens", None) or getattr(
+            usage, "output_tokens", None
+        )
+        add(collector, "prompt_tokens", prompt_tokens or 0)
+        add(collector, "completion_tokens", completion_tokens or 0)
+    else:
+        add(collector, "embedding_tokens", prompt_tokens or 0)
+
+
+def cost(usage: dict[str, int]) -> float:
+    """Estimated USD cost of `usage` at the configured per-million-token prices."""
+    settings = get_settings()
+    return (
+        usage.get("prompt_tokens", 0) * settings.llm_prompt_cost_per_1m
+        + usage.get("completion_tokens", 0) * settings.llm_completion_cost_per_1m
+        + usage.get("embedding_tokens", 0) * settings.embedding_cost_per_1m
+    ) / 1_000_000
+
+
+class UsageLedger:
+    """
+    Requests, tokens and cost per (system, endpoint) over rolling windows.
+
+    Totals are kept in `bucket_seconds` buckets so a window sums a few dozen
+    entries regardless of traffic; buckets older than the longest window are
+    dropped as new ones start. Lifetime totals also go to Prometheus counters.
+
+    Entries from systems that make API calls accounting can't see are flagged
+    `partial`, and so is every summary row they contributed to.
+    """
+
+    def __init__(self, bucket_seconds: int = 60, horizon_seconds: int = max(WINDOWS.values())):
+        self.bucket_seconds = bucket_seconds
+        self.horizon = horizon_seconds
+        self._buckets: dict[tuple[str, str], deque[tuple[int, dict[str, float]]]] = {}
+        self._partial: set[tuple[str, str]] = set()
+
+    def add(
+        self,
+        system: str,
+        endpoint: str,
+        usage: dict[str, int],
+        requests: int = 1,
+        partial: bool = False,
+        now: float | None = None,
+    ) -> dict:
+        """
+        Record `requests` requests (e.g. a batch) that spent `usage`, which
+        undercounts when `partial`; returns it with the cost added.
+        """
+        entry = {name: usage.get(name, 0) for name in TOKEN_TYPES}
+        entry["cost_usd"] = round(cost(usage), 8)
+
+        labels = {"system": system, "endpoint": endpoint}
+        metrics.counter(
+            "usage_requests_total", "Requests with usage accounting", labels
+        ).inc(requests)
+        for name in TOKEN_TYPES:
+            metrics.counter(
+                "usage_tokens_total",
+                "Tokens spent per system and endpoint",
+                labels | {"type": name},
+            ).inc(entry[name])
+        metrics.counter(
+            "usage_cost_usd_total", "Estimated spend per system and endpoint", labels
+        ).inc(entry["cost_usd"])
+
+        now = time.time() if now is None else now
+        start = int(now // self.bucket_seconds) * self.bucket_seconds
+        buckets = self._buckets.setdefault((system, endpoint), deque())
+        if not buckets or buckets[-1][0] != start:
+            buckets.append((start, {"requests": 0}))
+            while buckets[0][0] <= start - self.horizon:
+                buckets.popleft()
+        totals = buckets[-1][1]
+        totals["requests"] += requests
+        for name, value in entry.items():
+            totals[name] = totals.get(name, 0) + value
+        if partial:
+            self._partial.add((system, endpoint))
+        return entry | {"partial": partial}
+
+    def summary(self, now: float | None = None) -> list[dict]:
+        """Totals and per-request means for each (system, endpoint) and window."""
+        now = time.time() if now is None else now
+        rows = []
+        for (system, endpoint), buckets in sorted(self._buckets.items()):
+            windows = {}
+            for label, seconds in WINDOWS.items():
+                totals: dict[str, float] = {"requests": 0}
+                for start, bucket in buckets:
+                    if start > now - seconds:
+                        for name, value in bucket.items():
+                            totals[name] = totals.get(name, 0) + value
+                requests = totals["requests"]
+                totals["cost_usd_per_request"] = (
+                    totals.get("cost_usd", 0.0) / requests if requests else 0.0
+                )
+                totals["tokens_per_request"] = (
+                    sum(totals.get(name, 0) for name in TOKEN_TYPES) / requests if requests else 0.0
+                )
+                windows[label] = totals
+            rows.append({
+                "system": system,
+                "endpoint": endpoint,
+                "partial": (system, endpoint) in self._partial,
+                "windows": windows,
+            })
+        return rows
+
+
+@lru_cache
+def get_usage_ledger() -> UsageLedger:
+    return UsageLedger()
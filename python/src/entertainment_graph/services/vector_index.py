@@ -0,0 +1,120 @@
+"""In-process matrix of unit-normalized embeddings."""
+
+from functools import lru_cache
+
+import numpy as np
+
+from entertainment_graph.config import get_settings
+
+VECTOR_DTYPES = ("float32", "float16", "int8")
+
+
+class VectorIndex:
+    """
+    Dense id -> vector store for exact, vectorized similarity work.
+
+    Vectors are L2-normalized on insert so cosine similarity is a dot product,
+    and kept in one contiguous matrix that grows geometrically. The matrix is
+    float32, float16, or int8 codes with a float32 scale per vector
+    (value = code * scale); reads always return float32.
+    """
+
+    def __init__(self, dim: int | None = None, dtype: str = "float32"):
+        if dtype not in VECTOR_DTYPES:
+            raise ValueError(
+                f"Unknown vector dtype '{dtype}'. Available: {', '.join(VECTOR_DTYPES)}"
+            )
+        self.dim = dim
+        self.dtype = dtype
+        self.ids: list[str] = []
+        self._positions: dict[str, int] = {}
+        self._matrix = np.zeros((0, dim or 0), dtype=dtype)
+        self._scales = np.ones(0, dtype=np.float32)  # int8 only
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def __contains__(self, movie_id: str) -> bool:
+        return movie_id in self._positions
+
+    @property
+    def matrix(self) -> np.ndarray:
+        """(n, dim) float32 vectors, row i belonging to ids[i]."""
+        return self.rows(slice(0, len(self.ids)))
+
+    @property
+    def nbytes(self) -> int:
+        """Bytes used by the stored vectors (and scales)."""
+        n = len(self.ids)
+        return self._matrix[:n].nbytes + (self._scales[:n].nbytes if self.dtype == "int8" else 0)
+
+    def position(self, movie_id: str) -> int | None:
+        return self._positions.get(movie_id)
+
+    def rows(self, positions) -> np.ndarray:
+        """float32 vectors at row `positions` (a list, array or slice)."""
+        stored = self._matrix[positions]
+        if self.dtype == "float32":
+            return stored
+        if self.dtype == "float16":
+            return stored.astype(np.float32)
+        return stored.astype(np.float32) * self._scales[positions][:, None]
+
+    def add(self, ids: list[str], vectors) -> None:
+        """Insert or replace vectors for `ids`."""
+        if len(ids) == 0:
+            return
+        vectors = normalize(np.asarray(vectors, dtype=np.float32))
+        if self.dim is None or len(self.ids) == 0:
+            self.dim = vectors.shape[1]
+            if self._matrix.shape[1] != self.dim:
+                self._matrix = np.zeros((0, self.dim), dtype=self.dtype)
+                self._scales = np.ones(0, dtype=np.float32)
+
+        new_ids = [movie_id for movie_id in dict.fromkeys(ids) if movie_id not in self._positions]
+        self._reserve(len(self.ids) + len(new_ids))
+        for movie_id in new_ids:
+            self._positions[movie_id] = len(self.ids)
+            self.ids.append(movie_id)
+
+        rows = [self._positions[movie_id] for movie_id in ids]
+        if self.dtype == "int8":
+            scales = np.maximum(np.abs(vectors).max(axis=1), 1e-12) / 127
+            self._matrix[rows] = np.round(vectors / scales[:, None]).astype(np.int8)
+            self._scales[rows] = scales
+        else:
+            self._matrix[rows] = vectors
+
+    def get(self, ids: list[str]) -> np.ndarray:
+        """Vectors for `ids` (which must be present), as an (len(ids), dim) array."""
+        return self.rows([self._positions[movie_id] for movie_id in ids])
+
+    def clear(self) -> None:
+        self.ids.clear()
+        self._positions.clear()
+        self._matrix = np.zeros((0, self.dim or 0), dtype=self.dtype)
+        self._scales = np.ones(0, dtype=np.float32)
+
+    def _reserve(self, size: int) -> None:
+        if size <= self._matrix.shape[0]:
+            return
+        capacity = max(size, 2 * self._matrix.shape[0], 64)
+        n = len(self.ids)
+        grown = np.zeros((capacity, self.dim), dtype=self.dtype)
+        grown[:n] = self._matrix[:n]
+        self._matrix = grown
+        scales = np.ones(capacity, dtype=np.float32)
+        scales[:n] = self._scales[:n]
+        self._scales = scales
+
+
+@lru_cache
+def get_movie_vectors() -> VectorIndex:
+    """Whole-document movie embeddings, filled by Pure Vector and shared with rerankers."""
+    return VectorIndex(dtype=get_settings().vector_dtype)
+
+
+def normalize(vectors: np.ndarray) -> np.ndarray:
+    """L2-normalize rows (or a single vector)."""
+    norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+    return vectors / np.maximum(norms, 1e-12)
@@ -1,8 +1,12 @@
 """Base class for all agentic retrieval systems."""
 
+import asyncio
 from abc import ABC, abstractmethod
 
-from entertainment_graph.models import Movie, AgentResponse
+import numpy as np
+
+from entertainment_graph.models import Movie, AgentResponse, QueryFilters
+from entertainment_graph.services.rerank import get_reranker
 
 
 class AgenticSystem(ABC):
@@ -27,21 +31,76 @@ class AgenticSystem(ABC):
         """Ingest movies into the system. Returns count ingested."""
         pass
 
+    async def finish_ingest(self) -> None:
+        """Called once after the last `ingest` batch of a run, to persist deferred work."""
+        pass
+
     @abstractmethod
-    async def query(self, query: str, limit: int = 5) -> AgentResponse:
+    async def query(
+        self, query: str, limit: int = 5, filters: QueryFilters | None = None
+    ) -> AgentResponse:
         """
         Full agentic query:
-        1. System retrieves relevant context
+        1. System retrieves relevant context (restricted to `filters`, if given)
         2. LLM reasons over the context
         3. Returns results with explanations
         """
         pass
 
+    async def query_batch(
+        self,
+        queries: list[str],
+        limit: int = 5,
+        concurrency: int = 4,
+        filters: QueryFilters | None = None,
+    ) -> list[AgentResponse]:
+        """
+        Run many queries, returning responses in input order.
+
+        The default runs `query` for each with bounded concurrency; systems that
+        can vectorize retrieval across queries override this.
+        """
+        semaphore = asyncio.Semaphore(max(1, concurrency))
+
+        async def run(query: str) -> AgentResponse:
+            async with semaphore:
+                return await self.query(query, limit, filters)
+
+        return await asyncio.gather(*(run(q) for q in queries))
+
+    def _fetch_size(self, limit: int) -> int:
+        """Candidates to retrieve for `limit` results, over-fetching when a reranker is on."""
+        reranker = get_reranker()
+        return limit * reranker.over_fetch if reranker else limit
+
+    async def _rerank(
+        self, candidates: list[dict], limit: int, id_key: str, score_key: str
+    ) -> list[dict]:
+        """Top `limit` candidates as chosen by the configured reranker (as-is when off)."""
+        reranker = get_reranker()
+        if reranker is None:
+            return candidates
+        picks = await reranker.rerank(
+            [c[id_key] for c in candidates],
+            np.array([c.get(score_key, 0.0) for c in candidates], dtype=np.float32),
+            limit,
+        )
+        return [candidates[i] for i in picks]
+
     @abstractmethod
     async def health_check(self) -> bool:
-        """Check if system is available."""
+        """Check if system is available (may call its backing services)."""
         pass
 
+    @property
+    def usage_complete(self) -> bool:
+        """Whether usage accounting sees every API call this system makes."""
+        return True
+
+    def ready(self) -> bool:
+        """Cheap, local check that the system can take requests now; no I/O."""
+        return True
+
     @abstractmethod
     async def clear(self) -> None:
         """Clear all data from the system."""
@@ -1,16 +1,107 @@
 """Graphiti system - temporal knowledge graph with entity/relationship extraction."""
 
+import asyncio
 import json
+import types
+import typing
 from datetime import datetime
 from graphiti_core import Graphiti
+from graphiti_core.cross_encoder.client import CrossEncoderClient
+from graphiti_core.cross_encoder.openai_reranker_client import OpenAIRerankerClient
+from graphiti_core.embedder.client import EmbedderClient
+from graphiti_core.embedder.openai import OpenAIEmbedder
+from graphiti_core.llm_client.client import LLMClient
+from graphiti_core.llm_client.openai_client import OpenAIClient
 from graphiti_core.nodes import EpisodeType
-from openai import OpenAI
+from pydantic import BaseModel
 
 from entertainment_graph.config import get_settings
-from entertainment_graph.models import Movie, AgentResponse, QueryResult
+from entertainment_graph.models import Movie, AgentResponse, QueryFilters, QueryResult
+from entertainment_graph.services.catalog import get_catalog
+from entertainment_graph.services.context_builder import count_prompt_tokens, pack_context
+from entertainment_graph.services.providers import (
+    get_chat_client,
+    get_library_client,
+    hashed_embedding,
+    local_dimensions,
+)
+from entertainment_graph.services.rate_limiter import (
+    COMPLETION_TOKEN_ALLOWANCE,
+    get_rate_limiter,
+)
+from entertainment_graph.services.timing import stage
 from .base import AgenticSystem
 
 
+class LocalEmbedder(EmbedderClient):
+    """Graphiti embedder backed by the local hashed n-gram embeddings."""
+
+    def __init__(self, dim: int):
+        self.dim = dim
+
+    async def create(self, input_data) -> list[float]:
+        text = input_data if isinstance(input_data, str) else next(iter(input_data))
+        return hashed_embedding(str(text), self.dim).tolist()
+
+    async def create_batch(self, input_data_list: list[str]) -> list[list[float]]:
+        return [hashed_embedding(text, self.dim).tolist() for text in input_data_list]
+
+
+class LocalCrossEncoder(CrossEncoderClient):
+    """Ranks passages by hashed-embedding cosine to the query."""
+
+    def __init__(self, dim: int):
+        self.dim = dim
+
+    async def rank(self, query: str, passages: list[str]) -> list[tuple[str, float]]:
+        query_vector = hashed_embedding(query, self.dim)
+        scores = [float(hashed_embedding(passage, self.dim) @ query_vector) for passage in passages]
+        return sorted(zip(passages, scores), key=lambda pair: -pair[1])
+
+
+class LocalLLMClient(LLMClient):
+    """
+    Graphiti LLM client that answers every prompt with an empty instance of the
+    requested response model after a fixed delay.
+
+    Extraction therefore finds no entities or edges: ingestion and search run
+    end to end offline, but the graph holds episodes only.
+    """
+
+    def __init__(self, latency_ms: float):
+        super().__init__(config=None)
+        self.latency_ms = latency_ms
+
+    async def _generate_response(
+        self, messages, response_model=None, max_tokens=None, model_size=None
+    ) -> dict:
+        await asyncio.sleep(self.latency_ms / 1000)
+        return _empty_model(response_model) if response_model is not None else {}
+
+
+def _empty_model(model: type[BaseModel]) -> dict:
+    """Smallest valid payload for `model`: required fields set to empty values."""
+    return {
+        name: _empty_value(field.annotation)
+        for name, field in model.model_fields.items()
+        if field.is_required()
+    }
+
+
+def _empty_value(annotation):
+    origin = typing.get_origin(annotation)
+    if origin in (typing.Union, types.UnionType):
+        options = typing.get_args(annotation)
+        return None if type(None) in options else _empty_value(options[0])
+    if origin is typing.Literal:
+        return typing.get_args(annotation)[0]
+    if origin is not None:
+        return origin()  # list, dict, set, tuple
+    if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+        return _empty_model(annotation)
+    return annotation() if annotation in (str, int, float, bool) else None
+
+
 class GraphitiSystem(AgenticSystem):
     """
     Graphiti: Temporal knowledge graph with automatic entity/relationship extraction.
@@ -23,16 +114,33 @@ class GraphitiSystem(AgenticSystem):
 
     def __init__(self):
         self.settings = get_settings()
-        self.openai = OpenAI(api_key=self.settings.openai_api_key)
-
-        # Initialize Graphiti with Neo4j
+        self.chat_client = get_chat_client()
+        self._chat_limiter = get_rate_limiter("chat")
+
+        # Initialize Graphiti with Neo4j. Its OpenAI clients share our rate-limited
+        # client, so each request is budgeted and retried on its own; local
+        # providers replace them outright
+        clients = {}
+        if self.settings.llm_provider == "local":
+            clients["llm_client"] = LocalLLMClient(self.settings.local_chat_latency_ms)
+            # Graphiti's default reranker is also an OpenAI chat model
+            clients["cross_encoder"] = LocalCrossEncoder(local_dimensions())
+        else:
+            clients["llm_client"] = OpenAIClient(client=get_library_client("chat"))
+            clients["cross_encoder"] = OpenAIRerankerClient(client=get_library_client("chat"))
+        if self.settings.embedding_provider == "local":
+            clients["embedder"] = LocalEmbedder(local_dimensions())
+        else:
+            clients["embedder"] = OpenAIEmbedder(client=get_library_client("embeddings"))
         self.graphiti = Graphiti(
             uri=self.settings.neo4j_uri,
             user=self.settings.neo4j_username,
             password=self.settings.neo4j_password,
+            **clients,
         )
 
         self._movies: dict[str, Movie] = {}  # Cache for movie data
+        self._catalog = get_catalog()
         self._initialized = False
 
     @property
@@ -59,15 +167,18 @@ class GraphitiSystem(AgenticSystem):
             # Create episode text - Graphiti will extract entities/relationships
             episode_text = self._create_episode_text(movie)
 
-            # Add episode to Graphiti
-            await self.graphiti.add_episode(
-                name=f"Movie: {movie.title}",
-                episode_body=episode_text,
-                reference_time=datetime(movie.year, 1, 1),  # Use movie year as timestamp
-                source_description=f"Movie data for {movie.title} (ID: {movie.id})",
-                source=EpisodeType.text,
-            )
+            # Add episode to Graphiti. Not retried as a whole: a failure partway
+            # would duplicate the episode; its clients retry each API request
+            with stage("extract"):
+                await self.graphiti.add_episode(
+                    name=f"Movie: {movie.title}",
+                    episode_body=episode_text,
+                    reference_time=datetime(movie.year, 1, 1),  # Use movie year as timestamp
+                    source_description=f"Movie data for {movie.title} (ID: {movie.id})",
+                    source=EpisodeType.text,
+                )
 
+        self._catalog.add(movies)
         return len(movies)
 
     def _create_episode_text(self, movie: Movie) -> str:
@@ -134,16 +245,20 @@ class GraphitiSystem(AgenticSystem):
 
         return ". ".join(parts) + "."
 
-    async def query(self, query: str, limit: int = 5) -> AgentResponse:
+    async def query(
+        self, query: str, limit: int = 5, filters: QueryFilters | None = None
+    ) -> AgentResponse:
         """Query using Graphiti's hybrid search + LLM reasoning."""
         await self._ensure_initialized()
 
         # 1. Search Graphiti's knowledge graph
         # This uses hybrid retrieval: semantic embeddings + BM25 + graph traversal
-        search_results = await self.graphiti.search(
-            query=query,
-            num_results=limit * 2,  # Get more results for filtering
-        )
+        with stage("retrieve"):
+            # The query embedding is rate limited by Graphiti's embedder client
+            search_results = await self.graphiti.search(
+                query=query,
+                num_results=self._fetch_size(limit) * 2,  # Get more results for filtering
+            )
 
         if not search_results:
             return AgentResponse(
@@ -155,6 +270,11 @@ class GraphitiSystem(AgenticSystem):
         # 2. Extract movie IDs from search results
         # Graphiti returns nodes, edges, and episodes - we need to map back to movies
         movie_contexts = self._extract_movie_contexts(search_results)
+        allowed = self._catalog.matcher(filters)
+        if allowed is not None:
+            # Filters can't be pushed into this system's search, so apply them here
+            movie_contexts = [ctx for ctx in movie_contexts if allowed(ctx["movie_id"])]
+        movie_contexts = await self._rerank(movie_contexts, limit, "movie_id", "score")
 
         if not movie_contexts:
             return AgentResponse(
@@ -164,13 +284,11 @@ class GraphitiSystem(AgenticSystem):
             )
 
         # 3. Use LLM to reason over graph context and explain results
-        context_text = self._format_graph_context(movie_contexts)
-        llm_response = self.openai.chat.completions.create(
-            model=self.settings.llm_model,
-            messages=[
-                {
-                    "role": "system",
-                    "content": """You are an entertainment recommendation assistant with access to a knowledge graph.
+        context_text, context_tokens = self._format_graph_context(movie_contexts)
+        messages = [
+            {
+                "role": "system",
+                "content": """You are an entertainment recommendation assistant with access to a knowledge graph.
 
 Given a user query and graph context (entities, relationships, temporal info), explain why each movie matches.
 
@@ -179,20 +297,28 @@ Return a JSON object with:
 - "results": Array of objects with "id" (movie ID), "explanation" (why this movie matches, referencing graph relationships)
 
 Be specific about graph relationships, shared entities, and temporal patterns.""",
-                },
-                {
-                    "role": "user",
-                    "content": f"Query: {query}\n\nGraph context:\n{context_text}",
-                },
-            ],
-            response_format={"type": "json_object"},
-        )
+            },
+            {
+                "role": "user",
+                "content": f"Query: {query}\n\nGraph context:\n{context_text}",
+            },
+        ]
+        prompt_tokens = count_prompt_tokens(messages)
+        with stage("llm"):
+            llm_response = await self._chat_limiter.call(
+                self.chat_client.chat.completions.with_raw_response.create,
+                model=self.settings.llm_model,
+                messages=messages,
+                response_format={"type": "json_object"},
+                estimated_tokens=prompt_tokens + COMPLETION_TOKEN_ALLOWANCE,
+            )
 
         # 4. Parse LLM response
-        try:
-            llm_result = json.loads(llm_response.choices[0].message.content)
-        except json.JSONDecodeError:
-            llm_result = {"reasoning": "Failed to parse LLM response", "results": []}
+        with stage("parse"):
+            try:
+                llm_result = json.loads(llm_response.choices[0].message.content)
+            except json.JSONDecodeError:
+                llm_result = {"reasoning": "Failed to parse LLM response", "results": []}
 
         # 5. Build final response
         query_results = []
@@ -226,6 +352,7 @@ Be specific about graph relationships, shared entities, and temporal patterns.""
             results=query_results,
             reasoning=llm_result.get("reasoning", "Retrieved using graph traversal and hybrid search."),
             system_name=self.name,
+            metadata={"prompt_tokens": prompt_tokens, "context_tokens": context_tokens},
         )
 
     def _extract_movie_contexts(self, search_results) -> list[dict]:
@@ -271,19 +398,21 @@ Be specific about graph relationships, shared entities, and temporal patterns.""
 
         return list(movie_contexts.values())
 
-    def _format_graph_context(self, movie_contexts: list[dict]) -> str:
-        """Format movie contexts for LLM."""
-        formatted = []
+    def _format_graph_context(self, movie_contexts: list[dict]) -> tuple[str, int]:
+        """Pack movie contexts for the LLM within the token budget."""
+        entries = []
         for ctx in movie_contexts:
             movie = self._movies.get(ctx["movie_id"])
             if movie:
-                formatted.append(f"\nMovie: {movie.title} ({movie.year})")
-                formatted.append(f"  ID: {ctx['movie_id']}")
+                fields = []
                 if ctx.get("entities"):
-                    formatted.append(f"  Entities: {', '.join(ctx['entities'][:5])}")
-                if ctx.get("relationships"):
-                    formatted.append(f"  Relationships: {', '.join(ctx['relationships'][:3])}")
-        return "\n".join(formatted)
+                    entities = list(dict.fromkeys(ctx["entities"]))
+                    fields.append(f"entities: {', '.join(entities)}")
+                fields.extend(
+                    f"rel: {fact}" for fact in dict.fromkeys(ctx.get("relationships", []))
+                )
+                entries.append((f"id: {ctx['movie_id']} | {movie.title} ({movie.year})", fields))
+        return pack_context(entries)
 
     async def health_check(self) -> bool:
         """Check if Graphiti/Neo4j is available."""
@@ -1,11 +1,20 @@
 """OpenMemory system - hierarchical memory decomposition with cognitive sectors."""
 
+import asyncio
 import json
 from openmemory import OpenMemory
-from openai import OpenAI
 
 from entertainment_graph.config import get_settings
-from entertainment_graph.models import Movie, AgentResponse, QueryResult
+from entertainment_graph.models import Movie, AgentResponse, QueryFilters, QueryResult
+from entertainment_graph.services.catalog import get_catalog
+from entertainment_graph.services.context_builder import count_prompt_tokens, pack_context
+from entertainment_graph.services.providers import get_chat_client
+from entertainment_graph.services.rate_limiter import (
+    COMPLETION_TOKEN_ALLOWANCE,
+    estimate_tokens,
+    get_rate_limiter,
+)
+from entertainment_graph.services.timing import stage
 from .base import AgenticSystem
 
 
@@ -23,19 +32,33 @@ class OpenMemorySystem(AgenticSystem):
 
     def __init__(self, db_path: str = "./openmemory.sqlite", tier: str = "fast"):
         self.settings = get_settings()
-        self.openai = OpenAI(api_key=self.settings.openai_api_key)
+        self.chat_client = get_chat_client()
+        self._chat_limiter = get_rate_limiter("chat")
+        self._embedding_limiter = get_rate_limiter("embeddings")
         self.openmemory = OpenMemory(
             mode="local",
             path=db_path,
             tier=tier,  # fast, smart, deep, or hybrid
-            embeddings={"provider": "openai", "apiKey": self.settings.openai_api_key},
+            embeddings=self._embeddings_config(),
         )
         self._movies: dict[str, Movie] = {}  # Cache for movie data
+        self._catalog = get_catalog()
 
     @property
     def name(self) -> str:
         return "OpenMemory"
 
+    @property
+    def usage_complete(self) -> bool:
+        # OpenMemory embeds with its own OpenAI client, whose token usage isn't reported back
+        return self.settings.embedding_provider == "local"
+
+    def _embeddings_config(self) -> dict:
+        """OpenMemory embeds internally; the local provider maps to its synthetic embedder."""
+        if self.settings.embedding_provider == "local":
+            return {"provider": "synthetic"}
+        return {"provider": "openai", "apiKey": self.settings.openai_api_key}
+
     async def ingest(self, movies: list[Movie]) -> int:
         """Ingest movies as multi-sector memories."""
         if not movies:
@@ -56,24 +79,35 @@ class OpenMemorySystem(AgenticSystem):
             # Use tags to track sectors
             metadata = {"movie_id": movie.id, "title": movie.title, "year": str(movie.year)}
 
-            await self.openmemory._add_async(
-                content=semantic_memory,
-                tags=["semantic"],
-                metadata=metadata,
-            )
+            # Each add is retried on 429s and 5xx like any other call. A memory id fixed per
+            # movie and sector makes that safe: if a failed attempt stored its memory
+            # anyway, the copy the retry writes collapses into it on read
+            with stage("store"):
+                await self._embedding_limiter.call(
+                    self.openmemory._add_async,
+                    content=semantic_memory,
+                    tags=["semantic"],
+                    metadata=metadata | {"memory_id": f"{movie.id}:semantic"},
+                    estimated_tokens=estimate_tokens(semantic_memory),
+                )
 
-            await self.openmemory._add_async(
-                content=emotional_memory,
-                tags=["emotional"],
-                metadata=metadata,
-            )
+                await self._embedding_limiter.call(
+                    self.openmemory._add_async,
+                    content=emotional_memory,
+                    tags=["emotional"],
+                    metadata=metadata | {"memory_id": f"{movie.id}:emotional"},
+                    estimated_tokens=estimate_tokens(emotional_memory),
+                )
 
-            await self.openmemory._add_async(
-                content=procedural_memory,
-                tags=["procedural"],
-                metadata=metadata,
-            )
+                await self._embedding_limiter.call(
+                    self.openmemory._add_async,
+                    content=procedural_memory,
+                    tags=["procedural"],
+                    metadata=metadata | {"memory_id": f"{movie.id}:procedural"},
+                    estimated_tokens=estimate_tokens(procedural_memory),
+                )
 
+        self._catalog.add(movies)
         return len(movies)
 
     def _create_semantic_memory(self, movie: Movie) -> str:
@@ -184,7 +218,9 @@ class OpenMemorySystem(AgenticSystem):
 
         return ". ".join(parts) + "." if parts else f"{movie.title} has unique procedural patterns."
 
-    async def query(self, query: str, limit: int = 5) -> AgentResponse:
+    async def query(
+        self, query: str, limit: int = 5, filters: QueryFilters | None = None
+    ) -> AgentResponse:
         """Query using multi-sector retrieval + LLM reasoning."""
         # 1. Classify query intent to determine which sectors to search
         sectors = self._classify_query_intent(query)
@@ -193,15 +229,18 @@ class OpenMemorySystem(AgenticSystem):
         # OpenMemory API: query(query, k=10, filters=None)
         # Use _query_async since we're in async context
         # Use filters to query by sector tags
-        all_results = []
-        for sector in sectors:
-            sector_results = await self.openmemory._query_async(
-                query=query,
-                k=limit * 2,  # Get more results for filtering
-                filters={"tags": [sector]},  # Filter by sector tag
-            )
-            if sector_results:
-                all_results.extend(sector_results)
+        with stage("retrieve"):
+            all_results = []
+            for sector in sectors:
+                sector_results = await self._embedding_limiter.call(
+                    self.openmemory._query_async,
+                    query=query,
+                    k=self._fetch_size(limit) * 2,  # Get more results for filtering
+                    filters={"tags": [sector]},  # Filter by sector tag
+                    estimated_tokens=estimate_tokens(query),
+                )
+                if sector_results:
+                    all_results.extend(sector_results)
 
         if not all_results:
             return AgentResponse(
@@ -212,6 +251,11 @@ class OpenMemorySystem(AgenticSystem):
 
         # 3. Extract unique movie IDs from results
         movie_contexts = self._extract_movie_contexts(all_results)
+        allowed = self._catalog.matcher(filters)
+        if allowed is not None:
+            # Filters can't be pushed into this system's search, so apply them here
+            movie_contexts = [ctx for ctx in movie_contexts if allowed(ctx["movie_id"])]
+        movie_contexts = await self._rerank(movie_contexts, limit, "movie_id", "score")
 
         if not movie_contexts:
             return AgentResponse(
@@ -221,13 +265,11 @@ class OpenMemorySystem(AgenticSystem):
             )
 
         # 4. Use LLM to reason over memories and explain results
-        context_text = self._format_memory_context(movie_contexts)
-        llm_response = self.openai.chat.completions.create(
-            model=self.settings.llm_model,
-            messages=[
-                {
-                    "role": "system",
-                    "content": """You are an entertainment recommendation assistant with access to a multi-sector memory system.
+        context_text, context_tokens = self._format_memory_context(movie_contexts)
+        messages = [
+            {
+                "role": "system",
+                "content": """You are an entertainment recommendation assistant with access to a multi-sector memory system.
 
 Given a user query and memory context from different cognitive sectors (semantic, emotional, procedural), explain why each movie matches.
 
@@ -236,20 +278,28 @@ Return a JSON object with:
 - "results": Array of objects with "id" (movie ID), "explanation" (why this movie matches, referencing specific memories)
 
 Reference the specific sectors and memory content in your explanations.""",
-                },
-                {
-                    "role": "user",
-                    "content": f"Query: {query}\n\nMemory context:\n{context_text}",
-                },
-            ],
-            response_format={"type": "json_object"},
-        )
+            },
+            {
+                "role": "user",
+                "content": f"Query: {query}\n\nMemory context:\n{context_text}",
+            },
+        ]
+        prompt_tokens = count_prompt_tokens(messages)
+        with stage("llm"):
+            llm_response = await self._chat_limiter.call(
+                self.chat_client.chat.completions.with_raw_response.create,
+                model=self.settings.llm_model,
+                messages=messages,
+                response_format={"type": "json_object"},
+                estimated_tokens=prompt_tokens + COMPLETION_TOKEN_ALLOWANCE,
+            )
 
         # 5. Parse LLM response
-        try:
-            llm_result = json.loads(llm_response.choices[0].message.content)
-        except json.JSONDecodeError:
-            llm_result = {"reasoning": "Failed to parse LLM response", "results": []}
+        with stage("parse"):
+            try:
+                llm_result = json.loads(llm_response.choices[0].message.content)
+            except json.JSONDecodeError:
+                llm_result = {"reasoning": "Failed to parse LLM response", "results": []}
 
         # 6. Build final response
         query_results = []
@@ -283,6 +333,7 @@ Reference the specific sectors and memory content in your explanations.""",
             results=query_results,
             reasoning=llm_result.get("reasoning", f"Retrieved using multi-sector search across {', '.join(sectors)}."),
             system_name=self.name,
+            metadata={"prompt_tokens": prompt_tokens, "context_tokens": context_tokens},
         )
 
     def _classify_query_intent(self, query: str) -> list[str]:
@@ -331,6 +382,7 @@ Reference the specific sectors and memory content in your explanations.""",
         OpenMemory returns memories with metadata including movie_id.
         """
         movie_contexts = {}
+        seen: set[str] = set()
 
         for result in results:
             # OpenMemory results have 'meta' field as JSON string
@@ -340,6 +392,13 @@ Reference the specific sectors and memory content in your explanations.""",
             except json.JSONDecodeError:
                 continue
 
+            # A retried add can leave a second copy of the same memory
+            memory_id = metadata.get("memory_id")
+            if memory_id in seen:
+                continue
+            if memory_id:
+                seen.add(memory_id)
+
             movie_id = metadata.get("movie_id")
 
             if not movie_id or movie_id not in self._movies:
@@ -381,25 +440,25 @@ Reference the specific sectors and memory content in your explanations.""",
 
         return sorted_contexts
 
-    def _format_memory_context(self, movie_contexts: list[dict]) -> str:
-        """Format movie contexts for LLM."""
-        formatted = []
+    def _format_memory_context(self, movie_contexts: list[dict]) -> tuple[str, int]:
+        """Pack movie contexts for the LLM within the token budget."""
+        entries = []
         for ctx in movie_contexts:
             movie = self._movies.get(ctx["movie_id"])
             if movie:
-                formatted.append(f"\nMovie: {movie.title} ({movie.year})")
-                formatted.append(f"  ID: {ctx['movie_id']}")
-                formatted.append(f"  Sectors: {', '.join(ctx['sectors'])}")
-                formatted.append(f"  Score: {ctx['score']:.3f}")
-                for i, memory in enumerate(ctx["memories"][:3], 1):  # Show top 3 memories
-                    formatted.append(f"  Memory {i}: {memory}")
-        return "\n".join(formatted)
+                header = (
+                    f"id: {ctx['movie_id']} | {movie.title} ({movie.year}) | "
+                    f"sectors: {', '.join(ctx['sectors'])} | score {ctx['score']:.3f}"
+                )
+                entries.append((header, ctx["memories"]))
+        return pack_context(entries)
 
     async def health_check(self) -> bool:
         """Check if OpenMemory is available."""
         try:
-            # Simple test query
-            self.openmemory.query(query="test", k=1)
+            # Simple test query. The blocking query() (it calls asyncio.run internally)
+            # runs on a worker thread, so the health monitor's timeout can cut it off
+            await asyncio.to_thread(self.openmemory.query, query="test", k=1)
             return True
         except Exception:
             return False
@@ -413,6 +472,6 @@ Reference the specific sectors and memory content in your explanations.""",
             mode="local",
             path=db_path,
             tier="fast",
-            embeddings={"provider": "openai", "apiKey": self.settings.openai_api_key},
+            embeddings=self._embeddings_config(),
         )
         self._movies.clear()
@@ -1,11 +1,37 @@
 """Pure Vector system - baseline using ChromaDB + OpenAI embeddings + LLM."""
 
+import asyncio
 import json
+from collections.abc import Callable
 import chromadb
-from openai import OpenAI
+import numpy as np
 
 from entertainment_graph.config import get_settings
-from entertainment_graph.models import Movie, AgentResponse, QueryResult
+from entertainment_graph.models import Movie, AgentResponse, QueryFilters, QueryResult
+from entertainment_graph.services import metrics
+from entertainment_graph.services.aspects import ASPECTS, AspectIndex, aspect_weights
+from entertainment_graph.services.bm25 import BM25Index, reciprocal_rank_fusion
+from entertainment_graph.services.catalog import get_catalog
+from entertainment_graph.services.context_builder import (
+    count_prompt_tokens,
+    movie_fields,
+    pack_context,
+)
+from entertainment_graph.services.embedding_batcher import EmbeddingBatcher
+from entertainment_graph.services.executor import get_chroma_executor
+from entertainment_graph.services.providers import get_chat_client, get_embedding_client
+from entertainment_graph.services.rate_limiter import (
+    COMPLETION_TOKEN_ALLOWANCE,
+    estimate_tokens,
+    get_rate_limiter,
+)
+from entertainment_graph.services.rerank import get_reranker
+from entertainment_graph.services.sharded_collection import ShardedCollection, hnsw_metadata
+from entertainment_graph.services.similarity_graph import get_similarity_graph
+from entertainment_graph.services.similarity_table import get_similarity_table, table_path
+from entertainment_graph.services.timing import stage
+from entertainment_graph.services.title_matcher import get_title_matcher
+from entertainment_graph.services.vector_index import get_movie_vectors, normalize
 from .base import AgenticSystem
 
 
@@ -14,30 +40,83 @@ class PureVectorSystem(AgenticSystem):
     Baseline system: embed content as vectors, retrieve by similarity, LLM explains.
 
     No memory structure, no graph, no temporal awareness.
-    This represents what most simple RAG systems do.
+    This represents what most simple RAG systems do. Optionally fuses BM25
+    keyword hits with the vector top-k (reciprocal-rank fusion) so exact
+    names like directors rank well without over-fetching, and expands hits
+    one hop through curated similar_to links. With aspect vectors on, each
+    movie also gets one embedding per aspect (themes, mood, visual, narrative,
+    plot) and candidates are re-ranked by query-weighted aspect similarity.
     """
 
     def __init__(self):
         self.settings = get_settings()
-        self.openai = OpenAI(api_key=self.settings.openai_api_key)
+        self.chat_client = get_chat_client()
+        self.embedding_client = get_embedding_client()
+        self._chat_limiter = get_rate_limiter("chat")
+        self._embedding_limiter = get_rate_limiter("embeddings")
+        self._chroma_pool = get_chroma_executor()
         self.chroma = chromadb.PersistentClient(path=self.settings.chroma_dir)
-        self.collection = self.chroma.get_or_create_collection(
-            name="movies",
-            metadata={"hnsw:space": "cosine"},
+        # Hashed across VECTOR_SHARDS collections, searched concurrently
+        self.collection = ShardedCollection(
+            self.chroma,
+            "movies",
+            self.settings.vector_shards,
+            self._chroma_pool,
+            metadata=hnsw_metadata(
+                self.settings.hnsw_m,
+                self.settings.hnsw_construction_ef,
+                self.settings.hnsw_search_ef,
+            ),
         )
+        if self.settings.aspect_vectors:
+            self.aspect_collection = ShardedCollection(
+                self.chroma,
+                "movie_aspects",
+                self.settings.vector_shards,
+                self._chroma_pool,
+                metadata=hnsw_metadata(
+                    self.settings.aspect_hnsw_m,
+                    self.settings.aspect_hnsw_construction_ef,
+                    self.settings.aspect_hnsw_search_ef,
+                ),
+            )
         self._movies: dict[str, Movie] = {}  # Cache for movie data
+        self._catalog = get_catalog()
+        self._keyword_index = BM25Index()  # Fused with vector hits when hybrid search is on
+        self._embedder = EmbeddingBatcher(
+            self._embed_batch,
+            window_ms=self.settings.embedding_batch_window_ms,
+            max_batch_size=self.settings.embedding_batch_max_size,
+        )
+        # Stored embeddings, mirrored from Chroma for the similar-movies table and rerankers
+        self._vectors = get_movie_vectors()
+        self._aspects = AspectIndex(dtype=self.settings.vector_dtype)
+        self._vectors_loaded = False
+        # Held while the stored vectors change or the similar-movies table reads them
+        self._index_lock = asyncio.Lock()
+        self._similar = get_similarity_table()
+        self._similar_dirty = False  # Table changed since it was last saved
 
     @property
     def name(self) -> str:
         return "Pure Vector"
 
-    def _get_embedding(self, text: str) -> list[float]:
-        """Get embedding from OpenAI."""
-        response = self.openai.embeddings.create(
+    async def _embed_batch(self, texts: list[str]) -> list[list[float]]:
+        """Get embeddings for a batch of texts from OpenAI."""
+        # text-embedding-3 models can return shortened vectors natively
+        dimensions = self.settings.embedding_dimensions
+        response = await self._embedding_limiter.call(
+            self.embedding_client.embeddings.with_raw_response.create,
             model=self.settings.embedding_model,
-            input=text,
+            input=texts,
+            estimated_tokens=estimate_tokens(*texts),
+            **({"dimensions": dimensions} if dimensions else {}),
         )
-        return response.data[0].embedding
+        return [item.embedding for item in sorted(response.data, key=lambda d: d.index)]
+
+    async def _get_embedding(self, text: str) -> list[float]:
+        """Get embedding, micro-batched with concurrent callers."""
+        return await self._embedder.embed(text)
 
     async def ingest(self, movies: list[Movie]) -> int:
         """Ingest movies into ChromaDB."""
@@ -46,71 +125,457 @@ class PureVectorSystem(AgenticSystem):
 
         ids = []
         documents = []
-        embeddings = []
         metadatas = []
 
         for movie in movies:
             text = movie.to_text()
             ids.append(movie.id)
             documents.append(text)
-            embeddings.append(self._get_embedding(text))
-            metadatas.append({
-                "title": movie.title,
-                "year": movie.year,
-                "genres": json.dumps(movie.genres),
-                "director": json.dumps(movie.director),
-            })
+            metadatas.append(self._metadata(movie))
             self._movies[movie.id] = movie
+            self._keyword_index.add(movie.id, text)
+        self._catalog.add(movies)
 
-        self.collection.upsert(
-            ids=ids,
-            documents=documents,
-            embeddings=embeddings,
-            metadatas=metadatas,
-        )
+        with stage("embed"):
+            embeddings = await self._embedder.embed_many(documents)
+        with stage("store"):
+            await self._load_vectors()
+            await self.collection.upsert(
+                ids=ids,
+                documents=documents,
+                embeddings=embeddings,
+                metadatas=metadatas,
+            )
+
+        with stage("index"):
+            async with self._index_lock:
+                changed = [movie_id for movie_id in ids if movie_id in self._vectors]
+                self._vectors.add(ids, embeddings)
+                await self._refresh_similar(changed)
+
+        if self.settings.aspect_vectors:
+            await self._ingest_aspects(movies)
 
         return len(movies)
 
-    async def query(self, query: str, limit: int = 5) -> AgentResponse:
+    async def _ingest_aspects(self, movies: list[Movie]) -> None:
+        """Embed and store one vector per described aspect of each movie."""
+        items = [
+            (movie.id, aspect, text)
+            for movie in movies
+            for aspect, text in movie.aspect_texts().items()
+        ]
+        if not items:
+            return
+
+        with stage("embed"):
+            embeddings = await self._embedder.embed_many([text for _, _, text in items])
+        with stage("store"):
+            await self.aspect_collection.upsert(
+                ids=[f"{movie_id}#{aspect}" for movie_id, aspect, _ in items],
+                documents=[text for _, _, text in items],
+                embeddings=embeddings,
+                metadatas=[
+                    {"movie_id": movie_id, "aspect": aspect} for movie_id, aspect, _ in items
+                ],
+            )
+        with stage("index"):
+            self._add_aspect_vectors(
+                [(movie_id, aspect) for movie_id, aspect, _ in items], embeddings
+            )
+
+    def _add_aspect_vectors(self, keys: list[tuple[str, str]], embeddings) -> None:
+        for aspect in ASPECTS:
+            rows = [i for i, (_, key_aspect) in enumerate(keys) if key_aspect == aspect]
+            if rows:
+                self._aspects.add(aspect, [keys[i][0] for i in rows], [embeddings[i] for i in rows])
+
+    async def _load_vectors(self) -> None:
+        """Mirror the embeddings already stored in Chroma, once per process."""
+        if self._vectors_loaded:
+            return
+        async with self._index_lock:
+            if self._vectors_loaded:
+                return
+            stored = await self.collection.get(include=["embeddings"])
+            self._vectors.add(stored["ids"], stored["embeddings"])
+            if self.settings.aspect_vectors:
+                stored = await self.aspect_collection.get(include=["embeddings", "metadatas"])
+                keys = [(m["movie_id"], m["aspect"]) for m in stored["metadatas"]]
+                self._add_aspect_vectors(keys, stored["embeddings"])
+            self._vectors_loaded = True
+
+    async def _refresh_similar(self, changed: list[str]) -> None:
+        """
+        Update the similar-movies table for vectors just added, or replaced for
+        `changed` ids. Call with the index lock held; `finish_ingest` saves it.
+        """
+        ids, movies = list(self._vectors.ids), dict(self._catalog.movies)
+
+        def refresh() -> None:
+            # The lock keeps the vectors still while the worker copies them
+            self._similar.extend(
+                ids,
+                self._vectors.matrix.copy(),
+                movies,
+                changed,
+                self.settings.similarity_block_size,
+            )
+
+        await asyncio.to_thread(refresh)
+        self._similar_dirty = True
+
+    async def finish_ingest(self) -> None:
+        """Save the similar-movies table once per ingest run, not per batch."""
+        if self._similar_dirty:
+            self._similar_dirty = False
+            await asyncio.to_thread(self._similar.save, table_path())
+
+    @staticmethod
+    def _metadata(movie: Movie) -> dict:
+        """
+        Chroma metadata in a filterable shape.
+
+        Chroma metadata values must be scalars, so list fields are stored as one
+        boolean flag per value (e.g. "genre:drama": True) alongside the original
+        JSON-encoded lists. Every facet term gets a flag too, so facet queries
+        are evaluated by Chroma (movies ingested before flags existed need
+        re-ingesting to match them).
+        """
+        metadata = {
+            "movie_id": movie.id,
+            "title": movie.title,
+            "year": movie.year,
+            "genres": json.dumps(movie.genres),
+            "director": json.dumps(movie.director),
+        }
+        if movie.runtime_minutes is not None:
+            metadata["runtime_minutes"] = movie.runtime_minutes
+        if movie.mood:
+            metadata["mood_intensity"] = movie.mood.intensity
+        for genre in movie.genres:
+            metadata[f"genre:{genre.lower()}"] = True
+        for director in movie.director:
+            metadata[f"director:{director.lower()}"] = True
+        for term in movie.facet_terms():
+            metadata[term] = True
+        return metadata
+
+    @staticmethod
+    def _where(filters: QueryFilters | None) -> dict | None:
+        """
+        Translate filters into a Chroma `where` clause evaluated during search.
+
+        Facet terms map to their metadata flags; a movie without a term has no
+        flag, which Chroma's $ne treats as a match, as none_of needs.
+        """
+        if filters is None or filters.is_empty():
+            return None
+
+        clauses = []
+        if filters.year_min is not None:
+            clauses.append({"year": {"$gte": filters.year_min}})
+        if filters.year_max is not None:
+            clauses.append({"year": {"$lte": filters.year_max}})
+        if filters.runtime_min is not None:
+            clauses.append({"runtime_minutes": {"$gte": filters.runtime_min}})
+        if filters.runtime_max is not None:
+            clauses.append({"runtime_minutes": {"$lte": filters.runtime_max}})
+        if filters.mood_intensity:
+            clauses.append({"mood_intensity": {"$in": list(filters.mood_intensity)}})
+        for prefix, values in (("genre", filters.genres), ("director", filters.directors)):
+            if values:
+                options = [{f"{prefix}:{value.lower()}": True} for value in values]
+                clauses.append(options[0] if len(options) == 1 else {"$or": options})
+        if filters.facets is not None:
+            clauses += [{term.lower(): True} for term in filters.facets.all_of]
+            if filters.facets.any_of:
+                options = [{term.lower(): True} for term in filters.facets.any_of]
+                clauses.append(options[0] if len(options) == 1 else {"$or": options})
+            clauses += [{term.lower(): {"$ne": True}} for term in filters.facets.none_of]
+
+        return clauses[0] if len(clauses) == 1 else {"$and": clauses}
+
+    async def query(
+        self, query: str, limit: int = 5, filters: QueryFilters | None = None
+    ) -> AgentResponse:
         """Query with vector similarity, then LLM explains results."""
-        # 1. Embed query and find similar movies
-        query_embedding = self._get_embedding(query)
-        results = self.collection.query(
-            query_embeddings=[query_embedding],
-            n_results=limit,
-            include=["documents", "metadatas", "distances"],
+        # 1. Embed query (or anchor on a mentioned title) and find similar movies
+        with stage("embed"):
+            [(mentioned, anchor)] = await self._anchors([query])
+            query_embedding = anchor or await self._get_embedding(query)
+        with stage("retrieve"):
+            [retrieved_movies] = await self._search(
+                [query], [query_embedding], limit, filters, exclude=[set(mentioned)]
+            )
+
+        # 2. Build context, then have the LLM explain it
+        return await self._explain(query, retrieved_movies, mentioned)
+
+    async def query_batch(
+        self,
+        queries: list[str],
+        limit: int = 5,
+        concurrency: int = 4,
+        filters: QueryFilters | None = None,
+    ) -> list[AgentResponse]:
+        """Embed all queries in one call, search once, explain with bounded concurrency."""
+        if not queries:
+            return []
+
+        with stage("embed"):
+            anchors = await self._anchors(queries)
+            to_embed = [query for query, (_, anchor) in zip(queries, anchors) if anchor is None]
+            embedded = iter(await self._embedder.embed_many(to_embed) if to_embed else [])
+            query_embeddings = [anchor or next(embedded) for _, anchor in anchors]
+        with stage("retrieve"):
+            retrieved = await self._search(
+                queries, query_embeddings, limit, filters,
+                exclude=[set(mentioned) for mentioned, _ in anchors],
+            )
+
+        semaphore = asyncio.Semaphore(max(1, concurrency))
+
+        async def explain(i: int) -> AgentResponse:
+            async with semaphore:
+                return await self._explain(queries[i], retrieved[i], anchors[i][0])
+
+        return await asyncio.gather(*(explain(i) for i in range(len(queries))))
+
+    async def _anchors(self, queries: list[str]) -> list[tuple[list[str], list[float] | None]]:
+        """
+        Titles mentioned in each query, and an anchor vector to search with.
+
+        A query naming catalog movies ("something like Severance") searches from
+        the mean of their stored embeddings instead of embedding the sentence.
+        """
+        matcher = get_title_matcher()
+        mentions = [matcher.find(query) for query in queries]
+        if any(mentions):
+            await self._load_vectors()
+
+        anchors = []
+        for mentioned in mentions:
+            stored = [movie_id for movie_id in mentioned if movie_id in self._vectors]
+            anchor = self._vectors.get(stored).mean(axis=0).tolist() if stored else None
+            metrics.cache_lookup("query_anchor", anchor is not None)
+            anchors.append((mentioned, anchor))
+        return anchors
+
+    async def _search(
+        self,
+        queries: list[str],
+        query_embeddings: list[list[float]],
+        limit: int,
+        filters: QueryFilters | None = None,
+        exclude: list[set[str]] | None = None,
+    ) -> list[list[dict]]:
+        """
+        Retrieve candidates for each query: vector top-k, fused with keyword hits.
+
+        Ids in `exclude[i]` (movies the query itself names) are dropped from
+        query i's results; the search over-fetches to make up for them, and
+        for the reranker when one is configured.
+        """
+        allowed = self._catalog.matcher(filters)
+        exclude = exclude or [set() for _ in queries]
+        fetch = self._fetch_size(limit) + max(len(excluded) for excluded in exclude)
+        aspects = self.settings.aspect_vectors
+        if aspects or self.settings.graph_expansion or get_reranker() is not None:
+            await self._load_vectors()  # Aspect fusion, expansion and reranking read them
+
+        results = await self.collection.query(
+            query_embeddings=query_embeddings,
+            n_results=fetch * self.settings.aspect_candidate_factor if aspects else fetch,
+            where=self._where(filters),
+        )
+        retrieved = [self._retrieved_movies(results, i) for i in range(len(queries))]
+
+        if aspects:
+            retrieved = [
+                self._fuse_aspects(query, embedding, hits, fetch)
+                for query, embedding, hits in zip(queries, query_embeddings, retrieved)
+            ]
+
+        if self.settings.hybrid_search:
+            retrieved = [
+                await self._fuse_keyword_hits(query, embedding, hits, fetch, allowed)
+                for query, embedding, hits in zip(queries, query_embeddings, retrieved)
+            ]
+        if self.settings.graph_expansion:
+            retrieved = [
+                self._expand_hits(embedding, hits, fetch, allowed)
+                for embedding, hits in zip(query_embeddings, retrieved)
+            ]
+        reranked = []
+        for hits, excluded in zip(retrieved, exclude):
+            hits = [hit for hit in hits if hit["id"] not in excluded]
+            reranked.append((await self._rerank(hits, limit, "id", "similarity"))[:limit])
+        return reranked
+
+    def _retrieved_movies(self, results: dict, row: int) -> list[dict]:
+        """Turn one row of a Chroma query result into LLM context entries."""
+        if not results["ids"] or row >= len(results["ids"]):
+            return []
+
+        retrieved_movies = []
+        for i, movie_id in enumerate(results["ids"][row]):
+            if movie_id in self._movies:
+                distance = results["distances"][row][i] if results["distances"] else 0
+                similarity = 1 - distance  # cosine distance to similarity
+                retrieved_movies.append(self._movie_entry(movie_id, similarity, "vector"))
+        return retrieved_movies
+
+    def _fuse_aspects(
+        self, query: str, query_embedding: list[float], hits: list[dict], limit: int
+    ) -> list[dict]:
+        """Re-rank vector hits by whole-document plus query-weighted per-aspect similarity."""
+        if not hits:
+            return hits
+        query_vector = normalize(np.asarray(query_embedding, dtype=np.float32))
+        similarity = np.array([hit["similarity"] for hit in hits], dtype=np.float32)
+        fused = self._aspects.fuse(
+            [hit["id"] for hit in hits], query_vector, similarity, aspect_weights(query)
+        )
+        order = np.argsort(-fused, kind="stable")[:limit]
+        return [{**hits[i], "similarity": round(float(fused[i]), 3)} for i in order]
+
+    def _movie_entry(self, movie_id: str, similarity: float, source: str) -> dict:
+        movie = self._movies[movie_id]
+        return {
+            "id": movie_id,
+            "title": movie.title,
+            "year": movie.year,
+            "similarity": round(similarity, 3),
+            "sources": [source],
+        }
+
+    async def _fuse_keyword_hits(
+        self,
+        query: str,
+        query_embedding: list[float],
+        vector_hits: list[dict],
+        limit: int,
+        allowed: Callable[[str], bool] | None = None,
+    ) -> list[dict]:
+        """Reciprocal-rank fuse BM25 hits (those `allowed` accepts) into the vector top-k."""
+        keyword_hits = self._keyword_index.search(query, limit, allowed)
+        if not keyword_hits:
+            return vector_hits
+
+        fused = reciprocal_rank_fusion(
+            [[hit["id"] for hit in vector_hits], [doc_id for doc_id, _ in keyword_hits]],
+            k=self.settings.rrf_k,
+        )[:limit]
+
+        by_id = {hit["id"]: hit for hit in vector_hits}
+        keyword_ids = {doc_id for doc_id, _ in keyword_hits}
+
+        # Keyword-only hits still need a similarity score for ranking and display
+        missing = [doc_id for doc_id, _ in fused if doc_id not in by_id and doc_id in self._movies]
+        if missing:
+            stored = await self.collection.get(ids=missing, include=["embeddings"])
+            vectors = np.asarray(stored["embeddings"], dtype=np.float32)
+            query_vector = np.asarray(query_embedding, dtype=np.float32)
+            similarities = vectors @ query_vector / (
+                np.linalg.norm(vectors, axis=1) * np.linalg.norm(query_vector) + 1e-12
+            )
+            for doc_id, similarity in zip(stored["ids"], similarities):
+                by_id[doc_id] = self._movie_entry(doc_id, float(similarity), "keyword")
+
+        hits = []
+        for doc_id, _ in fused:
+            hit = by_id.get(doc_id)
+            if hit is None:
+                continue
+            if doc_id in keyword_ids and "keyword" not in hit["sources"]:
+                hit["sources"].append("keyword")
+            hits.append(hit)
+        return hits
+
+    def _expand_hits(
+        self,
+        query_embedding: list[float],
+        hits: list[dict],
+        limit: int,
+        allowed: Callable[[str], bool] | None = None,
+    ) -> list[dict]:
+        """
+        Add curated similar_to neighbours of the hits, then re-rank everything.
+
+        Candidates score (1 - w) * cosine + w * propagated, where w is
+        `graph_expansion_weight` and propagated is the best of a hit's own
+        cosine and (edge weight * cosine) over the hits linking to it. Expanded
+        entries record which hit they came from.
+        """
+        if not hits:
+            return hits
+        graph = get_similarity_graph()
+        hit_ids = {hit["id"] for hit in hits}
+
+        # Relevance each candidate inherits over curated edges, and the hit it came from
+        links: dict[str, tuple[float, str]] = {}
+        for hit in hits:
+            for neighbor_id, weight in graph.neighbors(hit["id"]):
+                propagated = weight * hit["similarity"]
+                if propagated > links.get(neighbor_id, (0.0, ""))[0]:
+                    links[neighbor_id] = (propagated, hit["id"])
+
+        expanded = [
+            movie_id
+            for movie_id in links
+            if movie_id not in hit_ids
+            and movie_id in self._movies
+            and movie_id in self._vectors
+            and (allowed is None or allowed(movie_id))
+        ]
+        if not expanded:
+            return hits
+
+        # One pass: cosine for the expanded candidates, then blend in propagated relevance
+        query_vector = normalize(np.asarray(query_embedding, dtype=np.float32))
+        expanded_similarity = self._vectors.get(expanded) @ query_vector
+        candidates = hits + [
+            {
+                **self._movie_entry(movie_id, float(similarity), "expansion"),
+                "expanded_from": links[movie_id][1],
+            }
+            for movie_id, similarity in zip(expanded, expanded_similarity)
+        ]
+        similarity = np.array([c["similarity"] for c in candidates], dtype=np.float32)
+        propagated = np.array(
+            [links.get(c["id"], (0.0, ""))[0] for c in candidates], dtype=np.float32
         )
+        propagated[: len(hits)] = np.maximum(propagated[: len(hits)], similarity[: len(hits)])
+        weight = self.settings.graph_expansion_weight
+        score = (1 - weight) * similarity + weight * propagated
 
-        if not results["ids"] or not results["ids"][0]:
+        order = np.argsort(-score, kind="stable")[:limit]
+        return [candidates[i] for i in order]
+
+    async def _explain(
+        self, query: str, retrieved_movies: list[dict], mentioned: list[str] | None = None
+    ) -> AgentResponse:
+        """Have the LLM explain retrieved movies and build the final response."""
+        if not retrieved_movies:
             return AgentResponse(
                 results=[],
                 reasoning="No movies found in the database.",
                 system_name=self.name,
             )
 
-        # 2. Build context for LLM
-        retrieved_movies = []
-        for i, movie_id in enumerate(results["ids"][0]):
-            movie = self._movies.get(movie_id)
-            if movie:
-                distance = results["distances"][0][i] if results["distances"] else 0
-                similarity = 1 - distance  # cosine distance to similarity
-                retrieved_movies.append({
-                    "id": movie_id,
-                    "title": movie.title,
-                    "year": movie.year,
-                    "text": results["documents"][0][i],
-                    "similarity": round(similarity, 3),
-                })
-
         # 3. LLM generates explanations
-        context = json.dumps(retrieved_movies, indent=2)
-        llm_response = self.openai.chat.completions.create(
-            model=self.settings.llm_model,
-            messages=[
-                {
-                    "role": "system",
-                    "content": """You are an entertainment recommendation assistant.
+        context, context_tokens = pack_context([
+            (
+                f"id: {m['id']} | {m['title']} ({m['year']}) | sim {m['similarity']}",
+                movie_fields(self._movies[m["id"]]),
+            )
+            for m in retrieved_movies
+        ])
+        messages = [
+            {
+                "role": "system",
+                "content": """You are an entertainment recommendation assistant.
 Given a user query and retrieved movies with their descriptions, explain why each movie matches the query.
 
 Return a JSON object with:
@@ -118,20 +583,28 @@ Return a JSON object with:
 - "results": Array of objects with "id", "explanation" (why this movie matches)
 
 Be specific about what aspects of each movie connect to the query. Focus on themes, mood, style, or other semantic connections.""",
-                },
-                {
-                    "role": "user",
-                    "content": f"Query: {query}\n\nRetrieved movies:\n{context}",
-                },
-            ],
-            response_format={"type": "json_object"},
-        )
+            },
+            {
+                "role": "user",
+                "content": f"Query: {query}\n\nRetrieved movies:\n{context}",
+            },
+        ]
+        prompt_tokens = count_prompt_tokens(messages)
+        with stage("llm"):
+            llm_response = await self._chat_limiter.call(
+                self.chat_client.chat.completions.with_raw_response.create,
+                model=self.settings.llm_model,
+                messages=messages,
+                response_format={"type": "json_object"},
+                estimated_tokens=prompt_tokens + COMPLETION_TOKEN_ALLOWANCE,
+            )
 
         # 4. Parse LLM response
-        try:
-            llm_result = json.loads(llm_response.choices[0].message.content)
-        except json.JSONDecodeError:
-            llm_result = {"reasoning": "Failed to parse LLM response", "results": []}
+        with stage("parse"):
+            try:
+                llm_result = json.loads(llm_response.choices[0].message.content)
+            except json.JSONDecodeError:
+                llm_result = {"reasoning": "Failed to parse LLM response", "results": []}
 
         # 5. Build final response
         query_results = []
@@ -152,7 +625,15 @@ Be specific about what aspects of each movie connect to the query. Focus on them
                         year=movie.year,
                         score=movie_data["similarity"],
                         explanation=explanation,
-                        retrieval_context={"similarity": movie_data["similarity"]},
+                        retrieval_context={
+                            "similarity": movie_data["similarity"],
+                            "sources": movie_data["sources"],
+                            **(
+                                {"expanded_from": movie_data["expanded_from"]}
+                                if "expanded_from" in movie_data
+                                else {}
+                            ),
+                        },
                     )
                 )
 
@@ -160,24 +641,48 @@ Be specific about what aspects of each movie connect to the query. Focus on them
             results=query_results,
             reasoning=llm_result.get("reasoning", "Retrieved by vector similarity."),
             system_name=self.name,
+            metadata={
+                "prompt_tokens": prompt_tokens,
+                "context_tokens": context_tokens,
+                **({"mentioned_titles": mentioned} if mentioned else {}),
+            },
         )
 
+    async def rebuild_shard(self, shard: int) -> int:
+        """Rebuild one vector shard's index; searches keep being served meanwhile."""
+        if not 0 <= shard < len(self.collection):
+            raise ValueError(f"Shard {shard} out of range (0-{len(self.collection) - 1})")
+        return await self.collection.rebuild(shard)
+
     async def health_check(self) -> bool:
-        """Check if ChromaDB and OpenAI are available."""
+        """Check if ChromaDB and OpenAI are available, without a billed API call."""
         try:
             # Check ChromaDB
-            self.collection.count()
-            # Check OpenAI
-            self._get_embedding("test")
+            await self.collection.count()
+            # Check OpenAI: looking up the model is free, unlike embedding a probe text
+            if self.settings.embedding_provider != "local":
+                await asyncio.to_thread(
+                    self.embedding_client.models.retrieve, self.settings.embedding_model
+                )
             return True
         except Exception:
             return False
 
+    def ready(self) -> bool:
+        """Ready unless ChromaDB calls are already backed up past the executor's queue."""
+        return not get_chroma_executor().saturated
+
     async def clear(self) -> None:
         """Clear all data."""
-        self.chroma.delete_collection("movies")
-        self.collection = self.chroma.get_or_create_collection(
-            name="movies",
-            metadata={"hnsw:space": "cosine"},
-        )
+        await self.collection.clear()
+        if self.settings.aspect_vectors:
+            await self.aspect_collection.clear()
         self._movies.clear()
+        self._keyword_index.clear()
+        async with self._index_lock:
+            self._vectors.clear()
+            self._aspects.clear()
+            self._vectors_loaded = True
+            self._similar.clear()
+            self._similar_dirty = False
+        table_path().unlink(missing_ok=True)
@@ -0,0 +1,71 @@
+"""BM25 keyword index and reciprocal-rank fusion."""
+
+import pytest
+
+from entertainment_graph.services.bm25 import BM25Index, reciprocal_rank_fusion, tokenize
+
+DOCS = {
+    "dune": "Dune directed by Denis Villeneuve, desert planet epic",
+    "arrival": "Arrival directed by Denis Villeneuve, linguist meets aliens",
+    "her": "Her directed by Spike Jonze, a man falls for an operating system",
+    "heat": "Heat directed by Michael Mann, a heist thriller in Los Angeles",
+}
+
+
+@pytest.fixture
+def index() -> BM25Index:
+    index = BM25Index()
+    for doc_id, text in DOCS.items():
+        index.add(doc_id, text)
+    return index
+
+
+def test_tokenize_drops_stopwords():
+    assert tokenize("Movies like the Denis Villeneuve films") == ["denis", "villeneuve"]
+
+
+def test_matching_documents_rank_first(index):
+    ranked = [doc_id for doc_id, _ in index.search("Denis Villeneuve", k=4)]
+    assert set(ranked) == {"dune", "arrival"}
+
+
+def test_rarer_terms_score_higher(index):
+    [(best, _), *_] = index.search("villeneuve desert", k=4)
+    assert best == "dune"
+
+
+def test_k_limits_results(index):
+    assert len(index.search("directed", k=2)) == 2
+
+
+def test_unknown_terms_and_empty_index_return_nothing(index):
+    assert index.search("zzz", k=5) == []
+    assert BM25Index().search("dune", k=5) == []
+
+
+def test_re_adding_replaces_the_document(index):
+    index.add("heat", "Heat, a desert survival story")
+    assert "heat" not in [doc_id for doc_id, _ in index.search("heist", k=4)]
+    assert "heat" in [doc_id for doc_id, _ in index.search("desert", k=4)]
+    assert len(index) == 4
+
+
+def test_remove(index):
+    index.remove("her")
+    assert index.search("jonze", k=4) == []
+    assert len(index) == 3
+
+
+def test_reciprocal_rank_fusion():
+    fused = reciprocal_rank_fusion([["a", "b", "c"], ["b", "a", "d"]], k=60)
+
+    scores = dict(fused)
+    assert [doc_id for doc_id, _ in fused][:2] in (["a", "b"], ["b", "a"])
+    assert scores["a"] == pytest.approx(1 / 61 + 1 / 62)
+    assert scores["d"] == pytest.approx(1 / 63)
+    assert scores["a"] > scores["c"] > 0
+
+
+def test_fusion_rewards_agreement():
+    fused = reciprocal_rank_fusion([["x", "shared"], ["y", "shared"]], k=60)
+    assert fused[0][0] == "shared"
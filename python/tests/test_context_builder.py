@@ -0,0 +1,52 @@
+"""Token-budgeted context packing."""
+
+from entertainment_graph.services.context_builder import count_tokens, pack_context
+
+
+def cost(text: str) -> int:
+    return count_tokens(text) + 1  # Each header or field also costs its separator
+
+
+ENTRIES = [
+    ("id: a | Arrival (2016)", ["themes: language, grief", "mood: contemplative"]),
+    ("id: b | Her (2013)", ["themes: loneliness, love", "mood: melancholic"]),
+    ("id: c | Solaris (1972)", ["themes: memory, grief", "mood: haunting"]),
+]
+
+
+def test_everything_fits_in_a_large_budget():
+    text, tokens = pack_context(ENTRIES, budget=10_000)
+
+    lines = text.split("\n")
+    assert lines == [" | ".join([header, *fields]) for header, fields in ENTRIES]
+    assert tokens == count_tokens(text)
+
+
+def test_fields_are_added_breadth_first():
+    headers = sum(cost(header) for header, _ in ENTRIES)
+    first_fields = sum(cost(fields[0]) for _, fields in ENTRIES)
+
+    text, _ = pack_context(ENTRIES, budget=headers + first_fields)
+
+    assert text.split("\n") == [f"{header} | {fields[0]}" for header, fields in ENTRIES]
+
+
+def test_headers_stop_at_the_budget():
+    budget = cost(ENTRIES[0][0]) + cost(ENTRIES[1][0])
+
+    text, _ = pack_context(ENTRIES, budget=budget)
+
+    assert text.split("\n") == [ENTRIES[0][0], ENTRIES[1][0]]
+
+
+def test_a_field_too_large_for_the_budget_is_skipped():
+    entries = [("id: a | Arrival (2016)", ["plot: " + "word " * 500, "mood: contemplative"])]
+    budget = cost(entries[0][0]) + cost("mood: contemplative")
+
+    text, _ = pack_context(entries, budget=budget)
+
+    assert text == "id: a | Arrival (2016) | mood: contemplative"
+
+
+def test_empty_entries():
+    assert pack_context([], budget=100) == ("", count_tokens(""))
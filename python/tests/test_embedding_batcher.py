@@ -0,0 +1,104 @@
+"""EmbeddingBatcher micro-batching."""
+
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from entertainment_graph.services import usage
+from entertainment_graph.services.embedding_batcher import EmbeddingBatcher
+
+
+class FakeEmbedder:
+    """Records each batch and embeds a text as [len(text)]."""
+
+    def __init__(self, error: Exception | None = None):
+        self.batches: list[list[str]] = []
+        self.error = error
+
+    async def __call__(self, texts: list[str]) -> list[list[float]]:
+        self.batches.append(list(texts))
+        if self.error is not None:
+            raise self.error
+        return [[float(len(text))] for text in texts]
+
+
+async def test_concurrent_requests_share_one_call():
+    embedder = FakeEmbedder()
+    batcher = EmbeddingBatcher(embedder, window_ms=20, max_batch_size=64)
+
+    vectors = await asyncio.gather(*(batcher.embed("x" * n) for n in range(1, 6)))
+
+    assert vectors == [[1.0], [2.0], [3.0], [4.0], [5.0]]
+    assert len(embedder.batches) == 1
+
+
+async def test_identical_texts_are_embedded_once():
+    embedder = FakeEmbedder()
+    batcher = EmbeddingBatcher(embedder, window_ms=20)
+
+    vectors = await asyncio.gather(batcher.embed("same"), batcher.embed("same"))
+
+    assert vectors == [[4.0], [4.0]]
+    assert embedder.batches == [["same"]]
+
+
+async def test_full_batch_is_sent_without_waiting_for_the_window():
+    embedder = FakeEmbedder()
+    batcher = EmbeddingBatcher(embedder, window_ms=10_000, max_batch_size=3)
+
+    vectors = await asyncio.wait_for(
+        asyncio.gather(*(batcher.embed(text) for text in ("a", "bb", "ccc"))), timeout=1
+    )
+
+    assert vectors == [[1.0], [2.0], [3.0]]
+    assert embedder.batches == [["a", "bb", "ccc"]]
+
+
+async def test_failure_reaches_every_caller():
+    embedder = FakeEmbedder(error=RuntimeError("rate limited"))
+    batcher = EmbeddingBatcher(embedder, window_ms=5)
+
+    results = await asyncio.gather(
+        batcher.embed("a"), batcher.embed("b"), return_exceptions=True
+    )
+
+    assert all(isinstance(result, RuntimeError) for result in results)
+
+
+async def test_embed_many_chunks_by_max_batch_size():
+    embedder = FakeEmbedder()
+    batcher = EmbeddingBatcher(embedder, max_batch_size=2)
+
+    vectors = await batcher.embed_many(["a", "bb", "ccc", "dddd", "eeeee"])
+
+    assert vectors == [[1.0], [2.0], [3.0], [4.0], [5.0]]
+    assert sorted(len(batch) for batch in embedder.batches) == [1, 2, 2]
+
+
+@pytest.mark.parametrize("window_ms", [0, 5])
+async def test_sequential_calls_each_get_their_own_batch(window_ms):
+    embedder = FakeEmbedder()
+    batcher = EmbeddingBatcher(embedder, window_ms=window_ms)
+
+    assert await batcher.embed("a") == [1.0]
+    assert await batcher.embed("bb") == [2.0]
+    assert embedder.batches == [["a"], ["bb"]]
+
+
+async def test_usage_shares_add_up_to_the_batch_total():
+    async def embed(texts: list[str]) -> list[list[float]]:
+        usage.record("embeddings", SimpleNamespace(prompt_tokens=10))
+        return [[0.0] for _ in texts]
+
+    batcher = EmbeddingBatcher(embed, window_ms=20)
+
+    async def spend(text: str) -> int:
+        with usage.collect_usage() as spent:
+            await batcher.embed(text)
+        return spent.get("embedding_tokens", 0)
+
+    shares = await asyncio.gather(*(spend(text) for text in ("a", "b", "c")))
+
+    assert sum(shares) == 10
+    assert shares == [3, 3, 4]
@@ -0,0 +1,112 @@
+"""Facet bitmap index and catalog filtering."""
+
+import pytest
+
+from entertainment_graph.models import FacetQuery, Movie, QueryFilters
+from entertainment_graph.models.movie import Mood
+from entertainment_graph.services.catalog import Catalog
+from entertainment_graph.services.facets import FacetIndex
+
+
+def movie(movie_id: str, genres: list[str], mood: str, year: int = 2000) -> Movie:
+    return Movie(
+        id=movie_id,
+        title=movie_id.title(),
+        year=year,
+        genres=genres,
+        mood=Mood(primary=[mood], intensity="moderate"),
+    )
+
+
+MOVIES = [
+    movie("alien", ["Horror", "Sci-Fi"], "tense", 1979),
+    movie("arrival", ["Drama", "Sci-Fi"], "contemplative", 2016),
+    movie("heat", ["Crime", "Drama"], "tense", 1995),
+    movie("her", ["Drama", "Romance"], "melancholic", 2013),
+]
+
+
+@pytest.fixture
+def index() -> FacetIndex:
+    index = FacetIndex()
+    for m in MOVIES:
+        index.add(m)
+    return index
+
+
+def matching(index: FacetIndex, **query) -> set[str]:
+    return set(index.ids(index.evaluate(FacetQuery(**query))))
+
+
+def test_all_of(index):
+    assert matching(index, all_of=["genre:drama", "mood:tense"]) == {"heat"}
+
+
+def test_any_of(index):
+    assert matching(index, any_of=["genre:horror", "genre:romance"]) == {"alien", "her"}
+
+
+def test_none_of(index):
+    assert matching(index, none_of=["genre:sci-fi"]) == {"heat", "her"}
+
+
+def test_combined_expression(index):
+    query = {"any_of": ["mood:tense", "mood:contemplative"], "none_of": ["genre:horror"]}
+    assert matching(index, **query) == {"arrival", "heat"}
+
+
+def test_terms_are_case_insensitive(index):
+    assert matching(index, all_of=["Genre:Crime"]) == {"heat"}
+
+
+def test_unknown_term_matches_nothing(index):
+    assert matching(index, all_of=["genre:western"]) == set()
+
+
+def test_re_adding_replaces_terms(index):
+    index.add(movie("heat", ["Crime"], "calm", 1995))
+    assert matching(index, all_of=["genre:drama"]) == {"arrival", "her"}
+    assert matching(index, all_of=["mood:calm"]) == {"heat"}
+    assert len(index) == 4
+
+
+def test_remove(index):
+    index.remove("her")
+    assert matching(index, all_of=["genre:drama"]) == {"arrival", "heat"}
+    assert matching(index, none_of=["genre:drama"]) == {"alien"}
+
+
+def test_counts(index):
+    counts = index.counts(facets=["genre"])
+    assert counts == {
+        "genre": {"drama": 3, "sci-fi": 2, "crime": 1, "horror": 1, "romance": 1}
+    }
+
+
+def test_counts_within_a_selection(index):
+    bits = index.evaluate(FacetQuery(all_of=["genre:sci-fi"]))
+    assert index.counts(bits, facets=["mood"]) == {"mood": {"tense": 1, "contemplative": 1}}
+
+
+@pytest.fixture
+def catalog() -> Catalog:
+    catalog = Catalog()
+    catalog.add(MOVIES)
+    return catalog
+
+
+def test_matcher_is_none_without_filters(catalog):
+    assert catalog.matcher(None) is None
+    assert catalog.matcher(QueryFilters()) is None
+
+
+def test_matcher_agrees_with_filters(catalog):
+    filters = QueryFilters(year_min=1990, facets=FacetQuery(none_of=["genre:romance"]))
+    allowed = catalog.matcher(filters)
+    assert {m.id for m in MOVIES if allowed(m.id)} == {"arrival", "heat"}
+    assert all(allowed(m.id) == filters.matches(m) for m in MOVIES)
+
+
+def test_matcher_rejects_unknown_ids(catalog):
+    allowed = catalog.matcher(QueryFilters(facets=FacetQuery(none_of=["genre:horror"])))
+    assert not allowed("unknown")
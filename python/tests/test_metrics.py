@@ -0,0 +1,64 @@
+"""Metrics registry and Prometheus text rendering."""
+
+import pytest
+
+from entertainment_graph.services import metrics
+
+
+@pytest.fixture(autouse=True)
+def registry(monkeypatch):
+    monkeypatch.setattr(metrics, "_registry", {})
+
+
+def test_same_name_and_labels_share_one_metric():
+    first = metrics.counter("requests_total", "Requests", {"system": "a"})
+    assert metrics.counter("requests_total", "Requests", {"system": "a"}) is first
+    assert metrics.counter("requests_total", "Requests", {"system": "b"}) is not first
+
+
+def test_histogram_buckets_are_cumulative():
+    latency = metrics.histogram("latency_seconds", "Latency", (0.1, 1.0))
+    for value in (0.05, 0.1, 0.5, 3.0):
+        latency.observe(value)
+
+    snapshot = latency.snapshot()
+    assert snapshot["buckets"] == {"0.1": 2, "1.0": 3, "+Inf": 4}
+    assert snapshot["count"] == 4
+    assert snapshot["sum"] == pytest.approx(3.65)
+
+
+def test_gauge_reads_its_owner_at_collection_time():
+    depth = [3]
+    metrics.gauge("queue_depth", "Queued calls", lambda: depth[0])
+    depth[0] = 7
+    assert metrics.snapshot()["queue_depth"]["value"] == 7
+
+
+def test_renders_one_family_per_name():
+    metrics.counter("requests_total", "Requests", {"system": "b"}).inc(2)
+    metrics.counter("requests_total", "Requests", {"system": "a"}).inc()
+    metrics.histogram("latency_seconds", "Latency", (0.5,)).observe(0.2)
+
+    assert metrics.render_prometheus().splitlines() == [
+        "# HELP latency_seconds Latency",
+        "# TYPE latency_seconds histogram",
+        'latency_seconds_bucket{le="0.5"} 1.0',
+        'latency_seconds_bucket{le="+Inf"} 1.0',
+        "latency_seconds_sum 0.2",
+        "latency_seconds_count 1.0",
+        "# HELP requests_total Requests",
+        "# TYPE requests_total counter",
+        'requests_total{system="b"} 2.0',
+        'requests_total{system="a"} 1.0',
+    ]
+
+
+def test_label_values_are_escaped():
+    metrics.counter("errors_total", "Errors", {"reason": 'bad "quote"\\path\nnext'}).inc()
+    sample = metrics.render_prometheus().splitlines()[-1]
+    assert sample == 'errors_total{reason="bad \\"quote\\"\\\\path\\nnext"} 1.0'
+
+
+def test_labels_render_in_sorted_order():
+    metrics.counter("stage_total", "Stages", {"system": "x", "stage": "llm"}).inc()
+    assert 'stage_total{stage="llm",system="x"} 1.0' in metrics.render_prometheus()
@@ -0,0 +1,187 @@
+"""Rate limiter budgets, retry classification and backoff."""
+
+from types import SimpleNamespace
+
+import httpx
+import openai
+import pytest
+
+from entertainment_graph.services import rate_limiter
+from entertainment_graph.services.rate_limiter import RateLimitedClient, RateLimiter, TokenBucket
+
+REQUEST = httpx.Request("POST", "https://api.openai.com/v1/embeddings")
+
+
+def status_error(status: int, headers: dict | None = None) -> openai.APIStatusError:
+    response = httpx.Response(status, headers=headers, request=REQUEST)
+    error_type = {
+        400: openai.BadRequestError,
+        401: openai.AuthenticationError,
+        429: openai.RateLimitError,
+        500: openai.InternalServerError,
+    }.get(status, openai.APIStatusError)
+    return error_type("error", response=response, body=None)
+
+
+class RateLimitError(Exception):
+    """Stands in for a library's own 429 type, like graphiti_core's."""
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(rate_limiter.time, "monotonic", lambda: now[0])
+    return now
+
+
+def limiter(**kwargs) -> RateLimiter:
+    options = {"requests_per_minute": 600, "tokens_per_minute": 60_000, "max_concurrency": 8}
+    return RateLimiter(**(options | kwargs))
+
+
+class TestTokenBucket:
+    def test_starts_full(self, clock):
+        bucket = TokenBucket(per_minute=60)
+        assert bucket.wait_time(60) == 0
+
+    def test_waits_for_refill_after_consuming(self, clock):
+        bucket = TokenBucket(per_minute=60)  # One unit per second
+        bucket.consume(60)
+        assert bucket.wait_time(5) == pytest.approx(5.0)
+        clock[0] += 2
+        assert bucket.wait_time(5) == pytest.approx(3.0)
+
+    def test_refill_is_capped_at_capacity(self, clock):
+        bucket = TokenBucket(per_minute=60)
+        clock[0] += 3600
+        bucket.consume(0)
+        assert bucket.tokens == 60
+
+    def test_oversized_request_waits_for_a_full_bucket(self, clock):
+        bucket = TokenBucket(per_minute=60)
+        bucket.consume(30)
+        assert bucket.wait_time(1000) == pytest.approx(30.0)
+
+    def test_sync_only_lowers_the_budget(self, clock):
+        bucket = TokenBucket(per_minute=60)
+        bucket.sync(10)
+        assert bucket.tokens == 10
+        bucket.sync(50)
+        assert bucket.tokens == 10
+
+
+class TestRetryDelay:
+    @pytest.mark.parametrize("status", [400, 401, 404, 422])
+    def test_client_errors_are_not_retried(self, status):
+        assert limiter()._retry_delay(status_error(status), attempt=0) is None
+
+    @pytest.mark.parametrize("status", [500, 502, 503])
+    def test_server_errors_are_retried_without_cutting_concurrency(self, status):
+        limited = limiter()
+        assert limited._retry_delay(status_error(status), attempt=0) is not None
+        assert limited.concurrency == 8
+
+    def test_rate_limit_is_retried_and_halves_concurrency(self):
+        limited = limiter()
+        assert limited._retry_delay(status_error(429), attempt=0) is not None
+        assert limited.concurrency == 4
+
+    def test_connection_errors_are_retried(self):
+        error = openai.APIConnectionError(request=REQUEST)
+        assert limiter()._retry_delay(error, attempt=0) is not None
+
+    def test_library_rate_limit_errors_are_retried(self):
+        limited = limiter()
+        assert limited._retry_delay(RateLimitError("429"), attempt=0) is not None
+        assert limited.concurrency == 4
+
+    def test_other_exceptions_are_not_retried(self):
+        assert limiter()._retry_delay(ValueError("bad input"), attempt=0) is None
+
+    def test_gives_up_after_max_retries(self):
+        limited = limiter(max_retries=2)
+        assert limited._retry_delay(status_error(500), attempt=1) is not None
+        assert limited._retry_delay(status_error(500), attempt=2) is None
+
+    def test_backoff_is_bounded_by_the_attempt(self):
+        limited = limiter(base_delay=0.5, max_delay=30.0)
+        for attempt in range(6):
+            delay = limited._retry_delay(status_error(500), attempt)
+            assert 0 <= delay <= min(30.0, 0.5 * 2**attempt)
+
+    def test_honours_retry_after(self):
+        error = status_error(429, {"retry-after": "7"})
+        assert limiter(max_delay=30.0)._retry_delay(error, attempt=0) >= 7
+
+    def test_honours_rate_limit_reset(self):
+        error = status_error(429, {"x-ratelimit-reset-requests": "1m0s"})
+        assert limiter(max_delay=90.0)._retry_delay(error, attempt=0) >= 60
+
+    def test_delay_is_capped(self):
+        error = status_error(429, {"retry-after": "600"})
+        assert limiter(max_delay=30.0)._retry_delay(error, attempt=0) == 30.0
+
+
+class TestCall:
+    async def test_retries_transient_failures_then_returns(self):
+        failures = [status_error(500), status_error(429)]
+
+        async def flaky() -> str:
+            if failures:
+                raise failures.pop(0)
+            return "ok"
+
+        assert await limiter(base_delay=0.001).call(flaky) == "ok"
+        assert not failures
+
+    async def test_raises_non_retryable_errors_immediately(self):
+        attempts = 0
+
+        async def invalid() -> None:
+            nonlocal attempts
+            attempts += 1
+            raise status_error(400)
+
+        with pytest.raises(openai.BadRequestError):
+            await limiter(base_delay=0.001).call(invalid)
+        assert attempts == 1
+
+    async def test_raises_the_last_error_after_max_retries(self):
+        attempts = 0
+
+        async def down() -> None:
+            nonlocal attempts
+            attempts += 1
+            raise status_error(503)
+
+        with pytest.raises(openai.APIStatusError):
+            await limiter(base_delay=0.001, max_retries=3).call(down)
+        assert attempts == 4
+
+    async def test_runs_sync_callables(self):
+        assert await limiter().call(lambda value: value * 2, 21) == 42
+
+
+async def test_limited_client_retries_each_request():
+    class Embeddings:
+        attempts = 0
+
+        async def create(self, *, input: str, model: str) -> str:
+            self.attempts += 1
+            if self.attempts == 1:
+                raise status_error(429)
+            return f"{model}:{input}"
+
+    embeddings = Embeddings()
+    client = RateLimitedClient(SimpleNamespace(embeddings=embeddings), limiter(base_delay=0.001))
+
+    assert await client.embeddings.create(input="text", model="m") == "m:text"
+    assert embeddings.attempts == 2
+
+
+@pytest.mark.parametrize(
+    ("value", "seconds"),
+    [("1s", 1.0), ("6m0s", 360.0), ("20ms", 0.02), ("1h2m", 3720.0), ("2.5", 2.5), ("", None)],
+)
+def test_parse_duration(value, seconds):
+    assert rate_limiter._parse_duration(value) == seconds
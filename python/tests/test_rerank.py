@@ -0,0 +1,72 @@
+"""MMR reranking."""
+
+import numpy as np
+import pytest
+
+from entertainment_graph.models import Movie
+from entertainment_graph.services import rerank
+from entertainment_graph.services.catalog import Catalog
+from entertainment_graph.services.rerank import MMRReranker
+from entertainment_graph.services.vector_index import VectorIndex
+
+
+@pytest.fixture
+def vectors() -> VectorIndex:
+    index = VectorIndex()
+    index.add(
+        ["dune", "dune-2", "arrival", "her"],
+        [[1.0, 0.0, 0.0], [0.99, 0.1, 0.0], [0.0, 1.0, 0.0], [0.0, 0.0, 1.0]],
+    )
+    return index
+
+
+async def test_lambda_one_keeps_relevance_order(vectors):
+    reranker = MMRReranker(vectors, lambda_=1.0)
+    picks = await reranker.rerank(["her", "dune", "arrival"], np.array([0.2, 0.9, 0.5]), 3)
+    assert picks == [1, 2, 0]
+
+
+async def test_near_duplicates_give_way_to_distinct_movies(vectors):
+    reranker = MMRReranker(vectors, lambda_=0.5)
+    ids = ["dune", "dune-2", "arrival", "her"]
+    picks = await reranker.rerank(ids, np.array([0.9, 0.85, 0.5, 0.4]), 3)
+    assert [ids[i] for i in picks] == ["dune", "arrival", "her"]
+
+
+async def test_limit_and_empty_candidates(vectors):
+    reranker = MMRReranker(vectors)
+    assert await reranker.rerank([], np.array([]), 5) == []
+    assert len(await reranker.rerank(["dune", "her"], np.array([0.5, 0.4]), 5)) == 2
+
+
+async def test_equal_scores_fall_back_to_rank_order(vectors):
+    reranker = MMRReranker(vectors, lambda_=1.0)
+    picks = await reranker.rerank(["her", "dune", "arrival"], np.zeros(3), 3)
+    assert picks == [0, 1, 2]
+
+
+async def test_candidates_without_stored_vectors_are_embedded_once(vectors, monkeypatch):
+    catalog = Catalog()
+    catalog.add([Movie(id="heat", title="Heat", year=1995)])
+    monkeypatch.setattr(rerank, "get_catalog", lambda: catalog)
+    embedded: list[list[str]] = []
+
+    async def embed(texts: list[str]) -> list[list[float]]:
+        embedded.append(texts)
+        return [[1.0, 0.0, 0.0] for _ in texts]
+
+    reranker = MMRReranker(vectors, lambda_=0.5, embed=embed)
+    ids = ["dune", "heat", "her"]
+    for _ in range(2):
+        picks = await reranker.rerank(ids, np.array([0.9, 0.85, 0.4]), 3)
+        # Heat now embeds like Dune, so it ranks below the distinct Her
+        assert [ids[i] for i in picks] == ["dune", "her", "heat"]
+    assert embedded == [["Heat (1995)"]]
+
+
+async def test_unknown_candidates_count_as_unlike_everything(vectors, monkeypatch, caplog):
+    monkeypatch.setattr(rerank, "get_catalog", Catalog)
+    reranker = MMRReranker(vectors, lambda_=1.0)
+    picks = await reranker.rerank(["dune", "missing"], np.array([0.4, 0.9]), 2)
+    assert picks == [1, 0]
+    assert "without embeddings for 1 of 2" in caplog.text
@@ -0,0 +1,126 @@
+"""Sharded Chroma collection: scatter-gather reads, rebuilds and crash recovery."""
+
+import chromadb
+import pytest
+
+from entertainment_graph.services.executor import BoundedExecutor
+from entertainment_graph.services.sharded_collection import ShardedCollection
+
+POOL = BoundedExecutor("chroma_test", 2, 8)
+IDS = [f"m{i}" for i in range(40)]
+
+
+@pytest.fixture
+def client(tmp_path):
+    return chromadb.PersistentClient(path=str(tmp_path))
+
+
+def names(client) -> set[str]:
+    return {getattr(c, "name", c) for c in client.list_collections()}
+
+
+def embedding(i: int) -> list[float]:
+    return [1.0, i / 40, (i % 7) / 7]
+
+
+async def populate(collection: ShardedCollection) -> None:
+    await collection.upsert(
+        IDS,
+        embeddings=[embedding(i) for i in range(len(IDS))],
+        documents=IDS,
+        metadatas=[{"n": i} for i in range(len(IDS))],
+    )
+
+
+async def test_one_shard_keeps_the_plain_name(client):
+    collection = ShardedCollection(client, "movies", 1, POOL)
+    assert collection.names == ["movies"]
+    assert names(client) == {"movies"}
+
+
+async def test_records_spread_across_shards_and_merge_back(client):
+    collection = ShardedCollection(client, "movies", 3, POOL)
+    await populate(collection)
+
+    assert await collection.count() == len(IDS)
+    per_shard = [c.count() for c in collection._collections]
+    assert sum(per_shard) == len(IDS) and all(per_shard)
+
+    got = await collection.get(["m3", "m17", "m30"])
+    assert sorted(got["ids"]) == ["m17", "m3", "m30"]
+    assert sorted(got["documents"]) == ["m17", "m3", "m30"]
+
+
+async def test_query_merges_shards_like_a_single_collection(client):
+    sharded = ShardedCollection(client, "sharded", 3, POOL)
+    single = ShardedCollection(client, "single", 1, POOL)
+    await populate(sharded)
+    await populate(single)
+
+    queries = [embedding(5), embedding(33)]
+    got = await sharded.query(queries, n_results=6)
+    want = await single.query(queries, n_results=6)
+    assert got["ids"] == want["ids"]
+    for got_row, want_row in zip(got["distances"], want["distances"]):
+        assert got_row == pytest.approx(want_row, abs=1e-6)
+
+
+async def test_rebuild_keeps_every_record(client):
+    collection = ShardedCollection(client, "movies", 2, POOL)
+    await populate(collection)
+    before = await collection.count()
+
+    copied = await collection.rebuild(0, metadata={"hnsw:space": "cosine", "hnsw:M": 32})
+
+    assert copied == collection._collections[0].count()
+    assert await collection.count() == before
+    assert names(client) == set(collection.names)
+    got = await collection.get(IDS)
+    assert sorted(got["ids"]) == sorted(IDS)
+
+
+async def test_recovers_from_a_crash_before_staging_took_the_name(client):
+    collection = ShardedCollection(client, "movies", 2, POOL)
+    await populate(collection)
+    shard_name = collection.names[1]
+    live = collection._collections[1]
+    records = live.get(include=["embeddings", "documents", "metadatas"])
+
+    # Died after the live shard was renamed aside, before staging took its name
+    staging = client.create_collection(f"{shard_name}-rebuild", metadata=collection.metadata)
+    staging.upsert(
+        ids=records["ids"],
+        embeddings=records["embeddings"],
+        documents=records["documents"],
+        metadatas=records["metadatas"],
+    )
+    live.modify(name=f"{shard_name}-retired")
+
+    recovered = ShardedCollection(client, "movies", 2, POOL)
+    assert names(client) == set(recovered.names)
+    assert await recovered.count() == len(IDS)
+
+
+async def test_restores_the_retired_shard_when_staging_is_gone(client):
+    collection = ShardedCollection(client, "movies", 2, POOL)
+    await populate(collection)
+    shard_name = collection.names[0]
+    expected = collection._collections[0].count()
+    collection._collections[0].modify(name=f"{shard_name}-retired")
+
+    recovered = ShardedCollection(client, "movies", 2, POOL)
+    assert names(client) == set(recovered.names)
+    assert recovered._collections[0].count() == expected
+
+
+async def test_drops_leftovers_next_to_a_live_shard(client):
+    collection = ShardedCollection(client, "movies", 2, POOL)
+    await populate(collection)
+    # Died mid-copy (partial staging) on one shard, before dropping the retired copy on the other
+    partial = client.create_collection(f"{collection.names[0]}-rebuild")
+    partial.upsert(ids=["m0"], embeddings=[embedding(0)])
+    client.create_collection(f"{collection.names[1]}-retired")
+
+    recovered = ShardedCollection(client, "movies", 2, POOL)
+    assert names(client) == set(recovered.names)
+    assert await recovered.count() == len(IDS)
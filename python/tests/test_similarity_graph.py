@@ -0,0 +1,88 @@
+"""Curated similarity graph and personalized PageRank."""
+
+import numpy as np
+import pytest
+
+from entertainment_graph.models import Movie
+from entertainment_graph.models.movie import SimilarityLink
+from entertainment_graph.services.similarity_graph import SimilarityGraph
+
+
+def link(target: str, strength: int = 5, kind: str = "thematic", both: bool = True):
+    return SimilarityLink(
+        target_id=target,
+        relationship_type=kind,
+        explanation="",
+        strength=strength,
+        bidirectional=both,
+    )
+
+
+def movie(movie_id: str, *links: SimilarityLink) -> Movie:
+    return Movie(id=movie_id, title=movie_id, year=2000, similar_to=list(links))
+
+
+@pytest.fixture
+def graph() -> SimilarityGraph:
+    # a - b - c chain, d hangs off c one-way, e is isolated
+    return SimilarityGraph([
+        movie("a", link("b")),
+        movie("b", link("c", strength=3)),
+        movie("c", link("d", both=False)),
+        movie("d"),
+        movie("e", link("a", kind="contrast")),
+    ])
+
+
+def test_csr_edges(graph):
+    assert graph.edge_count == 5  # a<->b, b<->c, c->d; contrast links carry no weight
+    assert graph.neighbors("b") == [("a", 1.0), ("c", pytest.approx(0.6))]
+    assert graph.neighbors("d") == []
+    assert graph.neighbors("unknown") == []
+
+
+def test_duplicate_links_keep_the_strongest():
+    graph = SimilarityGraph([movie("a", link("b", strength=2)), movie("b", link("a", strength=4))])
+    assert graph.neighbors("a") == [("b", pytest.approx(0.8))]
+    assert graph.edge_count == 2
+
+
+def test_pagerank_is_a_distribution(graph):
+    rank = graph.personalized_pagerank(["a"])
+    assert rank.sum() == pytest.approx(1.0)
+    assert (rank >= 0).all()
+
+
+def test_pagerank_matches_dense_power_iteration(graph):
+    n, restart = len(graph), 0.15
+    transition = np.zeros((n, n))
+    for i, movie_id in enumerate(graph.ids):
+        weights = dict(graph.neighbors(movie_id))
+        total = sum(weights.values())
+        for target, weight in weights.items():
+            transition[i, graph.ids.index(target)] = weight / total
+    seed = np.zeros(n)
+    seed[graph.ids.index("a")] = 1.0
+
+    rank = seed.copy()
+    for _ in range(500):
+        stuck = rank[transition.sum(axis=1) == 0].sum()
+        rank = (1 - restart) * (rank @ transition + stuck * seed) + restart * seed
+
+    np.testing.assert_allclose(graph.personalized_pagerank(["a"], tolerance=1e-12), rank, atol=1e-6)
+
+
+def test_recommend_excludes_seeds_and_unreachable_movies(graph):
+    recommended = [movie_id for movie_id, _ in graph.recommend(["a"], limit=10)]
+    assert recommended[0] == "b"
+    assert "a" not in recommended
+    assert "e" not in recommended
+    assert set(recommended) == {"b", "c", "d"}
+
+
+def test_recommend_respects_limit(graph):
+    assert len(graph.recommend(["a"], limit=2)) == 2
+
+
+def test_unknown_seeds_recommend_nothing(graph):
+    assert graph.recommend(["unknown"]) == []
@@ -0,0 +1,164 @@
+"""Similar-movies table: full builds and incremental refreshes."""
+
+import numpy as np
+import pytest
+
+from entertainment_graph.models import Movie
+from entertainment_graph.models.movie import SimilarityLink
+from entertainment_graph.services.similarity_table import SimilarityTable
+from entertainment_graph.services.vector_index import normalize
+
+N, DIM, K = 120, 16, 5
+
+
+def random_vectors(rng: np.random.Generator, n: int) -> np.ndarray:
+    return normalize(rng.normal(size=(n, DIM)).astype(np.float32))
+
+
+def catalog(ids: list[str], links: dict[str, list[tuple[str, int, bool]]]) -> dict[str, Movie]:
+    return {
+        movie_id: Movie(
+            id=movie_id,
+            title=movie_id,
+            year=2000,
+            similar_to=[
+                SimilarityLink(
+                    target_id=target,
+                    relationship_type="thematic",
+                    explanation="",
+                    strength=strength,
+                    bidirectional=bidirectional,
+                )
+                for target, strength, bidirectional in links.get(movie_id, [])
+            ],
+        )
+        for movie_id in ids
+    }
+
+
+@pytest.fixture
+def data():
+    rng = np.random.default_rng(7)
+    ids = [f"m{i}" for i in range(N)]
+    links = {"m0": [("m1", 5, True)], "m2": [("m90", 4, False)], "m100": [("m3", 3, True)]}
+    return ids, random_vectors(rng, N), catalog(ids, links), rng
+
+
+def assert_same_table(actual: SimilarityTable, expected: SimilarityTable) -> None:
+    assert actual.ids == expected.ids
+    np.testing.assert_array_equal(actual.scores, expected.scores)
+    for row in range(len(expected)):
+        scores = expected.scores[row]
+        # Neighbours with equal float16 scores may come out in either order, and
+        # a tie at the cut-off may keep either movie
+        for score in np.unique(scores[scores > scores.min()]):
+            assert set(actual.neighbors[row][actual.scores[row] == score]) == set(
+                expected.neighbors[row][scores == score]
+            )
+
+
+def brute_force(ids, vectors, movies, k=K, weight=0.3) -> list[list[str]]:
+    positions = {movie_id: i for i, movie_id in enumerate(ids)}
+    blended = vectors @ vectors.T * (1 - weight)
+    for movie in movies.values():
+        for link in movie.similar_to:
+            pairs = [(movie.id, link.target_id)]
+            if link.bidirectional:
+                pairs.append((link.target_id, movie.id))
+            for source, target in pairs:
+                blended[positions[source], positions[target]] += weight * link.strength / 5
+    np.fill_diagonal(blended, -np.inf)
+    return [[ids[j] for j in np.argsort(-row, kind="stable")[:k]] for row in blended]
+
+
+def test_build_matches_brute_force(data):
+    ids, vectors, movies, _ = data
+    table = SimilarityTable(k=K)
+    table.build(ids, vectors, movies, block_size=32)
+
+    expected = brute_force(ids, vectors, movies)
+    for movie_id, neighbours in zip(ids, expected):
+        found = [neighbour for neighbour, _ in table.similar(movie_id)]
+        assert set(found[:-1]) <= set(neighbours)
+        assert movie_id not in found
+
+
+def test_curated_links_boost_both_directions(data):
+    ids, vectors, movies, _ = data
+    table = SimilarityTable(k=K, curated_weight=0.9)
+    table.build(ids, vectors, movies)
+
+    assert table.similar("m0")[0][0] == "m1"
+    assert table.similar("m1")[0][0] == "m0"
+    # A one-way link only boosts its source's row
+    assert table.similar("m2")[0][0] == "m90"
+    assert dict(table.similar("m90")).get("m2", 0.0) < dict(table.similar("m2"))["m90"]
+
+
+def test_extend_with_new_movies_equals_a_full_build(data):
+    ids, vectors, movies, _ = data
+    incremental = SimilarityTable(k=K)
+    incremental.build(ids[:80], vectors[:80], movies)
+    incremental.extend(ids[:100], vectors[:100], movies, block_size=16)
+    incremental.extend(ids, vectors, movies, block_size=16)
+
+    full = SimilarityTable(k=K)
+    full.build(ids, vectors, movies)
+    assert_same_table(incremental, full)
+
+
+def test_extend_with_changed_vectors_equals_a_full_build(data):
+    ids, vectors, movies, rng = data
+    changed = ["m3", "m10", "m41", "m79"]
+    rows = [ids.index(movie_id) for movie_id in changed]
+    before = vectors.copy()
+    before[rows] = random_vectors(rng, len(rows))
+
+    incremental = SimilarityTable(k=K)
+    incremental.build(ids[:80], before[:80], movies)
+    incremental.extend(ids, vectors, movies, changed=changed, block_size=16)
+
+    full = SimilarityTable(k=K)
+    full.build(ids, vectors, movies)
+    assert_same_table(incremental, full)
+
+
+def test_extend_rescores_rows_that_ranked_a_changed_movie(data):
+    ids, vectors, movies, _ = data
+    table = SimilarityTable(k=K)
+    table.build(ids, vectors, movies)
+    neighbour = table.similar("m5")[0][0]
+
+    # Move the nearest neighbour of m5 far away from it
+    moved = vectors.copy()
+    moved[ids.index(neighbour)] = -vectors[ids.index("m5")]
+    table.extend(ids, moved, movies, changed=[neighbour])
+
+    assert neighbour not in [movie_id for movie_id, _ in table.similar("m5")]
+    full = SimilarityTable(k=K)
+    full.build(ids, moved, movies)
+    assert_same_table(table, full)
+
+
+def test_extend_without_a_matching_prefix_rebuilds(data):
+    ids, vectors, movies, _ = data
+    table = SimilarityTable(k=K)
+    table.build(ids[:50], vectors[:50], movies)
+    table.extend(ids[::-1], vectors[::-1], movies)
+
+    full = SimilarityTable(k=K)
+    full.build(ids[::-1], vectors[::-1], movies)
+    assert_same_table(table, full)
+
+
+def test_save_and_load_round_trip(data, tmp_path):
+    ids, vectors, movies, _ = data
+    table = SimilarityTable(k=K)
+    table.build(ids, vectors, movies)
+    table.save(tmp_path / "similar.npz")
+
+    loaded = SimilarityTable()
+    loaded.load(tmp_path / "similar.npz")
+    assert loaded.k == K
+    assert_same_table(loaded, table)
+    assert loaded.similar("m7") == table.similar("m7")
@@ -0,0 +1,88 @@
+"""Title mentions in free-text queries."""
+
+import pytest
+
+from entertainment_graph.models import Movie
+from entertainment_graph.services.title_matcher import TitleMatcher, title_aliases
+
+
+def movie(movie_id: str, title: str) -> Movie:
+    return Movie(id=movie_id, title=title, year=2000)
+
+
+@pytest.fixture(scope="module")
+def matcher() -> TitleMatcher:
+    return TitleMatcher([
+        movie("office", "The Office"),
+        movie("game", "The Game"),
+        movie("her", "Her"),
+        movie("up", "Up"),
+        movie("get-out", "Get Out"),
+        movie("severance", "Severance"),
+        movie("breaking-bad", "Breaking Bad"),
+        movie("lotr", "The Lord of the Rings"),
+        movie("blade-runner", "Blade Runner 2049"),
+        movie("dune", "Dune: Part Two"),
+    ])
+
+
+def test_title_aliases():
+    assert title_aliases(movie("x", "The Lord of the Rings")) == [
+        ("the", "lord", "of", "the", "rings"),
+        ("lord", "of", "the", "rings"),
+    ]
+    assert title_aliases(movie("x", "Dune: Part Two")) == [("dune", "part", "two"), ("dune",)]
+    assert title_aliases(movie("x", "Blade Runner 2049")) == [
+        ("blade", "runner", "2049"),
+        ("blade", "runner"),
+    ]
+
+
+@pytest.mark.parametrize(
+    "query",
+    [
+        "drinks after work at the office",
+        "we played the game all night",
+        "i want to see her again",
+        "something to cheer me up tonight",
+        "get out of the house and watch something",
+        "a thriller about severance pay",
+        "other movies about brothers",
+    ],
+)
+def test_ordinary_prose_does_not_match(matcher, query):
+    assert matcher.find(query) == []
+
+
+@pytest.mark.parametrize(
+    ("query", "expected"),
+    [
+        ("shows like the office", ["office"]),
+        ("The Office but darker", ["office"]),
+        ("a twist ending like The Game", ["game"]),
+        ("something similar to her", ["her"]),
+        ("movies like up", ["up"]),
+        ("Get Out but funnier", ["get-out"]),
+        ("Severance but lighter", ["severance"]),
+        ("breaking bad vibes", ["breaking-bad"]),
+        ("i loved the lord of the rings", ["lotr"]),
+        ("blade runner visuals", ["blade-runner"]),
+    ],
+)
+def test_titles_match(matcher, query, expected):
+    assert matcher.find(query) == expected
+
+
+def test_longest_title_wins_over_its_alias(matcher):
+    assert matcher.find("like Dune Part Two") == ["dune"]
+    assert matcher.find("Blade Runner 2049 and Blade Runner") == ["blade-runner"]
+
+
+def test_matches_come_back_in_order_of_appearance(matcher):
+    assert matcher.find("cross Breaking Bad with Severance") == ["breaking-bad", "severance"]
+
+
+def test_exact_title_beats_another_movies_alias():
+    matcher = TitleMatcher([movie("heat", "Heat"), movie("heat-2", "Heat 2")])
+    assert matcher.find("like Heat") == ["heat"]
+    assert matcher.find("like Heat 2") == ["heat-2"]